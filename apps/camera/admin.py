@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from apps.camera.models import Camera, CameraActionLog
+from apps.camera.models import Camera, CameraActionLog, CameraActionRollup
+from utils.admins import LargeTableAdminMixin
 
 
 @admin.register(Camera)
@@ -11,7 +12,16 @@ class CameraAdmin(admin.ModelAdmin):
 
 
 @admin.register(CameraActionLog)
-class CameraActionLogAdmin(admin.ModelAdmin):
+class CameraActionLogAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'camera', 'action', 'performed_by', 'timestamp')
-    search_fields = ('camera__name', 'performed_by__full_name')
+    list_select_related = ('camera', 'performed_by')
+    search_fields = ('=camera__name', '=performed_by__full_name')
     list_filter = ('action', 'timestamp')
+
+
+@admin.register(CameraActionRollup)
+class CameraActionRollupAdmin(admin.ModelAdmin):
+    list_display = ('bucket', 'granularity', 'company', 'camera', 'turned_on', 'turned_off',
+                    'online_seconds', 'recording_seconds')
+    list_filter = ('granularity',)
+    raw_id_fields = ('company', 'camera')
@@ -0,0 +1,97 @@
+"""
+Bulk ingest of camera state reports from NVRs.
+
+A batch is diffed against the cached camera state; only real changes are
+written (``bulk_update``), logged (``bulk_create``) and handed to the
+notification pipeline in one call.
+"""
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.camera import rollups, state as camera_state
+from apps.camera.models import Camera, CameraActionLog
+from apps.camera.state import STATE_FIELDS, is_valid_value
+from apps.camera.utils import BULK_BATCH_SIZE, log_camera_events_and_notify_bulk
+
+
+def validate_updates(items):
+    """
+    Validate raw update dicts without a serializer per item.
+
+    Returns ``(updates, errors)`` where ``updates`` maps camera id to the
+    requested field values (later items for the same camera win) and
+    ``errors`` lists ``{"index": ..., "error": ...}`` entries.
+    """
+    if not isinstance(items, list):
+        return {}, [{"index": None, "error": "Expected a list of updates"}]
+    if len(items) > settings.CAMERA_INGEST_MAX_BATCH:
+        return {}, [{"index": None, "error": f"At most {settings.CAMERA_INGEST_MAX_BATCH} updates per batch"}]
+
+    updates, errors = {}, []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "error": "Expected an object"})
+            continue
+        try:
+            camera_id = uuid.UUID(str(item.get('camera_id')))
+        except ValueError:
+            errors.append({"index": index, "error": "Invalid camera_id"})
+            continue
+
+        fields = {}
+        for field in STATE_FIELDS:
+            if field not in item:
+                continue
+            if not is_valid_value(field, item[field]):
+                errors.append({"index": index, "error": f"Invalid {field}"})
+                break
+            fields[field] = item[field]
+        else:
+            updates.setdefault(camera_id, {}).update(fields)
+    return updates, errors
+
+
+def ingest_camera_updates(updates, performed_by, company_ids):
+    """
+    Apply validated ``updates`` to cameras of ``company_ids``.
+
+    The cameras' rows are locked and their current state read in one query,
+    so a batch of no-op reports costs no DB writes and concurrent batches
+    cannot both log the same transition. Returns a summary with the number
+    of cameras changed, unchanged and unknown (missing or outside the
+    caller's companies), plus logs written.
+    """
+    with transaction.atomic():
+        states = list(camera_state.lock_many(list(updates), company_ids).values())
+
+        changed_states, changed_fields, logs, camera_actions = [], set(), [], []
+        for state in states:
+            changed = state.diff(updates[state.id])
+            if not changed:
+                continue
+            old_values = {field: getattr(state, field) for field in changed}
+            for field, value in changed.items():
+                setattr(state, field, value)
+            state_logs, state_actions = camera_state.build_logs(state, old_values, changed, performed_by, "ingest")
+            changed_states.append(state)
+            changed_fields.update(changed)
+            logs.extend(state_logs)
+            camera_actions.extend(state_actions)
+
+        if changed_states:
+            Camera.objects.bulk_update(
+                [state.to_camera() for state in changed_states], sorted(changed_fields), batch_size=BULK_BATCH_SIZE
+            )
+        CameraActionLog.objects.bulk_create(logs, batch_size=BULK_BATCH_SIZE)
+        rollups.record_logs(logs, {state.id: state.company_id for state in changed_states})
+        log_camera_events_and_notify_bulk(camera_actions, performed_by)
+
+    return {
+        "received": len(updates),
+        "updated": len(changed_states),
+        "unchanged": len(states) - len(changed_states),
+        "unknown": len(updates) - len(states),
+        "logs": len(logs),
+    }
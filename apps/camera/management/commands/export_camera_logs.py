@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from apps.camera.models import CameraActionLog
+from apps.camera.utils import EVENT_EXPORT_COLUMNS, LOG_EXPORT_COLUMNS
+from apps.notification_service.models import Event
+from utils.export import FORMATS, Exporter
+
+TABLES = {
+    'camera_logs': (CameraActionLog, LOG_EXPORT_COLUMNS),
+    'events': (Event, EVENT_EXPORT_COLUMNS),
+}
+
+
+class Command(BaseCommand):
+    help = "Export CameraActionLog or Event rows of a time range as Parquet (with pyarrow) or gzipped CSV/JSONL"
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help="Output directory for the part files")
+        parser.add_argument('--table', choices=list(TABLES), default='camera_logs')
+        parser.add_argument('--format', choices=FORMATS, help="Defaults to parquet when pyarrow is installed")
+        parser.add_argument('--since', help="ISO timestamp, inclusive")
+        parser.add_argument('--until', help="ISO timestamp, exclusive")
+        parser.add_argument('--resume', action='store_true',
+                            help="Continue after the last row of the previous run in this directory")
+        parser.add_argument('--chunk-size', type=int, default=10_000)
+        parser.add_argument('--rows-per-file', type=int, default=1_000_000)
+
+    def handle(self, *args, **options):
+        since, until = (self.parse_timestamp(options[name]) for name in ('since', 'until'))
+        model, columns = TABLES[options['table']]
+        try:
+            exporter = Exporter(
+                model.objects.all(),
+                list(columns),
+                options['directory'],
+                options['table'],
+                fmt=options['format'],
+                chunk_size=options['chunk_size'],
+                rows_per_file=options['rows_per_file'],
+            )
+        except ValueError as e:
+            raise CommandError(e)
+
+        rows, files = exporter.run(
+            since=since, until=until, resume=options['resume'],
+            progress=lambda total: self.stdout.write(f"{total} rows"),
+        )
+        for path in files:
+            self.stdout.write(path)
+        self.stdout.write(self.style.SUCCESS(f"Exported {rows} {options['table']} rows as {exporter.fmt}."))
+
+    @staticmethod
+    def parse_timestamp(value):
+        if value is None:
+            return None
+        timestamp = parse_datetime(value)
+        if timestamp is None:
+            raise CommandError(f"Invalid timestamp: {value}")
+        return timestamp
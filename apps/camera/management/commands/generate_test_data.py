@@ -4,12 +4,15 @@ from django.core.management.base import BaseCommand
 from django.utils.crypto import get_random_string
 from faker import Faker
 
+from apps.camera import rollups
 from apps.camera.models import *
 from apps.notification_service.models import Event
 from apps.users.models import CompanyUser
 
 fake = Faker()
 
+BULK_BATCH_SIZE = 5_000
+
 
 class Command(BaseCommand):
     help = 'Generate test data for Users, Companies, Cameras, Logs, and Events'
@@ -42,7 +45,7 @@ class Command(BaseCommand):
             )
             users.append(user)
 
-        users = User.objects.bulk_create(users)
+        users = User.objects.bulk_create(users, batch_size=BULK_BATCH_SIZE)
 
         self.stdout.write("Creating company users...")
         company_users = [
@@ -52,7 +55,7 @@ class Command(BaseCommand):
                 role=random.choice(list(CompanyUser.RoleChoices.values))
             ) for user in users
         ]
-        CompanyUser.objects.bulk_create(company_users)
+        CompanyUser.objects.bulk_create(company_users, batch_size=BULK_BATCH_SIZE)
 
         self.stdout.write("Creating cameras...")
         cameras = []
@@ -69,7 +72,7 @@ class Command(BaseCommand):
             )
             cameras.append(camera)
 
-        cameras = Camera.objects.bulk_create(cameras)
+        cameras = Camera.objects.bulk_create(cameras, batch_size=BULK_BATCH_SIZE)
         trigger_choices = ['TURNED OFF', 'TURNED ON', 'MOVED', 'STARTED RECORDING', 'STOPPED RECORDING']
 
         self.stdout.write("Creating events and logs...")
@@ -109,6 +112,7 @@ class Command(BaseCommand):
                 )
                 logs.append(log)
 
-        CameraActionLog.objects.bulk_create(logs)
+        CameraActionLog.objects.bulk_create(logs, batch_size=BULK_BATCH_SIZE)
+        rollups.record_logs(logs, {camera.id: company.id for camera in cameras})
 
         self.stdout.write(self.style.SUCCESS("✅ Test data generation completed."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.camera import rollups
+
+
+class Command(BaseCommand):
+    help = "Credit open online/recording intervals to the camera rollups, or rebuild them from the action logs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true',
+                            help="Drop all rollups and replay every CameraActionLog")
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            replayed = rollups.rebuild(progress=lambda total: self.stdout.write(f"{total} logs replayed"))
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt rollups from {replayed} logs."))
+
+        flushed = rollups.flush_open_intervals()
+        self.stdout.write(self.style.SUCCESS(f"Checkpointed open intervals of {flushed} cameras."))
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.22 on 2026-10-19 01:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+import utils.functions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('camera', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CameraUptimeCursor',
+            fields=[
+                ('camera', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='uptime_cursor', serialize=False, to='camera.camera', verbose_name='camera')),
+                ('online_since', models.DateTimeField(blank=True, null=True, verbose_name='online since')),
+                ('recording_since', models.DateTimeField(blank=True, null=True, verbose_name='recording since')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.company', verbose_name='Company')),
+            ],
+            options={
+                'verbose_name': 'Camera Uptime Cursor',
+                'verbose_name_plural': 'Camera Uptime Cursors',
+            },
+        ),
+        migrations.CreateModel(
+            name='CameraActionRollup',
+            fields=[
+                ('id', models.UUIDField(default=utils.functions.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('granularity', models.PositiveSmallIntegerField(choices=[(0, 'Minute'), (1, 'Hour'), (2, 'Day')], verbose_name='granularity')),
+                ('bucket', models.DateTimeField(verbose_name='bucket start')),
+                ('turned_off', models.PositiveIntegerField(default=0, verbose_name='turned off')),
+                ('turned_on', models.PositiveIntegerField(default=0, verbose_name='turned on')),
+                ('moved', models.PositiveIntegerField(default=0, verbose_name='moved')),
+                ('started_recording', models.PositiveIntegerField(default=0, verbose_name='started recording')),
+                ('stopped_recording', models.PositiveIntegerField(default=0, verbose_name='stopped recording')),
+                ('online_seconds', models.PositiveBigIntegerField(default=0, verbose_name='online seconds')),
+                ('recording_seconds', models.PositiveBigIntegerField(default=0, verbose_name='recording seconds')),
+                ('camera', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='camera.camera', verbose_name='camera')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='camera_rollups', to='users.company', verbose_name='Company')),
+            ],
+            options={
+                'verbose_name': 'Camera Action Rollup',
+                'verbose_name_plural': 'Camera Action Rollups',
+                'indexes': [models.Index(fields=['company', 'granularity', 'bucket'], name='camera_rollup_company_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='cameraactionrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('camera__isnull', False)), fields=('camera', 'granularity', 'bucket'), name='camera_rollup_camera_bucket_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='cameraactionrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('camera__isnull', True)), fields=('company', 'granularity', 'bucket'), name='camera_rollup_company_bucket_uniq'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.22 on 2026-10-19 02:43
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('camera', '0003_camera_action_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='camera',
+            index=models.Index(django.db.models.functions.text.Upper('name'), name='camera_name_upper_idx'),
+        ),
+    ]
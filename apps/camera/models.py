@@ -1,11 +1,12 @@
 from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from apps.notification_service.models import Event
 from apps.users.models import Company, User
-from utils.models import BaseModel
+from utils.models import BaseModel, CompactBaseModel
 
 
 # from psqlextra.models import PostgresPartitionedModel
@@ -64,6 +65,7 @@ class Camera(BaseModel):
         indexes = [
             models.Index(fields=["company", "status"]),
             models.Index(fields=["company", "recording_status"]),
+            models.Index(Upper("name"), name="camera_name_upper_idx"),
         ]
         verbose_name = _("Camera")
         verbose_name_plural = _("Cameras")
@@ -132,3 +134,91 @@ class CameraActionLog(BaseModel):
 
     def __str__(self):
         return f"{self.action} - {self.camera.name} by {self.performed_by}"
+
+
+class CameraActionRollup(CompactBaseModel):
+    """
+    Pre-aggregated ``CameraActionLog`` counters and durations per time bucket.
+
+    Rows with a ``camera`` are per-camera aggregates; rows without one are the
+    company-wide aggregate of the same bucket. Maintained incrementally by
+    ``apps.camera.rollups``.
+    """
+
+    class GranularityChoices(models.IntegerChoices):
+        MINUTE = 0, _("Minute")
+        HOUR = 1, _("Hour")
+        DAY = 2, _("Day")
+
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name="camera_rollups",
+        verbose_name=_("Company")
+    )
+    camera = models.ForeignKey(
+        Camera,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="rollups",
+        verbose_name=_("camera")
+    )
+    granularity = models.PositiveSmallIntegerField(
+        choices=GranularityChoices.choices,
+        verbose_name=_("granularity")
+    )
+    bucket = models.DateTimeField(verbose_name=_("bucket start"))
+
+    turned_off = models.PositiveIntegerField(default=0, verbose_name=_("turned off"))
+    turned_on = models.PositiveIntegerField(default=0, verbose_name=_("turned on"))
+    moved = models.PositiveIntegerField(default=0, verbose_name=_("moved"))
+    started_recording = models.PositiveIntegerField(default=0, verbose_name=_("started recording"))
+    stopped_recording = models.PositiveIntegerField(default=0, verbose_name=_("stopped recording"))
+    online_seconds = models.PositiveBigIntegerField(default=0, verbose_name=_("online seconds"))
+    recording_seconds = models.PositiveBigIntegerField(default=0, verbose_name=_("recording seconds"))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["camera", "granularity", "bucket"],
+                condition=models.Q(camera__isnull=False),
+                name="camera_rollup_camera_bucket_uniq",
+            ),
+            models.UniqueConstraint(
+                fields=["company", "granularity", "bucket"],
+                condition=models.Q(camera__isnull=True),
+                name="camera_rollup_company_bucket_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["company", "granularity", "bucket"], name="camera_rollup_company_idx"),
+        ]
+        verbose_name = _("Camera Action Rollup")
+        verbose_name_plural = _("Camera Action Rollups")
+
+    def __str__(self):
+        return f"{self.get_granularity_display()} {self.bucket:%Y-%m-%d %H:%M} - {self.camera_id or self.company_id}"
+
+
+class CameraUptimeCursor(models.Model):
+    """Start of the currently open online/recording interval of a camera, not yet credited to rollups."""
+    camera = models.OneToOneField(
+        Camera,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="uptime_cursor",
+        verbose_name=_("camera")
+    )
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Company")
+    )
+    online_since = models.DateTimeField(null=True, blank=True, verbose_name=_("online since"))
+    recording_since = models.DateTimeField(null=True, blank=True, verbose_name=_("recording since"))
+
+    class Meta:
+        verbose_name = _("Camera Uptime Cursor")
+        verbose_name_plural = _("Camera Uptime Cursors")
@@ -0,0 +1,242 @@
+"""
+Incremental rollups of camera action logs.
+
+Every batch of ``CameraActionLog`` rows is folded into per-minute, per-hour
+and per-day ``CameraActionRollup`` buckets, per camera and per company, in a
+constant number of queries. Action counts are credited when a log is written;
+online/recording durations when the interval closes (turned off, stopped
+recording) or when ``flush_open_intervals`` checkpoints still-open intervals.
+"""
+from collections import defaultdict
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.camera.models import CameraActionLog, CameraActionRollup, CameraUptimeCursor
+
+Action = CameraActionLog.ActionChoices
+Granularity = CameraActionRollup.GranularityChoices
+
+BATCH_SIZE = 1000
+
+COUNTERS = {
+    Action.TURNED_OFF: 'turned_off',
+    Action.TURNED_ON: 'turned_on',
+    Action.MOVED: 'moved',
+    Action.STARTED_RECORDING: 'started_recording',
+    Action.STOPPED_RECORDING: 'stopped_recording',
+}
+
+# action -> (cursor field, rollup duration field, opens the interval)
+INTERVALS = {
+    Action.TURNED_ON: ('online_since', 'online_seconds', True),
+    Action.TURNED_OFF: ('online_since', 'online_seconds', False),
+    Action.STARTED_RECORDING: ('recording_since', 'recording_seconds', True),
+    Action.STOPPED_RECORDING: ('recording_since', 'recording_seconds', False),
+}
+
+BUCKET_SIZES = {
+    Granularity.MINUTE: timedelta(minutes=1),
+    Granularity.HOUR: timedelta(hours=1),
+    Granularity.DAY: timedelta(days=1),
+}
+
+
+def bucket_start(moment, granularity):
+    if timezone.is_aware(moment):
+        moment = moment.astimezone(dt_timezone.utc)
+    moment = moment.replace(second=0, microsecond=0)
+    if granularity >= Granularity.HOUR:
+        moment = moment.replace(minute=0)
+    if granularity >= Granularity.DAY:
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def split_interval(start, end, granularity):
+    """Yield ``(bucket, seconds)`` for the part of ``[start, end)`` that falls in each bucket."""
+    size = BUCKET_SIZES[granularity]
+    bucket = bucket_start(start, granularity)
+    while bucket < end:
+        next_bucket = bucket + size
+        seconds = round((min(end, next_bucket) - max(start, bucket)).total_seconds())
+        if seconds > 0:
+            yield bucket, seconds
+        bucket = next_bucket
+
+
+class RollupDelta:
+    """Accumulates counter increments per ``(company, camera, granularity, bucket)`` before one write."""
+
+    def __init__(self):
+        self.increments = defaultdict(lambda: defaultdict(int))
+
+    def __bool__(self):
+        return bool(self.increments)
+
+    def count(self, company_id, camera_id, moment, field):
+        for granularity in Granularity.values:
+            bucket = bucket_start(moment, granularity)
+            for scope in (camera_id, None):
+                self.increments[company_id, scope, granularity, bucket][field] += 1
+
+    def credit(self, company_id, camera_id, start, end, field):
+        for granularity in Granularity.values:
+            for bucket, seconds in split_interval(start, end, granularity):
+                for scope in (camera_id, None):
+                    self.increments[company_id, scope, granularity, bucket][field] += seconds
+
+    def save(self):
+        """Upsert the touched buckets and add the increments under row locks."""
+        if not self.increments:
+            return
+        with transaction.atomic():
+            CameraActionRollup.objects.bulk_create(
+                [
+                    CameraActionRollup(company_id=company_id, camera_id=camera_id, granularity=granularity, bucket=bucket)
+                    for company_id, camera_id, granularity, bucket in self.increments
+                ],
+                ignore_conflicts=True,
+                batch_size=BATCH_SIZE,
+            )
+            rows = CameraActionRollup.objects.select_for_update().filter(
+                company_id__in={key[0] for key in self.increments},
+                granularity__in={key[2] for key in self.increments},
+                bucket__in={key[3] for key in self.increments},
+            ).order_by('id')
+
+            fields, updated = set(), []
+            for row in rows:
+                increments = self.increments.get((row.company_id, row.camera_id, row.granularity, row.bucket))
+                if not increments:
+                    continue
+                for field, amount in increments.items():
+                    setattr(row, field, F(field) + amount)
+                fields.update(increments)
+                updated.append(row)
+            CameraActionRollup.objects.bulk_update(updated, sorted(fields), batch_size=BATCH_SIZE)
+        self.increments.clear()
+
+
+def record_logs(logs, company_by_camera):
+    """
+    Fold freshly written ``logs`` into the rollups.
+
+    Parameters
+    ----------
+    logs : iterable of CameraActionLog
+        Only ``camera_id``, ``action`` and ``timestamp`` are read.
+    company_by_camera : dict
+        Maps every camera id in ``logs`` to its company id.
+    """
+    logs = sorted(logs, key=lambda log: log.timestamp)
+    if not logs:
+        return
+
+    delta = RollupDelta()
+    with transaction.atomic():
+        interval_cameras = {log.camera_id for log in logs if log.action in INTERVALS}
+        cursors = {
+            cursor.camera_id: cursor
+            for cursor in CameraUptimeCursor.objects.select_for_update().filter(
+                camera_id__in=interval_cameras
+            ).order_by('camera_id')
+        }
+
+        for log in logs:
+            company_id = company_by_camera[log.camera_id]
+            delta.count(company_id, log.camera_id, log.timestamp, COUNTERS[log.action])
+            if log.action not in INTERVALS:
+                continue
+
+            cursor = cursors.get(log.camera_id)
+            if cursor is None:
+                cursor = cursors[log.camera_id] = CameraUptimeCursor(camera_id=log.camera_id, company_id=company_id)
+            cursor_field, duration_field, opens = INTERVALS[log.action]
+            since = getattr(cursor, cursor_field)
+            if opens:
+                if since is None:
+                    setattr(cursor, cursor_field, log.timestamp)
+            elif since is not None:
+                delta.credit(company_id, log.camera_id, since, log.timestamp, duration_field)
+                setattr(cursor, cursor_field, None)
+
+        delta.save()
+        save_cursors(cursors.values())
+
+
+def save_cursors(cursors):
+    CameraUptimeCursor.objects.bulk_create(
+        cursors,
+        update_conflicts=True,
+        unique_fields=['camera'],
+        update_fields=['online_since', 'recording_since'],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def flush_open_intervals(now=None):
+    """
+    Credit still-open online/recording intervals up to ``now`` and move their start to ``now``.
+
+    Run periodically so durations of cameras that stay online are visible
+    without waiting for the next state change. Returns the number of cameras
+    checkpointed.
+    """
+    now = now or timezone.now()
+    flushed = 0
+    open_cursors = CameraUptimeCursor.objects.exclude(online_since=None, recording_since=None)
+    camera_ids = list(open_cursors.values_list('camera_id', flat=True))
+    for start in range(0, len(camera_ids), BATCH_SIZE):
+        delta = RollupDelta()
+        with transaction.atomic():
+            cursors = list(
+                CameraUptimeCursor.objects.select_for_update().filter(
+                    camera_id__in=camera_ids[start:start + BATCH_SIZE]
+                ).order_by('camera_id')
+            )
+            for cursor in cursors:
+                for cursor_field, duration_field in (('online_since', 'online_seconds'),
+                                                     ('recording_since', 'recording_seconds')):
+                    since = getattr(cursor, cursor_field)
+                    if since is not None and since < now:
+                        delta.credit(cursor.company_id, cursor.camera_id, since, now, duration_field)
+                        setattr(cursor, cursor_field, now)
+            delta.save()
+            save_cursors(cursors)
+        flushed += len(cursors)
+    return flushed
+
+
+def rebuild(progress=None):
+    """Drop all rollups and cursors and replay the whole ``CameraActionLog`` table in timestamp order."""
+    with transaction.atomic():
+        CameraActionRollup.objects.all().delete()
+        CameraUptimeCursor.objects.all().delete()
+
+    logs = CameraActionLog.objects.order_by('timestamp', 'id').values_list(
+        'camera_id', 'camera__company_id', 'action', 'timestamp'
+    )
+    replayed, batch, company_by_camera = 0, [], {}
+    for camera_id, company_id, action, timestamp in logs.iterator(chunk_size=BATCH_SIZE):
+        company_by_camera[camera_id] = company_id
+        batch.append(CameraActionLog(camera_id=camera_id, action=action, timestamp=timestamp))
+        if len(batch) == BATCH_SIZE:
+            record_logs(batch, company_by_camera)
+            replayed += len(batch)
+            batch = []
+            if progress:
+                progress(replayed)
+    record_logs(batch, company_by_camera)
+    return replayed + len(batch)
+
+
+def series(company_ids, granularity, since, until, camera_id=None):
+    """Rollup rows of one company-wide (or one camera's) series, oldest bucket first."""
+    rows = CameraActionRollup.objects.filter(
+        company_id__in=company_ids, granularity=granularity, bucket__gte=since, bucket__lt=until
+    )
+    rows = rows.filter(camera_id=camera_id) if camera_id else rows.filter(camera__isnull=True)
+    return rows.order_by('bucket', 'company_id')
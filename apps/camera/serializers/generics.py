@@ -1,6 +1,12 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
 
-from apps.camera.models import Camera, CameraActionLog
+from apps.camera.models import Camera, CameraActionLog, CameraActionRollup
+from apps.camera.rollups import BUCKET_SIZES
+from utils.serializers import JSONObjectField, SparseFieldsetMixin
 
 
 class CameraSerializer(serializers.ModelSerializer):
@@ -10,8 +16,67 @@ class CameraSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'created_at', 'updated_at')
 
 
-class CameraActionLogSerializer(serializers.ModelSerializer):
+class CameraStateSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    name = serializers.CharField()
+    company = serializers.UUIDField(source='company_id')
+    status = serializers.IntegerField()
+    recording_status = serializers.IntegerField()
+    is_moved = serializers.BooleanField()
+
+
+class CameraActionLogSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = CameraActionLog
-        fields = '__all__'
+        fields = (
+            'id', 'camera', 'performed_by', 'action', 'timestamp', 'old_status', 'new_status', 'metadata',
+            'create_time', 'modify_time',
+        )
         read_only_fields = ('id', 'timestamp')
+
+
+class CameraActionLogQuerySerializer(serializers.Serializer):
+    camera = serializers.UUIDField(required=False)
+    company = serializers.UUIDField(required=False)
+    action = serializers.ListField(
+        child=serializers.ChoiceField(choices=CameraActionLog.ActionChoices.choices), required=False
+    )
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+    metadata = JSONObjectField(required=False, help_text='JSON object the log metadata must contain')
+
+
+class CameraRollupQuerySerializer(serializers.Serializer):
+    GRANULARITIES = {
+        'minute': CameraActionRollup.GranularityChoices.MINUTE,
+        'hour': CameraActionRollup.GranularityChoices.HOUR,
+        'day': CameraActionRollup.GranularityChoices.DAY,
+    }
+
+    granularity = serializers.ChoiceField(choices=list(GRANULARITIES), default='hour')
+    company = serializers.UUIDField(required=False)
+    camera = serializers.UUIDField(required=False)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        attrs['granularity'] = self.GRANULARITIES[attrs['granularity']]
+        size = BUCKET_SIZES[attrs['granularity']]
+        attrs.setdefault('until', timezone.now())
+        attrs.setdefault('since', attrs['until'] - size * 24)
+        if attrs['since'] >= attrs['until']:
+            raise serializers.ValidationError({'since': "Must be before until"})
+        if (attrs['until'] - attrs['since']) / size > settings.CAMERA_ROLLUP_MAX_BUCKETS:
+            raise serializers.ValidationError(
+                {'since': f"At most {settings.CAMERA_ROLLUP_MAX_BUCKETS} buckets per request"}
+            )
+        return attrs
+
+
+class CameraActionRollupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CameraActionRollup
+        fields = (
+            'company', 'camera', 'bucket', 'turned_off', 'turned_on', 'moved',
+            'started_recording', 'stopped_recording', 'online_seconds', 'recording_seconds',
+        )
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.camera import state as camera_state
+from apps.camera.models import Camera
+
+
+@receiver(post_save, sender=Camera)
+@receiver(post_delete, sender=Camera)
+def invalidate_camera_state(sender, instance, **kwargs):
+    camera_state.invalidate(instance.id)
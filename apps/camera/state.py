@@ -0,0 +1,171 @@
+"""
+Write-through cache of camera state.
+
+Camera lookups read the current state from the cache. Writes lock the
+camera rows and decide what changed against the DB, so a worker holding a
+stale entry can neither drop a real change nor log one twice; the
+notification pipeline only runs for fields that actually changed.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+
+from apps.camera.models import Camera, CameraActionLog
+
+STATE_FIELDS = ('status', 'recording_status', 'is_moved')
+
+TRANSITIONS = {
+    ('status', Camera.StatusChoices.ONLINE): (CameraActionLog.ActionChoices.TURNED_ON, 'turned_on'),
+    ('status', Camera.StatusChoices.OFFLINE): (CameraActionLog.ActionChoices.TURNED_OFF, 'turned_off'),
+    ('recording_status', Camera.RecordingStatusChoices.RECORDING): (
+        CameraActionLog.ActionChoices.STARTED_RECORDING, 'started_recording'
+    ),
+    ('recording_status', Camera.RecordingStatusChoices.STOPPED): (
+        CameraActionLog.ActionChoices.STOPPED_RECORDING, 'stopped_recording'
+    ),
+    ('is_moved', True): (CameraActionLog.ActionChoices.MOVED, 'moved'),
+}
+
+CHOICE_VALUES = {
+    'status': set(Camera.StatusChoices.values),
+    'recording_status': set(Camera.RecordingStatusChoices.values),
+}
+
+
+def is_valid_value(field, value):
+    if field == 'is_moved':
+        return isinstance(value, bool)
+    return not isinstance(value, bool) and value in CHOICE_VALUES[field]
+
+
+class CameraState:
+    """The columns of ``Camera`` that actions read and write, duck-typed for the notification helpers."""
+    __slots__ = ('id', 'name', 'company_id', 'status', 'recording_status', 'is_moved')
+
+    def __init__(self, id, name, company_id, status, recording_status, is_moved):
+        self.id = id
+        self.name = name
+        self.company_id = company_id
+        self.status = status
+        self.recording_status = recording_status
+        self.is_moved = is_moved
+
+    def __getstate__(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __setstate__(self, state):
+        for field, value in state.items():
+            setattr(self, field, value)
+
+    def diff(self, changes):
+        """
+        Validate ``changes`` and return only the fields whose value differs.
+
+        Raises ``ValidationError`` for values outside the model enums.
+        """
+        errors = {field: _("Invalid value") for field, value in changes.items()
+                  if field not in STATE_FIELDS or not is_valid_value(field, value)}
+        if errors:
+            raise ValidationError(errors)
+        return {field: value for field, value in changes.items() if getattr(self, field) != value}
+
+    def to_camera(self):
+        return Camera(**self.__getstate__())
+
+
+def cache_key(camera_id):
+    return f"camera_state:{camera_id}"
+
+
+def load(camera_ids):
+    rows = Camera.objects.filter(id__in=camera_ids).values('id', 'name', 'company_id', *STATE_FIELDS)
+    return {row['id']: CameraState(**row) for row in rows}
+
+
+def get_many(camera_ids):
+    """Return ``{camera_id: CameraState}``, reading misses from the DB in one query."""
+    keys = {cache_key(camera_id): camera_id for camera_id in camera_ids}
+    cached = cache.get_many(keys.keys())
+    states = {keys[key]: state for key, state in cached.items()}
+
+    missing = [camera_id for camera_id in camera_ids if camera_id not in states]
+    if missing:
+        loaded = load(missing)
+        set_many(loaded.values())
+        states.update(loaded)
+    return states
+
+
+def get(camera_id):
+    return get_many([camera_id]).get(camera_id)
+
+
+def set_many(states):
+    cache.set_many(
+        {cache_key(state.id): state for state in states},
+        timeout=settings.CAMERA_STATE_CACHE_TIMEOUT,
+    )
+
+
+def invalidate(camera_id):
+    cache.delete(cache_key(camera_id))
+
+
+def lock_many(camera_ids, company_ids=None):
+    """
+    Lock the cameras' rows for the rest of the transaction and return their current ``{camera_id: CameraState}``.
+
+    Rows are locked in id order so concurrent batches cannot deadlock; with
+    ``company_ids``, cameras of other companies are left alone. The states
+    (as changed by ``apply`` or the caller) replace the cache entries once
+    the transaction commits.
+    """
+    queryset = Camera.objects.select_for_update().filter(id__in=camera_ids)
+    if company_ids is not None:
+        queryset = queryset.filter(company_id__in=company_ids)
+    rows = queryset.order_by('id').values('id', 'name', 'company_id', *STATE_FIELDS)
+    states = {row['id']: CameraState(**row) for row in rows}
+    transaction.on_commit(lambda: set_many(states.values()))
+    return states
+
+
+def lock(camera_id):
+    """``lock_many`` for one camera; ``None`` if it is gone."""
+    return lock_many([camera_id]).get(camera_id)
+
+
+def apply(state, changes):
+    """
+    Write ``changes`` of a ``state`` returned by ``lock``/``lock_many`` to the DB.
+
+    Returns the fields that changed; a no-op change writes nothing. The
+    cache is refreshed when the transaction commits.
+    """
+    changed = state.diff(changes)
+    if changed:
+        Camera.objects.filter(id=state.id).update(**changed)
+        for field, value in changed.items():
+            setattr(state, field, value)
+    return changed
+
+
+def build_logs(state, old_values, changed, performed_by, source):
+    """``CameraActionLog`` rows and ``(camera, action)`` event pairs for the transitions in ``changed``."""
+    logs, camera_actions = [], []
+    for field, value in changed.items():
+        transition = TRANSITIONS.get((field, value))
+        if transition is None:
+            continue
+        log_action, event_action = transition
+        logs.append(CameraActionLog(
+            camera_id=state.id,
+            performed_by=performed_by,
+            action=log_action,
+            metadata={"field": field, "source": source},
+            old_status=str(old_values[field]),
+            new_status=str(value),
+        ))
+        camera_actions.append((state, event_action))
+    return logs, camera_actions
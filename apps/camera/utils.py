@@ -1,55 +1,89 @@
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
 from django.utils.timezone import now
 
+from apps.notification_service import recipients, versions
 from apps.notification_service.models import Event, SystemNotification
-from apps.users.models import CompanyUser
+from apps.notification_service.registry import CAMERA_ACTIONS
+from apps.notification_service.signals import notify_managers_bulk
 from utils.functions import stopwatch
 
+BULK_BATCH_SIZE = 1000
 
-@stopwatch(action="log_camera_event_and_notify")
-def log_camera_event_and_notify(camera, action, performed_by, extra_metadata=None):
-    metadata = {
-        "camera_id": camera.id,
-        "camera_name": camera.name,
-        "action": action,
-        "performed_by": performed_by.id if performed_by else None,
-        "timestamp": now().isoformat(),
+LOG_EXPORT_COLUMNS = (
+    'id', 'timestamp', 'camera_id', 'performed_by_id', 'action', 'old_status', 'new_status', 'metadata',
+)
+EVENT_EXPORT_COLUMNS = ('id', 'timestamp', 'event_type', 'company_id', 'camera_id', 'details')
+
+
+def build_event_metadata(performed_by, extra_metadata=None):
+    """Compact ``Event.details``: type, company, camera and time already are columns."""
+    return {
+        "performed_by": str(performed_by.id) if performed_by else None,
         **(extra_metadata or {}),
     }
 
-    # Save to Event`s model
-    event = Event.objects.create(
+
+def build_event(camera, action, performed_by, extra_metadata=None, timestamp=None):
+    return Event(
         event_type="camera_" + action,
-        details=metadata,
-        timestamp=now()
+        company_id=camera.company_id,
+        camera_id=camera.id,
+        details=build_event_metadata(performed_by, extra_metadata),
+        timestamp=timestamp or now(),
     )
 
-    # Notify managers
-    managers = CompanyUser.objects.filter(company=camera.company, role=CompanyUser.RoleChoices.MANAGER).select_related(
-        'user')
-
-    channel_layer = get_channel_layer()
-    for manager in managers:
-        SystemNotification.objects.create(
-            receiver=manager.user,
-            title=f"Camera {camera.name} - {action.replace('_', ' ').capitalize()}",
-            description=f"{performed_by.full_name} performed action '{action}' on camera '{camera.name}'",
-            priority=SystemNotification.PriorityTypeChoices.HIGH,
-            source=f"camera:{camera.id}:{action}",
-            event=event,
-            timestamp=now()
-        )
 
-        async_to_sync(channel_layer.group_send)(
-            f"user_{manager.user.id}",
-            {
-                "type": "notify",
-                "content": {
-                    "title": f"Camera {camera.name} - {action}",
-                    "description": f"{performed_by.full_name} performed '{action}'",
-                    "priority": "high",
-                }
-            }
-        )
+def build_notification_params(camera, action, performed_by):
+    return {
+        "camera_name": camera.name,
+        "action": action,
+        "action_display": action.replace('_', ' ').capitalize(),
+        "performer_name": performed_by.full_name if performed_by else "",
+    }
+
+
+@stopwatch(action="log_camera_event_and_notify")
+def log_camera_event_and_notify(camera, action, performed_by, extra_metadata=None):
+    timestamp = now()
+    event = build_event(camera, action, performed_by, extra_metadata, timestamp)
+    event.save()
+    notify_camera_events([(camera, action, event)], performed_by, timestamp)
     return event
+
+
+@stopwatch(action="log_camera_events_and_notify_bulk")
+def log_camera_events_and_notify_bulk(camera_actions, performed_by):
+    """
+    Batch version of ``log_camera_event_and_notify`` for ``(camera, action)`` pairs.
+
+    Events and manager notifications are written with ``bulk_create`` and the
+    recipients of every affected company come from the cached recipient index.
+    """
+    if not camera_actions:
+        return []
+
+    timestamp = now()
+    events = Event.objects.bulk_create(
+        [build_event(camera, action, performed_by, timestamp=timestamp) for camera, action in camera_actions],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    notify_camera_events(
+        [(camera, action, event) for (camera, action), event in zip(camera_actions, events)], performed_by, timestamp
+    )
+    return events
+
+
+def notify_camera_events(camera_events, performed_by, timestamp):
+    """Save the recipients' notifications of ``(camera, action, event)`` triples with one ``bulk_create``."""
+    notifications = []
+    for camera, action, event in camera_events:
+        spec = CAMERA_ACTIONS[action]
+        params = build_notification_params(camera, action, performed_by)
+        notifications.extend(
+            spec.build(SystemNotification, receiver=user_id, params=params, event=event, timestamp=timestamp)
+            for user_id in recipients.resolve(camera.company_id, spec.type_notification)
+        )
+
+    SystemNotification.objects.bulk_create(notifications, batch_size=BULK_BATCH_SIZE)
+    versions.invalidate(*(notification.receiver_id for notification in notifications))
+    notify_managers_bulk(notifications)
+    return notifications
@@ -1,17 +1,44 @@
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from drf_spectacular.utils import (
+    OpenApiParameter,
     extend_schema,
     extend_schema_view
 )
-from rest_framework import viewsets, permissions
+from rest_framework import mixins, viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 
+from apps.camera import rollups, state as camera_state
+from apps.camera.ingest import ingest_camera_updates, validate_updates
 from apps.camera.models import Camera, CameraActionLog
-from apps.camera.serializers.generics import CameraSerializer, CameraActionLogSerializer
-from apps.camera.utils import log_camera_event_and_notify
-from apps.users.permissions import IsCompanyManager
+from apps.camera.parsers import JSONLinesParser, MessagePackParser
+from apps.camera.serializers.generics import (
+    CameraActionLogQuerySerializer,
+    CameraActionLogSerializer,
+    CameraActionRollupSerializer,
+    CameraRollupQuerySerializer,
+    CameraSerializer,
+    CameraStateSerializer,
+)
+from apps.camera.utils import LOG_EXPORT_COLUMNS, log_camera_event_and_notify
+from apps.users.models import CompanyUser
+from apps.users.permissions import IsCompanyEmployee, IsCompanyManager
+from utils.export import STREAM_FORMATS, iter_batches, stream
+from utils.pagination import TimestampCursorPagination
+from utils.query_budget import query_budget
+from utils.replicas import ReplicaReadsMixin
 
 
+# State changes: the JWT user lookup, two permission checks and the state read (1 + 2 + 1); the locked update
+# with its log, rollups and event (2 savepoint + 1 lock + 1 update + 1 log + 9 rollup + 1 event); the notification
+# insert and its managers' roles (2). The first use of a template and of the company directory in a process adds 5.
+@query_budget(queries=4 + 15 + 2 + 5)
 class CameraViewSet(viewsets.ModelViewSet):
     queryset = Camera.objects.all()
     serializer_class = CameraSerializer
@@ -23,54 +50,200 @@ class CameraViewSet(viewsets.ModelViewSet):
         log_camera_event_and_notify(
             camera=serializer.instance,
             action='created',
-            performed_by=self.request.user,
-            extra_metadata={"action": "create"}
+            performed_by=self.request.user
         )
 
+    def get_camera_state(self, pk):
+        """Cached state of a camera the caller manages; 404 otherwise."""
+        try:
+            state = camera_state.get(uuid.UUID(str(pk)))
+        except ValueError:
+            state = None
+        if state is None or not self.request.user.company_memberships.filter(
+                company_id=state.company_id, role=CompanyUser.RoleChoices.MANAGER
+        ).exists():
+            raise NotFound()
+        return state
+
+    def change_state(self, state, get_changes):
+        """
+        Apply ``get_changes(state)``; log and notify only when the state actually changed.
+
+        ``get_changes`` sees the locked row, not the cached state, so toggles flip what is in the DB.
+        """
+        with transaction.atomic():
+            state = camera_state.lock(state.id)
+            if state is None:
+                raise NotFound()
+            changes = get_changes(state)
+            old_values = {field: getattr(state, field, None) for field in changes}
+            changed = camera_state.apply(state, changes)
+            logs, camera_actions = camera_state.build_logs(
+                state, old_values, changed, self.request.user, "api"
+            )
+            CameraActionLog.objects.bulk_create(logs)
+            rollups.record_logs(logs, {state.id: state.company_id})
+            for camera, event_action in camera_actions:
+                log_camera_event_and_notify(
+                    camera=camera,
+                    action=event_action,
+                    performed_by=self.request.user
+                )
+        return Response({**CameraStateSerializer(state).data, "changed": bool(changed)})
+
     @action(detail=True, methods=['post'])
     def toggle_status(self, request, pk=None):
-        camera = self.get_object()
-        camera.status = 'offline' if camera.status == 'online' else 'online'
-        camera.save()
-        log_camera_event_and_notify(
-            camera=camera,
-            action='turned_off' if camera.status == 'offline' else 'turned_on',
-            performed_by=request.user
-        )
-        return Response(CameraSerializer(camera).data)
+        state = self.get_camera_state(pk)
+        target = request.data.get('status')
+        if target is not None:
+            return self.change_state(state, lambda current: {'status': target})
+        return self.change_state(state, lambda current: {'status': (
+            Camera.StatusChoices.OFFLINE if current.status == Camera.StatusChoices.ONLINE
+            else Camera.StatusChoices.ONLINE
+        )})
 
     @action(detail=True, methods=['post'])
     def move(self, request, pk=None):
-        camera = self.get_object()
-        camera.is_moved = True
-        camera.save()
-        log_camera_event_and_notify(
-            camera=camera,
-            action='moved',
-            performed_by=request.user
-        )
-        return Response(CameraSerializer(camera).data)
+        state = self.get_camera_state(pk)
+        return self.change_state(state, lambda current: {'is_moved': True})
 
     @action(detail=True, methods=['post'])
     def toggle_recording(self, request, pk=None):
-        camera = self.get_object()
-        camera.recording_status = (
-            'recording' if camera.recording_status == 'stopped' else 'stopped'
-        )
-        camera.save()
-        log_camera_event_and_notify(
-            camera=camera,
-            action='started_recording' if camera.recording_status == 'recording' else 'stopped_recording',
-            performed_by=request.user
-        )
-        return Response(CameraSerializer(camera).data)
+        state = self.get_camera_state(pk)
+        target = request.data.get('recording_status')
+        if target is not None:
+            return self.change_state(state, lambda current: {'recording_status': target})
+        return self.change_state(state, lambda current: {'recording_status': (
+            Camera.RecordingStatusChoices.STOPPED
+            if current.recording_status == Camera.RecordingStatusChoices.RECORDING
+            else Camera.RecordingStatusChoices.RECORDING
+        )})
+
+    @extend_schema(
+        tags=['Cameras'],
+        summary='Bulk ingest camera state',
+        description='Apply a batch of `{camera_id, status?, recording_status?, is_moved?}` updates sent as a JSON '
+                    'array, JSON lines or msgpack. Only real changes are saved, logged and notified.',
+    )
+    # One permission check and the managed companies instead of the state read; the rest as for one change.
+    @query_budget(queries=3 + 15 + 2 + 5)
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, JSONLinesParser, MessagePackParser])
+    def ingest(self, request):
+        updates, errors = validate_updates(request.data)
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        company_ids = request.user.company_memberships.filter(
+            role=CompanyUser.RoleChoices.MANAGER
+        ).values_list('company_id', flat=True)
+        summary = ingest_camera_updates(updates, request.user, list(company_ids))
+        return Response(summary, status=status.HTTP_200_OK)
 
 
 @extend_schema_view(
-    list=extend_schema(tags=['Camera Logs']),
-    retrieve=extend_schema(tags=['Camera Logs'])
+    list=extend_schema(
+        tags=['Camera Logs'],
+        description='Logs of cameras in the caller\'s companies, newest first, with keyset pagination. '
+                    '`fields=id,action,timestamp` limits the columns fetched and returned; `metadata` filters '
+                    'by JSON containment.',
+        parameters=[
+            CameraActionLogQuerySerializer,
+            OpenApiParameter('fields', str, description='Comma-separated fields to return'),
+        ],
+    ),
+    retrieve=extend_schema(
+        tags=['Camera Logs'],
+        parameters=[OpenApiParameter('fields', str, description='Comma-separated fields to return')],
+    )
 )
-class CameraActionLogViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = CameraActionLog.objects.select_related('camera', 'performed_by').all()
+@query_budget(queries=5)
+class CameraActionLogViewSet(ReplicaReadsMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = CameraActionLogSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TimestampCursorPagination
+
+    def get_queryset(self):
+        company_ids = self.request.user.company_memberships.filter(
+            role__in=[CompanyUser.RoleChoices.MANAGER, CompanyUser.RoleChoices.EMPLOYEE]
+        ).values('company_id')
+        queryset = CameraActionLog.objects.filter(
+            camera_id__in=Camera.objects.filter(company_id__in=company_ids).values('id')
+        )
+
+        fields = CameraActionLogSerializer.requested_fields(self.request)
+        if fields:
+            # ordering columns are needed by the cursor even when not returned
+            queryset = queryset.only(*{'id', 'timestamp', *fields})
+        if self.action not in ('list', 'export'):
+            return queryset
+
+        query = CameraActionLogQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        if 'camera' in params:
+            queryset = queryset.filter(camera_id=params['camera'])
+        if 'company' in params:
+            queryset = queryset.filter(camera_id__in=Camera.objects.filter(company_id=params['company']).values('id'))
+        if params.get('action'):
+            queryset = queryset.filter(action__in=params['action'])
+        if 'since' in params:
+            queryset = queryset.filter(timestamp__gte=params['since'])
+        if 'until' in params:
+            queryset = queryset.filter(timestamp__lt=params['until'])
+        if 'metadata' in params:
+            queryset = queryset.filter(metadata__contains=params['metadata'])
+        return queryset
+
+    @extend_schema(
+        tags=['Camera Logs'],
+        summary='Export camera logs',
+        description='Stream the filtered logs, oldest first, as gzipped CSV or JSON lines. Pass the timestamp of the '
+                    'last received row as `since` to resume; rows sharing that timestamp are sent again, so '
+                    'deduplicate by `id`.',
+        parameters=[
+            CameraActionLogQuerySerializer,
+            OpenApiParameter('export_format', str, enum=STREAM_FORMATS, default='jsonl'),
+        ],
+        responses={(200, 'application/gzip'): bytes},
+    )
+    @action(detail=False, methods=['get'], pagination_class=None)
+    def export(self, request):
+        fmt = request.query_params.get('export_format', 'jsonl')
+        if fmt not in STREAM_FORMATS:
+            raise ValidationError({'export_format': f"One of {', '.join(STREAM_FORMATS)}"})
+
+        columns = list(LOG_EXPORT_COLUMNS)
+        batches = iter_batches(self.get_queryset(), columns, chunk_size=settings.CAMERA_LOG_EXPORT_CHUNK_SIZE)
+        response = StreamingHttpResponse(stream(batches, columns, fmt), content_type='application/gzip')
+        response['Content-Disposition'] = f'attachment; filename="camera_logs.{fmt}.gz"'
+        return response
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=['Camera Analytics'],
+        summary='Camera action rollups',
+        description='Action counts and online/recording seconds per minute, hour or day bucket. Without `camera` '
+                    'the company-wide series is returned, otherwise the series of that camera.',
+        parameters=[CameraRollupQuerySerializer],
+    )
+)
+@query_budget(queries=6)
+class CameraRollupViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    serializer_class = CameraActionRollupSerializer
+    permission_classes = [permissions.IsAuthenticated, IsCompanyEmployee]
+    pagination_class = None
+
+    def get_queryset(self):
+        query = CameraRollupQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        company_ids = self.request.user.company_memberships.filter(
+            role__in=[CompanyUser.RoleChoices.MANAGER, CompanyUser.RoleChoices.EMPLOYEE]
+        ).values_list('company_id', flat=True)
+        if 'company' in params:
+            company_ids = company_ids.filter(company_id=params['company'])
+        return rollups.series(
+            list(company_ids), params['granularity'], params['since'], params['until'], params.get('camera')
+        )
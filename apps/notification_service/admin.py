@@ -1,16 +1,34 @@
 from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
 
+from apps.notification_service import versions
 from apps.notification_service.models import (
     EmailNotification,
     SMSNotification,
     SystemNotification,
-    Event
+    Event,
+    NotificationTemplate,
+    ArchivedRecord,
+    ReadWatermark,
 )
-from utils.admins import BaseSilentDeleteAdmin
+from utils.admins import BaseSilentDeleteAdmin, LargeTableAdminMixin, json_preview
+
+
+class NotificationAdminMixin:
+    """Bump the list version of the receivers of notifications deleted through the stock admin views."""
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        versions.invalidate(obj.receiver_id)
+
+    def delete_queryset(self, request, queryset):
+        receiver_ids = set(queryset.values_list('receiver_id', flat=True))
+        super().delete_queryset(request, queryset)
+        versions.invalidate(*receiver_ids)
 
 
 @admin.register(EmailNotification)
-class EmailNotificationAdmin(BaseSilentDeleteAdmin):
+class EmailNotificationAdmin(NotificationAdminMixin, LargeTableAdminMixin, BaseSilentDeleteAdmin):
     list_display = [
         'title',
         'description',
@@ -18,14 +36,11 @@ class EmailNotificationAdmin(BaseSilentDeleteAdmin):
         'email',
         'is_deleted',
         'source',
-        'create_time', 'priority'
+        'timestamp', 'priority'
     ]
     list_filter = ['is_viewed', 'priority']
-    search_fields = [
-        'title',
-        'is_deleted',
-        'email'
-    ]
+    list_select_related = ('receiver',)
+    search_fields = ['=receiver__email']
     raw_id_fields = ('receiver',)
     # readonly_fields = []
 
@@ -42,22 +57,24 @@ class EmailNotificationAdmin(BaseSilentDeleteAdmin):
 
 
 @admin.register(SMSNotification)
-class SMSNotificationAdmin(BaseSilentDeleteAdmin):
+class SMSNotificationAdmin(NotificationAdminMixin, LargeTableAdminMixin, BaseSilentDeleteAdmin):
     list_display = [
         'description',
         'receiver',
         'is_deleted',
         'phone_number',
         'source',
-        'create_time', 'priority'
+        'timestamp', 'priority'
     ]
-    search_fields = ['phone_number']
+    list_select_related = ('receiver',)
+    # The receiver's current number, unique-indexed; the row's own phone_number has no index.
+    search_fields = ['receiver__phone_number__exact']
     raw_id_fields = ('receiver',)
     list_filter = ['is_viewed', 'priority']
 
 
 @admin.register(SystemNotification)
-class SystemNotificationAdmin(BaseSilentDeleteAdmin):
+class SystemNotificationAdmin(NotificationAdminMixin, LargeTableAdminMixin, BaseSilentDeleteAdmin):
     list_display = [
         'title',
         'description',
@@ -65,19 +82,50 @@ class SystemNotificationAdmin(BaseSilentDeleteAdmin):
         'is_deleted',
         'is_viewed',
         'source',
-        'create_time', 'priority'
+        'timestamp', 'priority'
     ]
-    search_fields = ['title', 'receiver__email']
+    list_select_related = ('receiver',)
+    search_fields = ['=receiver__email']
     raw_id_fields = ('receiver',)
     list_filter = ['is_viewed', 'priority']
 
 
 @admin.register(Event)
-class EventAdmin(BaseSilentDeleteAdmin):
+class EventAdmin(LargeTableAdminMixin, BaseSilentDeleteAdmin):
     list_display = [
         'event_type',
-        'details',
+        'company',
+        'camera',
+        'details_preview',
         'timestamp'
     ]
-    search_fields = ['id', 'event_type']
+    list_select_related = ('company', 'camera')
+    search_fields = ['event_type__exact']
     list_filter = ['event_type']
+    raw_id_fields = ('company', 'camera')
+
+    @admin.display(description=_('details'))
+    def details_preview(self, obj):
+        return json_preview(obj.details)
+
+
+@admin.register(NotificationTemplate)
+class NotificationTemplateAdmin(admin.ModelAdmin):
+    list_display = ['source', 'title']
+    search_fields = ['source', 'title']
+
+
+@admin.register(ArchivedRecord)
+class ArchivedRecordAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'original_id', 'receiver_id', 'timestamp', 'archived_at']
+    list_filter = ['kind']
+    search_fields = ['=original_id', '=receiver_id']
+
+
+@admin.register(ReadWatermark)
+class ReadWatermarkAdmin(admin.ModelAdmin):
+    list_display = ['user', 'channel', 'read_through']
+    list_filter = ['channel']
+    list_select_related = ['user']
+    search_fields = ['=user__email']
+    raw_id_fields = ['user']
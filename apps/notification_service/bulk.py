@@ -0,0 +1,62 @@
+"""
+Bulk notification mutations in bounded chunks.
+
+A user-wide ``UPDATE`` over a heavy inbox locks every matching row for as
+long as the statement runs. These helpers walk the rows newest first in
+``(timestamp, id)`` keyset order, the order of the ``(receiver, -timestamp)``
+indexes (ids are UUID7, so this is id order as well), and update at most
+``NOTIFICATION_BULK_CHUNK_SIZE`` rows per statement, each committed on its
+own. They return the number of rows changed.
+"""
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.notification_service.models import ReadWatermark
+
+
+def update_in_chunks(queryset, chunk_size=None, **values):
+    """Apply ``values`` to every row of ``queryset``, one chunk per ``UPDATE``."""
+    chunk_size = chunk_size or settings.NOTIFICATION_BULK_CHUNK_SIZE
+    updated, after = 0, None
+    while True:
+        chunk = queryset
+        if after is not None:
+            timestamp, pk = after
+            chunk = chunk.filter(Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=pk))
+        keys = list(chunk.order_by('-timestamp', '-id').values_list('timestamp', 'id')[:chunk_size])
+        if not keys:
+            return updated
+        # Re-applying the filter skips rows another request changed in the meantime.
+        updated += queryset.filter(id__in=[pk for _timestamp, pk in keys]).update(**values)
+        if len(keys) < chunk_size:
+            return updated
+        after = keys[-1]
+
+
+def update_selected(queryset, ids, chunk_size=None, **values):
+    """Apply ``values`` to the rows of ``queryset`` whose id is in ``ids``, ``chunk_size`` ids per ``UPDATE``."""
+    chunk_size = chunk_size or settings.NOTIFICATION_BULK_CHUNK_SIZE
+    ids = list(dict.fromkeys(ids))
+    return sum(
+        queryset.filter(id__in=ids[offset:offset + chunk_size]).update(**values)
+        for offset in range(0, len(ids), chunk_size)
+    )
+
+
+def mark_all_read(model, user, until=None):
+    """
+    Move the user's read watermark of ``model``'s channel to ``until`` (now by default).
+
+    Returns how many unread rows of ``model`` that covered; the rows
+    themselves are not written.
+    """
+    until = until or timezone.now()
+    count = model.objects.unread_for(user).filter(timestamp__lte=until).count()
+    # The watermark only moves forward; a conflicting insert means one exists at or past ``until``.
+    watermarks = ReadWatermark.objects.filter(user=user, channel=model.channel)
+    if not watermarks.filter(read_through__lt=until).update(read_through=until):
+        ReadWatermark.objects.bulk_create(
+            [ReadWatermark(user=user, channel=model.channel, read_through=until)], ignore_conflicts=True
+        )
+    return count
@@ -1,26 +1,78 @@
+import asyncio
+import json
+from urllib.parse import parse_qs
+
 from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from channels.exceptions import StopConsumer
+from channels.generic.http import AsyncHttpConsumer
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
 
+from apps.notification_service import registry
+from apps.notification_service.models import SystemNotification
 from apps.users.models import CompanyUser
 
+NOTIFICATIONS_GROUP = "notifications_managers"
+
+
+def user_group(user_id):
+    """Group of one user's connections, for notifications meant for that user alone."""
+    return f"user_{user_id}"
+
+
+def build_notification_payload(content):
+    """Shape a channel-layer notification into the payload pushed to clients."""
+    return {
+        "type": "notification",
+        "id": content["id"],
+        "title": content["title"],
+        "description": content["description"],
+        "priority": content["priority"],
+        "timestamp": content["timestamp"],
+    }
+
+
+class NotificationSubscriptionMixin:
+    """Channel-layer subscription shared by the WebSocket and SSE consumers."""
+    group_name = NOTIFICATIONS_GROUP
+
+    @staticmethod
+    def is_authenticated(user):
+        return not (user is None or isinstance(user, AnonymousUser) or not user.is_authenticated)
 
-class NotificationConsumer(AsyncJsonWebsocketConsumer):
+    async def subscribe(self):
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.channel_layer.group_add(user_group(self.user.pk), self.channel_name)
+
+    async def unsubscribe(self):
+        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        # Unset when the connection was refused before subscribing.
+        user = getattr(self, 'user', None)
+        if user is not None:
+            await self.channel_layer.group_discard(user_group(user.pk), self.channel_name)
+
+
+class NotificationConsumer(NotificationSubscriptionMixin, AsyncJsonWebsocketConsumer):
 
     async def connect(self):
         user = self.scope["user"]
 
-        if user is None or isinstance(user, AnonymousUser) or not user.is_authenticated:
+        if not self.is_authenticated(user):
             await self.close()
         else:
             self.user = user
-            await self.channel_layer.group_add("notifications_managers", self.channel_name)
+            await self.subscribe()
 
             await self.accept()
 
 
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard("notifications_managers", self.channel_name)
+        await self.unsubscribe()
 
     async def receive_json(self, content, **kwargs):
         await self.send_json({
@@ -28,17 +80,99 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
         })
 
     async def send_notification(self, event):
-        await self.send_json({
-            "type": "notification",
-            "id": event['content']["id"],
-            "title": event['content']["title"],
-            "description": event['content']["description"],
-            "priority": event['content']["priority"],
-            "timestamp": event['content']["timestamp"]
-        })
+        await self.send_json(build_notification_payload(event['content']))
 
     # @sync_to_async
     # def _is_user_manager(self, user):
     #     return user.company_memberships.filter(
     #         role=CompanyUser.RoleChoices.MANAGER.value
     #     ).exists()
+
+
+class NotificationEventStreamConsumer(NotificationSubscriptionMixin, AsyncHttpConsumer):
+    """
+    Server-Sent Events stream of the same payloads as ``NotificationConsumer``.
+
+    Read-only dashboards can use this instead of a WebSocket. A reconnecting
+    client sends the last received notification id as ``Last-Event-ID`` (or the
+    ``last_event_id`` query param) and the notifications it missed are replayed
+    before live delivery resumes.
+    """
+    heartbeat_task = None
+
+    async def handle(self, body):
+        user = self.scope.get("user")
+        if not self.is_authenticated(user):
+            await self.send_response(401, b"", headers=[(b"Content-Type", b"text/plain")])
+            raise StopConsumer()
+
+        self.user = user
+        await self.send_headers(headers=[
+            (b"Content-Type", b"text/event-stream"),
+            (b"Cache-Control", b"no-cache"),
+            (b"X-Accel-Buffering", b"no"),
+        ])
+        await self.send_body(f"retry: {settings.SSE_RETRY_MS}\n\n".encode(), more_body=True)
+
+        last_event_id = self.get_last_event_id()
+        if last_event_id:
+            for item in await self.get_missed_notifications(last_event_id):
+                await self.send_event(build_notification_payload(item))
+
+        await self.subscribe()
+        self.heartbeat_task = asyncio.ensure_future(self.heartbeat())
+
+    async def http_request(self, message):
+        # Unlike the base class, keep the consumer alive after ``handle`` so
+        # channel-layer messages keep being dispatched until the client leaves.
+        if "body" in message:
+            self.body.append(message["body"])
+        if not message.get("more_body"):
+            await self.handle(b"".join(self.body))
+
+    async def disconnect(self):
+        if self.heartbeat_task is not None:
+            self.heartbeat_task.cancel()
+        await self.unsubscribe()
+
+    async def send_notification(self, event):
+        await self.send_event(build_notification_payload(event['content']))
+
+    async def send_event(self, payload):
+        data = json.dumps(payload, cls=DjangoJSONEncoder)
+        await self.send_body(
+            f"id: {payload['id']}\nevent: {payload['type']}\ndata: {data}\n\n".encode(),
+            more_body=True,
+        )
+
+    async def heartbeat(self):
+        while True:
+            await asyncio.sleep(settings.SSE_HEARTBEAT_INTERVAL)
+            await self.send_body(b": keep-alive\n\n", more_body=True)
+
+    def get_last_event_id(self):
+        for name, value in self.scope.get("headers", []):
+            if name == b"last-event-id":
+                return value.decode()
+        query_params = parse_qs(self.scope.get("query_string", b"").decode())
+        return query_params.get("last_event_id", [None])[0]
+
+    @database_sync_to_async
+    def get_missed_notifications(self, last_event_id):
+        # The anchor may have been deleted or disabled since it was sent; it still marks the position.
+        try:
+            anchor_timestamp, anchor_id = SystemNotification.objects.filter(receiver=self.user).values_list(
+                "timestamp", "id"
+            ).get(id=last_event_id)
+        except (SystemNotification.DoesNotExist, ValidationError):
+            return []
+
+        # Keyset on (timestamp, id): rows sharing the anchor's timestamp are neither skipped nor repeated.
+        after_anchor = Q(timestamp__gt=anchor_timestamp) | Q(timestamp=anchor_timestamp, id__gt=anchor_id)
+        rows = SystemNotification.objects.active_for(self.user).filter(after_anchor).order_by("timestamp", "id").values(
+            "id", "title", "description", "priority", "timestamp", "template_id", "template_params"
+        )[:settings.SSE_REPLAY_LIMIT]
+        return [
+            {**registry.render_row(row), "id": str(row["id"]), "timestamp": row["timestamp"].isoformat()}
+            for row in rows
+        ]
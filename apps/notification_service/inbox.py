@@ -0,0 +1,90 @@
+"""
+Unified inbox: a user's system, email and SMS notifications as one timeline.
+
+Each table is read newest first through its own ``(timestamp, id)`` keyset
+on the ``*_active_idx`` index, at most one page per table, and the three
+row streams are merged lazily with ``heapq.merge``; the union is never
+built in memory or in SQL. The page cursor records, per channel, the last
+row handed out, so the next page resumes every table exactly where the
+merge stopped consuming it.
+"""
+import base64
+import heapq
+import json
+from datetime import datetime
+from itertools import islice
+from operator import itemgetter
+from uuid import UUID
+
+from django.db.models import Q
+
+from apps.notification_service import registry
+from apps.notification_service.models import NOTIFICATION_CHANNELS, ReadWatermark, is_read
+
+INBOX_FIELDS = (
+    'id', 'title', 'description', 'priority', 'timestamp', 'is_viewed', 'type_notification', 'source', 'event_id',
+    'template_id', 'template_params',
+)
+# Rows fetched per round trip from each table while merging.
+FETCH_SIZE = 100
+
+
+def encode_cursor(positions):
+    data = {channel: [timestamp.isoformat(), str(pk)] for channel, (timestamp, pk) in positions.items()}
+    return base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode()).decode()
+
+
+def decode_cursor(text):
+    """Inverse of ``encode_cursor``; raises ``ValueError`` for anything it did not produce."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(text.encode()))
+        channels = dict(NOTIFICATION_CHANNELS)
+        return {
+            channel: (datetime.fromisoformat(timestamp), UUID(pk))
+            for channel, (timestamp, pk) in data.items() if channel in channels
+        }
+    except (TypeError, ValueError, AttributeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def channel_rows(channel, model, user, after, limit):
+    """Up to ``limit`` active rows of ``model`` older than ``after``, newest first, tagged with ``channel``."""
+    queryset = model.objects.active_for(user)
+    if after is not None:
+        timestamp, pk = after
+        queryset = queryset.filter(Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=pk))
+    rows = queryset.order_by('-timestamp', '-id').values(*INBOX_FIELDS)[:limit]
+    for row in rows.iterator(chunk_size=min(limit, FETCH_SIZE)):
+        row['channel'] = channel
+        yield row
+
+
+class InboxPage:
+    """
+    One page of the merged timeline, produced while iterating.
+
+    ``next_cursor`` is only meaningful once the page has been consumed.
+    """
+
+    def __init__(self, user, positions=None, limit=50):
+        self.user = user
+        self.positions = dict(positions or {})
+        self.limit = limit
+        self.count = 0
+
+    def __iter__(self):
+        read_throughs = dict(ReadWatermark.objects.filter(user=self.user).values_list('channel', 'read_through'))
+        streams = [
+            channel_rows(channel, model, self.user, self.positions.get(channel), self.limit)
+            for channel, model in NOTIFICATION_CHANNELS
+        ]
+        merged = heapq.merge(*streams, key=itemgetter('timestamp', 'id'), reverse=True)
+        for row in islice(merged, self.limit):
+            self.positions[row['channel']] = (row['timestamp'], row['id'])
+            self.count += 1
+            row['is_viewed'] = is_read(row, read_throughs.get(row['channel']))
+            yield registry.render_row(row)
+
+    @property
+    def next_cursor(self):
+        return encode_cursor(self.positions) if self.count == self.limit else None
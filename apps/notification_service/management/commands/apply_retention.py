@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from apps.notification_service.retention import RetentionEngine
+
+
+class Command(BaseCommand):
+    help = "Archive and prune notifications and events according to NOTIFICATION_RETENTION"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backend', choices=['table', 'jsonl'])
+        parser.add_argument('--batch-size', type=int)
+        parser.add_argument('--pause', type=float, help="Seconds to sleep between batches")
+        parser.add_argument('--max-batches', type=int, help="Stop after this many batches; re-run to resume")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        engine = RetentionEngine(
+            backend=options['backend'],
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+            max_batches=options['max_batches'],
+            dry_run=options['dry_run'],
+            progress=lambda kind, total: self.stdout.write(f"{kind}: {total} rows"),
+        )
+        stats = engine.run()
+
+        verb = "Would archive" if options['dry_run'] else "Archived"
+        summary = ", ".join(f"{count} {kind}" for kind, count in stats.items()) or "nothing"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {summary} in {engine.batches} batches."))
@@ -0,0 +1,93 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users.models import User
+from utils.middleware import get_user
+from utils.pooled_postgresql.pool import pool_stats
+
+
+class Command(BaseCommand):
+    help = "Count DB connects for a WebSocket handshake storm and concurrent notification list requests"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--handshakes', type=int, default=500,
+                            help="Concurrent WebSocket authentications (JWTAuthMiddleware user lookups)")
+        parser.add_argument('--requests', type=int, default=500, help="Notification list requests")
+        parser.add_argument('--threads', type=int, default=16, help="Threads serving the list requests")
+        parser.add_argument('--email', help="User to authenticate as; defaults to any active user")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True)
+        if options['email']:
+            users = users.filter(email=options['email'])
+        user = users.order_by('date_joined').first()
+        if user is None:
+            raise CommandError("No active user to authenticate as; create one or pass --email")
+        token = AccessToken.for_user(user)
+        connections.close_all()
+
+        database = settings.DATABASES['default']
+        self.stdout.write(f"ENGINE {database['ENGINE']}, CONN_MAX_AGE {database['CONN_MAX_AGE']}, "
+                          f"CONN_HEALTH_CHECKS {database['CONN_HEALTH_CHECKS']}, POOL {database.get('POOL')}")
+        self.measure("handshake storm", options['handshakes'], lambda: self.handshake_storm(token, options['handshakes']))
+        self.measure("list endpoint", options['requests'],
+                     lambda: self.list_requests(token, options['requests'], options['threads']))
+
+    def measure(self, label, count, run):
+        opened = []
+
+        def count_open(sender, connection, **kwargs):
+            opened.append(connection.alias)
+
+        connection_created.connect(count_open)
+        before = pool_stats()
+        start = time.perf_counter()
+        try:
+            run()
+        finally:
+            elapsed = time.perf_counter() - start
+            connection_created.disconnect(count_open)
+
+        line = f"{label}: {count} in {elapsed:.2f}s, {len(opened)} connection opens"
+        for name, stats in pool_stats().items():
+            previous = before.get(name, {})
+            checkouts = stats['checkouts'] - previous.get('checkouts', 0)
+            wait = stats['wait_seconds'] - previous.get('wait_seconds', 0.0)
+            line += (f"; pool {name}: {stats['connects'] - previous.get('connects', 0)} server connects, "
+                     f"{checkouts} checkouts, avg wait {wait / checkouts * 1000 if checkouts else 0:.2f} ms, "
+                     f"max wait {stats['max_wait_seconds'] * 1000:.2f} ms, {stats['timeouts']} timeouts")
+        self.stdout.write(line)
+
+    @staticmethod
+    def handshake_storm(token, count):
+        async def storm():
+            await asyncio.gather(*(get_user(token) for _ in range(count)))
+
+        asyncio.run(storm())
+
+    @staticmethod
+    def list_requests(token, count, threads):
+        handler = WSGIHandler()
+        factory = RequestFactory()
+
+        def request(_number):
+            environ = factory.get('/api/v1/notifications/', HTTP_AUTHORIZATION=f"Bearer {token}").environ
+            response = handler(environ, lambda status, headers: None)
+            # Closing the response sends request_finished, which closes (or returns) the connection.
+            response.close()
+            return response.status_code
+
+        with override_settings(ALLOWED_HOSTS=['*']), ThreadPoolExecutor(threads) as executor:
+            statuses = set(executor.map(request, range(count)))
+        if statuses != {200}:
+            raise CommandError(f"List requests answered with {sorted(statuses)}")
@@ -0,0 +1,101 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from apps.notification_service.models import SystemNotification
+from utils.functions import uuid7
+
+
+class Command(BaseCommand):
+    help = "Compare insert throughput and index size of the legacy and compact notification layouts"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000)
+        parser.add_argument('--batch-size', type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        batch_size = options['batch_size']
+        self.stdout.write(f"Benchmarking {rows} inserts on {connection.vendor} (batch size {batch_size})...")
+
+        for layout in ('legacy', 'compact'):
+            elapsed, table_size, index_size = self.run_layout(layout, rows, batch_size)
+            self.stdout.write(
+                f"{layout:>8}: {rows / elapsed:,.0f} rows/s, "
+                f"table {self.format_size(table_size)}, indexes {self.format_size(index_size)}"
+            )
+
+    def run_layout(self, layout, rows, batch_size):
+        table = f"bench_notification_{layout}"
+        columns = ['id', 'receiver_id', 'title', 'description', 'template_id', 'template_params', 'is_deleted',
+                   'source', 'priority', 'is_viewed', 'timestamp', 'type_notification', 'is_type_enabled']
+        if layout == 'legacy':
+            columns += ['create_time', 'modify_time']
+
+        with connection.cursor() as cursor:
+            self.create_scratch_table(cursor, table, layout)
+            insert_sql = (
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(['%s'] * len(columns))})"
+            )
+            receiver_id = uuid.uuid4().hex
+            template_id = uuid.uuid4().hex
+            start = time.perf_counter()
+            for offset in range(0, rows, batch_size):
+                batch = [
+                    self.build_row(layout, receiver_id, template_id, offset + i)
+                    for i in range(min(batch_size, rows - offset))
+                ]
+                cursor.executemany(insert_sql, batch)
+            elapsed = time.perf_counter() - start
+            table_size, index_size = self.relation_sizes(cursor, table)
+            cursor.execute(f"DROP TABLE {table}")
+        return elapsed, table_size, index_size
+
+    @staticmethod
+    def build_row(layout, receiver_id, template_id, i):
+        now = timezone.now()
+        if layout == 'legacy':
+            return (
+                uuid.uuid4().hex, receiver_id, f"Camera camera-{i % 500} - Turned off",
+                f"Operator {i % 50} performed action 'turned_off' on camera 'camera-{i % 500}'",
+                None, '{}', False, f"camera:{i % 500}:turned_off", 2, False, now, 4, True, now, now,
+            )
+        return (
+            uuid7().hex, receiver_id, '', '', template_id,
+            f'{{"camera": "camera-{i % 500}", "performer": "Operator {i % 50}"}}',
+            False, 'camera.turned_off', 2, False, now, 4, True,
+        )
+
+    @staticmethod
+    def create_scratch_table(cursor, table, layout):
+        # The notification tables carry create_time/modify_time; the compact layout is the same table without them.
+        source_table = SystemNotification._meta.db_table
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"CREATE TEMP TABLE {table} (LIKE {source_table} INCLUDING DEFAULTS INCLUDING INDEXES)")
+            if layout == 'compact':
+                cursor.execute(f"ALTER TABLE {table} DROP COLUMN create_time, DROP COLUMN modify_time")
+            return
+
+        cursor.execute(f"CREATE TEMP TABLE {table} AS SELECT * FROM {source_table} WHERE 0")
+        cursor.execute(f"CREATE UNIQUE INDEX {table}_pk ON {table} (id)")
+        cursor.execute(f"CREATE INDEX {table}_timestamp ON {table} (timestamp)")
+        if layout == 'compact':
+            cursor.execute(f"ALTER TABLE {table} DROP COLUMN create_time")
+            cursor.execute(f"ALTER TABLE {table} DROP COLUMN modify_time")
+
+    @staticmethod
+    def relation_sizes(cursor, table):
+        if connection.vendor != 'postgresql':
+            return None, None
+        cursor.execute("SELECT pg_table_size(%s), pg_indexes_size(%s)", [table, table])
+        return cursor.fetchone()
+
+    @staticmethod
+    def format_size(size):
+        if size is None:
+            return "n/a"
+        return f"{size / (1024 * 1024):.1f} MiB"
@@ -0,0 +1,46 @@
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.notification_service.models import EmailNotification, SMSNotification, SystemNotification
+from utils.query_plan import assert_uses_index
+
+
+def endpoint_querysets(user_id):
+    """The queries each notification endpoint issues, keyed by URL name."""
+    notification_id = uuid.uuid4()
+    active = SystemNotification.objects.active_for(user_id)
+    yield 'notification-list', active.values(
+        "id", "title", "description", "priority", "timestamp", "is_viewed",
+        "type_notification", "source", "event_id", "template_id", "template_params",
+    )
+    yield 'notification-list?type', active.filter(type_notification=SystemNotification.TypeNotificationChoices.ONLINE_CAMERA)
+    yield 'notification-list?priority', active.filter(priority=SystemNotification.PriorityTypeChoices.HIGH)
+    yield 'notification-list?from_time', active.filter(timestamp__range=(timezone.now(), timezone.now()))
+    for model in (SystemNotification, EmailNotification, SMSNotification):
+        yield f'notification-detail[{model.__name__}]', model.objects.active_for(user_id).filter(id=notification_id)
+    yield 'mark-notification-as-read', active.filter(id=notification_id)
+    yield 'mark-selected-notifications', SystemNotification.objects.unread_for(user_id).filter(id__in=[notification_id])
+    yield 'delete-selected-notifications', active.filter(id__in=[notification_id])
+    yield 'mark-all-notifications', SystemNotification.objects.unread_for(user_id)
+    yield 'delete-all-notifications', active
+
+
+class Command(BaseCommand):
+    help = "Fail if any notification endpoint query falls back to a sequential scan"
+
+    def handle(self, *args, **options):
+        failures = []
+        for label, queryset in endpoint_querysets(uuid.uuid4()):
+            try:
+                assert_uses_index(queryset, label)
+            except AssertionError as e:
+                failures.append(str(e))
+                self.stdout.write(self.style.ERROR(f"SEQ SCAN  {label}"))
+            else:
+                self.stdout.write(f"index     {label}")
+
+        if failures:
+            raise CommandError("\n\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("All notification endpoint queries use an index."))
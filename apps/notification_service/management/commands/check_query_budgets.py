@@ -0,0 +1,158 @@
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.camera.models import Camera, CameraActionLog
+from apps.camera.urls import CAMERA_API_V1
+from apps.notification_service.models import Event, SystemNotification
+from apps.notification_service.registry import CAMERA_ACTIONS
+from apps.notification_service.urls import NOTIFICATION_API_V1
+from apps.users.models import Company, CompanyUser, User
+from apps.users.urls import USER_API_V1
+from utils.query_budget import exercise, iter_patterns
+
+# They empty the manager's inbox, so they run after every other endpoint.
+RUN_LAST = ('mark-all-notifications', 'delete-all-notifications')
+
+
+def build_fixtures(size):
+    """A company with a manager and ``size`` employees, customers, cameras, logs, events and notifications."""
+    tag = uuid.uuid4().hex[:8]
+    company = Company.objects.create(name=f"Query budget {tag}")
+
+    def make_users(prefix, count):
+        users = [
+            User(email=f"{prefix}{i}.{tag}@example.com", username=f"{prefix}{i}.{tag}@example.com",
+                 full_name=f"{prefix.title()} {i}", phone_number=f"+98{uuid.uuid4().int % 10 ** 11:011d}")
+            for i in range(count)
+        ]
+        return User.objects.bulk_create(users)
+
+    manager, *employees = make_users('staff', size + 1)
+    customers = make_users('customer', size)
+    outsiders = make_users('outsider', size)
+    manager.set_password('budget-password')
+    manager.save(update_fields=['password'])
+
+    CompanyUser.objects.bulk_create(
+        [CompanyUser(company=company, user=manager, role=CompanyUser.RoleChoices.MANAGER)]
+        + [CompanyUser(company=company, user=user, role=CompanyUser.RoleChoices.EMPLOYEE) for user in employees]
+        + [CompanyUser(company=company, user=user, role=CompanyUser.RoleChoices.CUSTOMER) for user in customers]
+    )
+    cameras = Camera.objects.bulk_create([
+        Camera(company=company, name=f"Camera {i}", ip_address=f"172.31.{i // 250}.{i % 250 + 1}",
+               status=Camera.StatusChoices.ONLINE, recording_status=Camera.RecordingStatusChoices.RECORDING)
+        for i in range(size)
+    ])
+    logs = CameraActionLog.objects.bulk_create([
+        CameraActionLog(camera=camera, performed_by=manager, action=CameraActionLog.ActionChoices.TURNED_ON,
+                        old_status='1', new_status='0', metadata={"source": "fixture"})
+        for camera in cameras
+    ])
+    events = Event.objects.bulk_create([
+        Event(event_type=Event.TypeChoices.CAMERA_TURNED_ON, company=company, camera=camera,
+              details={"performed_by": str(manager.id)})
+        for camera in cameras
+    ])
+    spec = CAMERA_ACTIONS['turned_on']
+    notifications = SystemNotification.objects.bulk_create([
+        spec.build(SystemNotification, receiver=manager, event=event,
+                   params={"camera_name": event.camera.name, "action": "turned_on"})
+        for event in events
+    ])
+    return {
+        'company': company, 'manager': manager, 'employee': employees[0], 'customers': customers,
+        'outsiders': outsiders, 'camera': cameras[0], 'log': logs[0], 'event': events[0],
+        'notifications': notifications,
+    }
+
+
+def fixture_requests(fixtures):
+    """``(method, kwargs, data)`` calls per URL name; URLs without arguments default to a plain GET."""
+    company_id = str(fixtures['company'].id)
+    camera_id = str(fixtures['camera'].id)
+    notification_ids = [str(notification.id) for notification in fixtures['notifications']]
+    membership = CompanyUser.objects.get(company=fixtures['company'], user=fixtures['employee'])
+    outsiders = fixtures['outsiders']
+    return {
+        'event-detail': [('get', {'pk': fixtures['event'].id}, None)],
+        'event-recipients': [('get', {'pk': fixtures['event'].id}, None)],
+        'notification-detail': [('get', {'pk': notification_ids[0]}, None)],
+        'mark-notification-as-read': [('post', {'pk': notification_ids[0]}, None)],
+        'mark_as_delete': [('post', {'pk': notification_ids[1]}, None)],
+        'mark-all-notifications': [('post', {}, None)],
+        'mark-selected-notifications': [('post', {}, {'notification_ids': notification_ids[2:]})],
+        'delete-selected-notifications': [('post', {}, {'notification_ids': notification_ids[2:4]})],
+        'delete-all-notifications': [('post', {}, None)],
+        'camera-log-detail': [('get', {'pk': fixtures['log'].id}, None)],
+        'camera-ingest': [('post', {}, [{'camera_id': camera_id, 'status': Camera.StatusChoices.OFFLINE}])],
+        'camera-toggle-status': [('post', {'pk': camera_id}, None)],
+        'camera-move': [('post', {'pk': camera_id}, None)],
+        'camera-toggle-recording': [('post', {'pk': camera_id}, None)],
+        'company-detail': [('get', {'pk': company_id}, None)],
+        'company-users': [
+            ('get', {'company_id': company_id}, None),
+            ('post', {'company_id': company_id},
+             [{'user_id': str(user.id), 'role': CompanyUser.RoleChoices.EMPLOYEE} for user in outsiders[:5]]),
+        ],
+        'company-user-detail': [('get', {'company_id': company_id, 'pk': membership.id}, None)],
+        'change-role': [('post', {'company_id': company_id, 'pk': membership.id},
+                         {'role': CompanyUser.RoleChoices.MANAGER})],
+        'customers': [
+            ('get', {'company_id': company_id}, None),
+            ('post', {'company_id': company_id}, [{'user_id': str(user.id)} for user in outsiders[5:10]]),
+        ],
+        'customers-import': [('post', {'company_id': company_id},
+                              [{'email': user.email} for user in outsiders[10:]])],
+        'company-members': [('get', {'company_id': company_id}, None)],
+        'member-detail': [('get', {'company_id': company_id, 'pk': fixtures['employee'].id}, None)],
+        'user-registration': [('post', {}, {'email': f"registered.{uuid.uuid4().hex}@example.com",
+                                             'password': 'budget-password'})],
+        'token_obtain_pair': [('post', {}, {'username': fixtures['manager'].email, 'password': 'budget-password'})],
+        'token_refresh': [('post', {}, {'refresh': str(RefreshToken.for_user(fixtures['manager']))})],
+    }
+
+
+class Command(BaseCommand):
+    help = "Request every API v1 endpoint against realistic fixtures and fail on query budget violations"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=25,
+                            help="Rows per fixture kind; N+1 queries grow with it")
+
+    def handle(self, *args, **options):
+        config = {**settings.QUERY_BUDGET, 'MODE': 'log'}
+        with override_settings(QUERY_BUDGET=config, ALLOWED_HOSTS=['*']), transaction.atomic():
+            fixtures = build_fixtures(options['size'])
+            client = APIClient()
+            # A real token, so every request pays for the same user lookup as in production.
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(fixtures['manager'])}")
+            patterns = NOTIFICATION_API_V1 + CAMERA_API_V1 + USER_API_V1
+            requests = fixture_requests(fixtures)
+            results = exercise(client, patterns, {**requests, **{name: [] for name in RUN_LAST}})
+            results += exercise(client, [pattern for pattern in iter_patterns(patterns) if pattern.name in RUN_LAST],
+                                {name: requests[name] for name in RUN_LAST})
+            transaction.set_rollback(True)
+
+        failures = []
+        for result in results:
+            if result.queries is None:
+                self.stdout.write(self.style.WARNING(f"SKIPPED  {result.name}: {result.problem}"))
+                continue
+            budget = '-' if result.budget.queries is None else result.budget.queries
+            line = (f"{result.method:<6} {result.path:<90} {result.status} "
+                    f"{result.queries:>3}/{budget} queries {result.seconds * 1000:7.1f} ms")
+            if result.problem:
+                failures.append(result.problem)
+                self.stdout.write(self.style.ERROR(f"OVER     {line}"))
+            else:
+                self.stdout.write(f"ok       {line}")
+
+        if failures:
+            raise CommandError("\n\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("All exercised endpoints are within their query budgets."))
@@ -0,0 +1,65 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.notification_service.scale_data import CHANNEL_MODELS, ScaleDataGenerator, parse_roles
+
+
+class Command(BaseCommand):
+    help = "Generate deterministic companies, members, cameras, events and notifications for scale testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help="Same seed, same data")
+        parser.add_argument('--companies', type=int, default=10)
+        parser.add_argument('--members-per-company', type=int, default=100)
+        parser.add_argument('--roles', default='manager=5,employee=25,customer=70',
+                            help="Role weights of generated members, e.g. 'manager=5,employee=25,customer=70'")
+        parser.add_argument('--cameras-per-company', type=int, default=20)
+        parser.add_argument('--events-per-company', type=int, default=1_000)
+        parser.add_argument('--notifications', type=int, default=100_000, help="Rows per channel")
+        parser.add_argument('--channels', nargs='+', choices=list(CHANNEL_MODELS), default=['system'])
+        parser.add_argument('--days', type=int, default=90, help="Spread timestamps over this many days")
+        parser.add_argument('--chunk-size', type=int, default=10_000)
+        parser.add_argument('--first-chunk', type=int, default=0,
+                            help="Chunk number to start from, to append to an earlier run of the same seed")
+        parser.add_argument('--workers', type=int,
+                            help="Worker processes; defaults to the CPU count on PostgreSQL and 1 elsewhere")
+        parser.add_argument('--no-copy', action='store_true', help="Use bulk_create even on PostgreSQL")
+
+    def handle(self, *args, **options):
+        try:
+            roles = parse_roles(options['roles'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options['notifications'] and options['events_per_company'] < 1:
+            raise CommandError("Notifications reference events; --events-per-company must be at least 1")
+
+        workers = options['workers']
+        if workers is None:
+            workers = os.cpu_count() if connection.vendor == 'postgresql' else 1
+
+        generator = ScaleDataGenerator(
+            seed=options['seed'],
+            companies=options['companies'],
+            members_per_company=options['members_per_company'],
+            roles=roles,
+            cameras_per_company=options['cameras_per_company'],
+            events_per_company=options['events_per_company'],
+            days=options['days'],
+            chunk_size=options['chunk_size'],
+            first_chunk=options['first_chunk'],
+            workers=workers,
+            use_copy=False if options['no_copy'] else None,
+            progress=lambda label, total: self.stdout.write(f"{label}: {total}"),
+        )
+        start = time.perf_counter()
+        stats = generator.run(options['notifications'], options['channels'])
+        elapsed = time.perf_counter() - start
+
+        rows = sum(stats.values())
+        summary = ", ".join(f"{count} {label}" for label, count in stats.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {summary} in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s, {workers} workers)."
+        ))
@@ -1,7 +1,8 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from faker import Faker
 
 from apps.camera.models import Camera
+from apps.notification_service import versions
 from apps.notification_service.models import (
     EmailNotification,
     SMSNotification,
@@ -12,12 +13,15 @@ from apps.users.models import User, Company
 
 fake = Faker()
 
+BULK_BATCH_SIZE = 5_000
+
 
 class Command(BaseCommand):
     help = "Generate fake test data for notifications and preferences"
 
     def add_arguments(self, parser):
         parser.add_argument('--count', type=int, default=10)
+        parser.add_argument('--email', help="Receiver of the generated notifications; defaults to any active user")
 
     def handle(self, *args, **kwargs):
         self.stdout.write("Starting test data generation...")
@@ -26,7 +30,12 @@ class Command(BaseCommand):
         # Get active companies, all cameras, all users
         companies = list(Company.objects.filter(is_active=True))
         cameras = list(Camera.objects.all())
-        user = User.objects.get(is_active=True, email="dehghan215@gmail.com")
+        users = User.objects.filter(is_active=True)
+        if kwargs['email']:
+            users = users.filter(email=kwargs['email'])
+        user = users.order_by('date_joined').first()
+        if user is None:
+            raise CommandError("No active user to receive the notifications; create one or pass --email")
 
         self.stdout.write(f"Found {len(companies)} companies, {len(cameras)} cameras, {(user)} users.")
 
@@ -79,9 +88,10 @@ class Command(BaseCommand):
                 type_notification=fake.random_int(min=0, max=4)
             ))
 
-        SystemNotification.objects.bulk_create(system_notifications)
-        SMSNotification.objects.bulk_create(sms_notifications)
-        EmailNotification.objects.bulk_create(email_notifications)
+        SystemNotification.objects.bulk_create(system_notifications, batch_size=BULK_BATCH_SIZE)
+        SMSNotification.objects.bulk_create(sms_notifications, batch_size=BULK_BATCH_SIZE)
+        EmailNotification.objects.bulk_create(email_notifications, batch_size=BULK_BATCH_SIZE)
+        versions.invalidate_all()
 
         self.stdout.write(
             f"Created {len(system_notifications)} system, {len(sms_notifications)} sms, and {len(email_notifications)} email notifications."
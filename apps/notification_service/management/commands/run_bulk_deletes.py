@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from utils import bulk_delete
+
+
+class Command(BaseCommand):
+    help = "Carry out the bulk deletes queued from the admin (run from cron, e.g. every minute)"
+
+    def handle(self, *args, **options):
+        finished = bulk_delete.run_pending()
+        for model, job in finished:
+            line = f"{model._meta.label}: {job['status']}, {job['deleted']} of about {job['total']} rows deleted"
+            self.stdout.write(self.style.ERROR(line) if job['status'] == 'failed' else line)
+        self.stdout.write(self.style.SUCCESS(f"Ran {len(finished)} bulk delete jobs."))
@@ -0,0 +1,139 @@
+# Generated by Django 4.2.22 on 2026-10-19 01:34
+
+from string import Formatter
+
+from django.db import migrations, models
+import django.db.models.deletion
+import utils.functions
+import uuid
+
+NOTIFICATION_MODELS = ('SystemNotification', 'EmailNotification', 'SMSNotification')
+
+
+def render_text(text, params):
+    return ''.join(
+        literal + (format(params.get(field_name, ''), format_spec or '') if field_name is not None else '')
+        for literal, field_name, format_spec, _conversion in Formatter().parse(text)
+    )
+
+
+def inline_template_text(apps, schema_editor):
+    """Before the template columns go, store the text of templated rows inline so no notification loses it."""
+    templates = {
+        template.id: template for template in apps.get_model('notification_service', 'NotificationTemplate').objects.all()
+    }
+    for name in NOTIFICATION_MODELS:
+        model = apps.get_model('notification_service', name)
+        rows = model.objects.filter(template__isnull=False).only('id', 'title', 'description', 'template_id',
+                                                                    'template_params')
+        batch = []
+        for row in rows.iterator(chunk_size=2000):
+            template = templates[row.template_id]
+            row.title = row.title or render_text(template.title, row.template_params or {})
+            row.description = row.description or render_text(template.description, row.template_params or {})
+            batch.append(row)
+            if len(batch) == 2000:
+                model.objects.bulk_update(batch, ['title', 'description'])
+                batch = []
+        model.objects.bulk_update(batch, ['title', 'description'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification_service', '0003_emailnotification_is_type_enabled_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationTemplate',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('create_time', models.DateTimeField(auto_now_add=True, verbose_name='Create Time')),
+                ('modify_time', models.DateTimeField(auto_now=True, verbose_name='Modify Time')),
+                ('source', models.CharField(max_length=255, unique=True, verbose_name='source')),
+                ('title', models.CharField(max_length=255, verbose_name='title')),
+                ('description', models.TextField(max_length=10000, verbose_name='description')),
+            ],
+            options={
+                'verbose_name': 'Notification Template',
+                'verbose_name_plural': 'Notification Templates',
+            },
+        ),
+        migrations.AddField(
+            model_name='emailnotification',
+            name='template_params',
+            field=models.JSONField(blank=True, default=dict, verbose_name='template parameters'),
+        ),
+        migrations.AddField(
+            model_name='smsnotification',
+            name='template_params',
+            field=models.JSONField(blank=True, default=dict, verbose_name='template parameters'),
+        ),
+        migrations.AddField(
+            model_name='systemnotification',
+            name='template_params',
+            field=models.JSONField(blank=True, default=dict, verbose_name='template parameters'),
+        ),
+        migrations.AlterField(
+            model_name='emailnotification',
+            name='description',
+            field=models.TextField(blank=True, default='', max_length=10000, verbose_name='description'),
+        ),
+        migrations.AlterField(
+            model_name='emailnotification',
+            name='id',
+            field=models.UUIDField(default=utils.functions.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='emailnotification',
+            name='title',
+            field=models.CharField(blank=True, default='', max_length=255, verbose_name='title'),
+        ),
+        migrations.AlterField(
+            model_name='smsnotification',
+            name='description',
+            field=models.TextField(blank=True, default='', max_length=10000, verbose_name='description'),
+        ),
+        migrations.AlterField(
+            model_name='smsnotification',
+            name='id',
+            field=models.UUIDField(default=utils.functions.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='smsnotification',
+            name='title',
+            field=models.CharField(blank=True, default='', max_length=255, verbose_name='title'),
+        ),
+        migrations.AlterField(
+            model_name='systemnotification',
+            name='description',
+            field=models.TextField(blank=True, default='', max_length=10000, verbose_name='description'),
+        ),
+        migrations.AlterField(
+            model_name='systemnotification',
+            name='id',
+            field=models.UUIDField(default=utils.functions.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='systemnotification',
+            name='title',
+            field=models.CharField(blank=True, default='', max_length=255, verbose_name='title'),
+        ),
+        migrations.AddField(
+            model_name='emailnotification',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='notification_service.notificationtemplate', verbose_name='template'),
+        ),
+        migrations.AddField(
+            model_name='smsnotification',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='notification_service.notificationtemplate', verbose_name='template'),
+        ),
+        migrations.AddField(
+            model_name='systemnotification',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='notification_service.notificationtemplate', verbose_name='template'),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, inline_template_text),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.22 on 2026-10-19 01:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification_service', '0004_compact_notification_storage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emailnotification',
+            name='type_notification',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'CREATE_CUSTOMER_BY_EMPLOYEE'), (1, 'RECORDING_CAMERA'), (2, 'STOPPED_CAMERA'), (3, 'ONLINE_CAMERA'), (4, 'OFFLINE_CAMERA'), (5, 'MOVED_CAMERA'), (6, 'CREATED_CAMERA')], verbose_name='application type of notification'),
+        ),
+        migrations.AlterField(
+            model_name='smsnotification',
+            name='type_notification',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'CREATE_CUSTOMER_BY_EMPLOYEE'), (1, 'RECORDING_CAMERA'), (2, 'STOPPED_CAMERA'), (3, 'ONLINE_CAMERA'), (4, 'OFFLINE_CAMERA'), (5, 'MOVED_CAMERA'), (6, 'CREATED_CAMERA')], verbose_name='application type of notification'),
+        ),
+        migrations.AlterField(
+            model_name='systemnotification',
+            name='type_notification',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'CREATE_CUSTOMER_BY_EMPLOYEE'), (1, 'RECORDING_CAMERA'), (2, 'STOPPED_CAMERA'), (3, 'ONLINE_CAMERA'), (4, 'OFFLINE_CAMERA'), (5, 'MOVED_CAMERA'), (6, 'CREATED_CAMERA')], verbose_name='application type of notification'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.22 on 2026-10-19 01:37
+
+from django.db import migrations, models
+import django.utils.timezone
+import utils.functions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification_service', '0005_notification_type_camera_choices'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRecord',
+            fields=[
+                ('id', models.UUIDField(default=utils.functions.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('system', 'System Notification'), ('email', 'Email Notification'), ('sms', 'Sms Notification'), ('event', 'Event')], max_length=10, verbose_name='kind')),
+                ('original_id', models.UUIDField(verbose_name='original id')),
+                ('receiver_id', models.UUIDField(blank=True, null=True, verbose_name='receiver id')),
+                ('timestamp', models.DateTimeField(verbose_name='timestamp')),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='archived at')),
+                ('payload', models.JSONField(default=dict, verbose_name='payload')),
+            ],
+            options={
+                'verbose_name': 'Archived Record',
+                'verbose_name_plural': 'Archived Records',
+                'indexes': [models.Index(fields=['kind', 'receiver_id', 'timestamp'], name='notificatio_kind_54184c_idx'), models.Index(fields=['original_id'], name='notificatio_origina_ccca77_idx')],
+            },
+        ),
+    ]
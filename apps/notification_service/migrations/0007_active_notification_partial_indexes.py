@@ -0,0 +1,49 @@
+# Generated by Django 4.2.22 on 2026-10-19 01:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification_service', '0006_archived_record'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='emailnotification',
+            name='notificatio_receive_4a55dc_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='smsnotification',
+            name='notificatio_receive_bc6470_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='systemnotification',
+            name='notificatio_receive_95411a_idx',
+        ),
+        migrations.AddIndex(
+            model_name='emailnotification',
+            index=models.Index(condition=models.Q(('is_deleted', False), ('is_type_enabled', True)), fields=['receiver', '-timestamp'], include=('priority', 'type_notification', 'is_viewed'), name='email_notif_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emailnotification',
+            index=models.Index(condition=models.Q(('is_deleted', False), ('is_type_enabled', True), ('is_viewed', False)), fields=['receiver', '-timestamp'], name='email_notif_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='smsnotification',
+            index=models.Index(condition=models.Q(('is_deleted', False), ('is_type_enabled', True)), fields=['receiver', '-timestamp'], include=('priority', 'type_notification', 'is_viewed'), name='sms_notif_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='smsnotification',
+            index=models.Index(condition=models.Q(('is_deleted', False), ('is_type_enabled', True), ('is_viewed', False)), fields=['receiver', '-timestamp'], name='sms_notif_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='systemnotification',
+            index=models.Index(condition=models.Q(('is_deleted', False), ('is_type_enabled', True)), fields=['receiver', '-timestamp'], include=('priority', 'type_notification', 'is_viewed'), name='system_notif_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='systemnotification',
+            index=models.Index(condition=models.Q(('is_deleted', False), ('is_type_enabled', True), ('is_viewed', False)), fields=['receiver', '-timestamp'], name='system_notif_unread_idx'),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 4.2.22 on 2026-10-19 01:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+BATCH_SIZE = 1000
+REDUNDANT_DETAILS = ('camera_id', 'camera_name', 'action', 'timestamp')
+
+
+def link_camera_events(apps, schema_editor):
+    """Move ``camera_id`` out of camera event details into the new columns and drop duplicated keys."""
+    Camera = apps.get_model('camera', 'Camera')
+    Event = apps.get_model('notification_service', 'Event')
+
+    events = Event.objects.filter(event_type__startswith='camera_').only('id', 'details').order_by('id')
+    batch = []
+    for event in events.iterator(chunk_size=BATCH_SIZE):
+        try:
+            event.camera_id = uuid.UUID(str(event.details.get('camera_id')))
+        except (AttributeError, ValueError):
+            continue
+        event.details = {key: value for key, value in event.details.items() if key not in REDUNDANT_DETAILS}
+        batch.append(event)
+        if len(batch) == BATCH_SIZE:
+            save_batch(Camera, Event, batch)
+            batch = []
+    save_batch(Camera, Event, batch)
+
+
+def save_batch(Camera, Event, events):
+    companies = dict(
+        Camera.objects.filter(id__in={event.camera_id for event in events}).values_list('id', 'company_id')
+    )
+    linked = []
+    for event in events:
+        if event.camera_id in companies:
+            event.company_id = companies[event.camera_id]
+            linked.append(event)
+    Event.objects.bulk_update(linked, ['camera', 'company', 'details'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('camera', '0003_camera_action_rollups'),
+        ('users', '0001_initial'),
+        ('notification_service', '0007_active_notification_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='event',
+            options={'get_latest_by': 'timestamp', 'ordering': ['-timestamp'], 'verbose_name': 'Event', 'verbose_name_plural': 'Events'},
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='camera',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='events', to='camera.camera', verbose_name='camera'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='company',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='events', to='users.company', verbose_name='company'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='details',
+            field=models.JSONField(blank=True, default=dict, verbose_name='details'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='event_type',
+            field=models.CharField(choices=[('camera_created', 'Camera created'), ('camera_turned_on', 'Camera turned on'), ('camera_turned_off', 'Camera turned off'), ('camera_moved', 'Camera moved'), ('camera_started_recording', 'Camera started recording'), ('camera_stopped_recording', 'Camera stopped recording'), ('customer_created', 'Customer created')], max_length=50, verbose_name='event type'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['event_type', 'timestamp'], name='notificatio_event_t_11f0c8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['company', 'timestamp'], name='notificatio_company_a33a67_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['camera', 'timestamp'], name='notificatio_camera__524a0b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['timestamp'], name='notificatio_timesta_9f7508_idx'),
+        ),
+        migrations.RunPython(link_camera_events, migrations.RunPython.noop),
+    ]
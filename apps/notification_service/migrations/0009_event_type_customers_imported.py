@@ -0,0 +1,18 @@
+# Generated by Django 4.2.22 on 2026-10-19 01:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification_service', '0008_event_store'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='event_type',
+            field=models.CharField(choices=[('camera_created', 'Camera created'), ('camera_turned_on', 'Camera turned on'), ('camera_turned_off', 'Camera turned off'), ('camera_moved', 'Camera moved'), ('camera_started_recording', 'Camera started recording'), ('camera_stopped_recording', 'Camera stopped recording'), ('customer_created', 'Customer created'), ('customers_imported', 'Customers imported')], max_length=50, verbose_name='event type'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.22 on 2026-10-19 02:16
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('notification_service', '0009_event_type_customers_imported'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadWatermark',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('create_time', models.DateTimeField(auto_now_add=True, verbose_name='Create Time')),
+                ('modify_time', models.DateTimeField(auto_now=True, verbose_name='Modify Time')),
+                ('read_through', models.DateTimeField(verbose_name='read through')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='notification_read_watermark', to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'Read Watermark',
+                'verbose_name_plural': 'Read Watermarks',
+            },
+        ),
+    ]
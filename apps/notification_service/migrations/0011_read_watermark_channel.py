@@ -0,0 +1,30 @@
+# Generated by Django 4.2.22 on 2026-10-19 02:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('notification_service', '0010_read_watermark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='readwatermark',
+            name='channel',
+            field=models.CharField(choices=[('system', 'System'), ('email', 'Email'), ('sms', 'Sms')], default='system', max_length=10, verbose_name='channel'),
+        ),
+        migrations.AlterField(
+            model_name='readwatermark',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_read_watermarks', to=settings.AUTH_USER_MODEL, verbose_name='user'),
+        ),
+        migrations.AddConstraint(
+            model_name='readwatermark',
+            constraint=models.UniqueConstraint(fields=('user', 'channel'), name='read_watermark_user_channel_uniq'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.22 on 2026-10-19 02:39
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def stamp_deleted_rows(apps, schema_editor):
+    """
+    Start the grace period of rows soft-deleted before ``deleted_at`` existed now.
+
+    Their real deletion time is unknown (bulk deletes never touched
+    ``modify_time``), and counting from the migration never archives early.
+    """
+    now = timezone.now()
+    for name in ('SystemNotification', 'EmailNotification', 'SMSNotification'):
+        apps.get_model('notification_service', name).objects.filter(is_deleted=True).update(deleted_at=now)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification_service', '0011_read_watermark_channel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailnotification',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='deleted at'),
+        ),
+        migrations.AddField(
+            model_name='smsnotification',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='deleted at'),
+        ),
+        migrations.AddField(
+            model_name='systemnotification',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='deleted at'),
+        ),
+        migrations.RunPython(stamp_deleted_rows, migrations.RunPython.noop),
+    ]
@@ -1,23 +1,63 @@
 import logging
+from datetime import datetime
 
-from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
+from django.db.models import CharField, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from apps.users.models import User
-from utils.models import BaseModel
+from apps.users.models import Company, User
+from utils.functions import uuid7
+from utils.models import BaseModel, CompactBaseModel
 
 logger = logging.getLogger(__name__)
 
 
 class Event(BaseModel):
+    """
+    Something that happened in a company, e.g. a camera action.
+
+    Type, company, camera and time are indexed columns; ``details`` only holds
+    what they don't cover, e.g. ``{"performed_by": "<user id>"}``.
+    """
+
+    class TypeChoices(models.TextChoices):
+        CAMERA_CREATED = 'camera_created', _('Camera created')
+        CAMERA_TURNED_ON = 'camera_turned_on', _('Camera turned on')
+        CAMERA_TURNED_OFF = 'camera_turned_off', _('Camera turned off')
+        CAMERA_MOVED = 'camera_moved', _('Camera moved')
+        CAMERA_STARTED_RECORDING = 'camera_started_recording', _('Camera started recording')
+        CAMERA_STOPPED_RECORDING = 'camera_stopped_recording', _('Camera stopped recording')
+        CUSTOMER_CREATED = 'customer_created', _('Customer created')
+        CUSTOMERS_IMPORTED = 'customers_imported', _('Customers imported')
+
     event_type = models.CharField(
         max_length=50,
+        choices=TypeChoices.choices,
         verbose_name=_("event type")
     )
+    company = models.ForeignKey(
+        Company,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='events',
+        db_index=False,
+        verbose_name=_("company")
+    )
+    camera = models.ForeignKey(
+        'camera.Camera',
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='events',
+        db_index=False,
+        verbose_name=_("camera")
+    )
     details = models.JSONField(
         default=dict,
+        blank=True,
         verbose_name=_("details")
     )
     timestamp = models.DateTimeField(
@@ -25,9 +65,88 @@ class Event(BaseModel):
         verbose_name=_("events timestamp")
     )
 
+    def recipients(self):
+        return event_recipients(self.pk)
+
     class Meta:
         verbose_name = _('Event')
         verbose_name_plural = _('Events')
+        ordering = ['-timestamp']
+        get_latest_by = 'timestamp'
+        indexes = [
+            models.Index(fields=["event_type", "timestamp"]),
+            models.Index(fields=["company", "timestamp"]),
+            models.Index(fields=["camera", "timestamp"]),
+            models.Index(fields=["timestamp"]),
+        ]
+
+
+class NotificationTemplate(BaseModel):
+    """Title/description text shared by every notification rendered from it."""
+    source = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name=_("source"),
+    )
+    title = models.CharField(
+        max_length=255,
+        verbose_name=_('title'),
+    )
+    description = models.TextField(
+        max_length=10000,
+        verbose_name=_('description'),
+    )
+
+    class Meta:
+        verbose_name = _('Notification Template')
+        verbose_name_plural = _('Notification Templates')
+
+    def __str__(self):
+        return self.source
+
+
+class NotificationQuerySet(models.QuerySet):
+    def active_for(self, user):
+        """Rows a user can see; matches the ``*_active_idx`` partial indexes."""
+        return self.filter(receiver=user, is_deleted=False, is_type_enabled=True)
+
+    def unread_for(self, user):
+        """
+        Unread rows of a user; matches the ``*_unread_idx`` partial indexes.
+
+        Rows at or before the user's ``ReadWatermark`` of this channel count
+        as read whatever their ``is_viewed``; the watermark is a subquery, so
+        this stays one statement.
+        """
+        return self.filter(
+            receiver=user, is_viewed=False, is_deleted=False, is_type_enabled=True,
+            timestamp__gt=read_through_subquery(user, self.model.channel),
+        )
+
+
+ACTIVE_CONDITION = models.Q(is_deleted=False, is_type_enabled=True)
+UNREAD_CONDITION = models.Q(is_viewed=False, is_deleted=False, is_type_enabled=True)
+ACTIVE_COVERED_FIELDS = ['priority', 'type_notification', 'is_viewed']
+
+
+# Stands in for "no watermark" so comparisons against it never yield NULL.
+NEVER_READ = datetime(1970, 1, 1)
+
+
+def read_through_subquery(user, channel):
+    """SQL expression for the user's ``read_through`` on ``channel``, ``NEVER_READ`` without a watermark."""
+    watermark = ReadWatermark.objects.filter(user=user, channel=channel).values('read_through')[:1]
+    return Coalesce(Subquery(watermark), Value(NEVER_READ, output_field=models.DateTimeField()))
+
+
+def get_read_through(user, channel):
+    """The user's ``read_through`` on ``channel``, or ``None``."""
+    return ReadWatermark.objects.filter(user=user, channel=channel).values_list('read_through', flat=True).first()
+
+
+def is_read(row, read_through):
+    """Whether a notification (``.values()`` row) is read given the user's ``read_through``."""
+    return row['is_viewed'] or (read_through is not None and row['timestamp'] <= read_through)
 
 
 class BaseNotificationModel(BaseModel):
@@ -43,19 +162,45 @@ class BaseNotificationModel(BaseModel):
         STOPPED_CAMERA = 2, _("STOPPED_CAMERA")
         ONLINE_CAMERA = 3, _("ONLINE_CAMERA")
         OFFLINE_CAMERA = 4, _("OFFLINE_CAMERA")
+        MOVED_CAMERA = 5, _("MOVED_CAMERA")
+        CREATED_CAMERA = 6, _("CREATED_CAMERA")
 
+    # Time-ordered keys keep inserts at the right edge of the primary-key index; older UUID4 ids stay valid.
+    id = models.UUIDField(primary_key=True, editable=False, default=uuid7)
     title = models.CharField(
         max_length=255,
+        blank=True,
+        default='',
         verbose_name=_('title'),
     )
     description = models.TextField(
         max_length=10000,
+        blank=True,
+        default='',
         verbose_name=_('description'),
     )
+    template = models.ForeignKey(
+        NotificationTemplate,
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name='+',
+        verbose_name=_('template'),
+    )
+    template_params = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_('template parameters'),
+    )
     is_deleted = models.BooleanField(
         default=False,
         verbose_name=_("is deleted")
     )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("deleted at"),
+    )
     source = models.CharField(
         max_length=255,
         null=True,
@@ -89,21 +234,46 @@ class BaseNotificationModel(BaseModel):
         verbose_name=_("is type enabled for the user")
     )
 
+    objects = NotificationQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        """Keep ``deleted_at`` in step with ``is_deleted``; retention counts the grace period from it."""
+        deleted_at = self.deleted_at
+        if not self.is_deleted:
+            self.deleted_at = None
+        elif self.deleted_at is None:
+            self.deleted_at = timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.deleted_at != deleted_at:
+            kwargs['update_fields'] = {*update_fields, 'deleted_at'}
+        super().save(*args, **kwargs)
+
+    def render(self):
+        """Return ``(title, description)``, rendering the template when text is not stored inline."""
+        from apps.notification_service import registry
+        return registry.render(self.template_id, self.template_params, self.title, self.description)
+
+    def get_title(self):
+        return self.render()[0]
+
+    def get_description(self):
+        return self.render()[1]
+
     @classmethod
     def get_by_source(cls, source):
-        try:
-            return cls.objects.get(source=source)
-        except ObjectDoesNotExist:
-            logger.error(f"NotificationTemplate with source {source} does not exist.")
-            return None
+        from apps.notification_service import registry
+        return registry.get_template(source)
 
     class Meta:
         abstract = True
+        get_latest_by = 'timestamp'
         verbose_name = _('Base Notification')
         verbose_name_plural = _('Base Notifications')
 
 
 class EmailNotification(BaseNotificationModel):
+    channel = 'email'
+
     receiver = models.ForeignKey(
         to=User,
         related_name='received_emails',
@@ -115,19 +285,31 @@ class EmailNotification(BaseNotificationModel):
     )
 
     def __str__(self) -> str:
-        return f"{str(self.id)} {self.title}"
+        return f"{str(self.id)} {self.get_title()}"
 
     class Meta:
         verbose_name = _('Email Notification')
         verbose_name_plural = _('Email Notifications')
         indexes = [
-            models.Index(fields=["receiver", "is_viewed", "priority"]),
+            models.Index(
+                fields=["receiver", "-timestamp"],
+                include=ACTIVE_COVERED_FIELDS,
+                condition=ACTIVE_CONDITION,
+                name="email_notif_active_idx",
+            ),
+            models.Index(
+                fields=["receiver", "-timestamp"],
+                condition=UNREAD_CONDITION,
+                name="email_notif_unread_idx",
+            ),
             models.Index(fields=["timestamp"]),
         ]
         ordering = ["-timestamp"]
 
 
 class SMSNotification(BaseNotificationModel):
+    channel = 'sms'
+
     receiver = models.ForeignKey(
         to=User,
         related_name='received_sms',
@@ -140,19 +322,31 @@ class SMSNotification(BaseNotificationModel):
     )
 
     def __str__(self) -> str:
-        return f"{str(self.id)} {self.title}"
+        return f"{str(self.id)} {self.get_title()}"
 
     class Meta:
         verbose_name = _('Sms Notification')
         verbose_name_plural = _('Sms Notifications')
         indexes = [
-            models.Index(fields=["receiver", "is_viewed", "priority"]),
+            models.Index(
+                fields=["receiver", "-timestamp"],
+                include=ACTIVE_COVERED_FIELDS,
+                condition=ACTIVE_CONDITION,
+                name="sms_notif_active_idx",
+            ),
+            models.Index(
+                fields=["receiver", "-timestamp"],
+                condition=UNREAD_CONDITION,
+                name="sms_notif_unread_idx",
+            ),
             models.Index(fields=["timestamp"]),
         ]
         ordering = ["-timestamp"]
 
 
 class SystemNotification(BaseNotificationModel):
+    channel = 'system'
+
     receiver = models.ForeignKey(
         to=User,
         related_name='received_system_notifications',
@@ -161,13 +355,136 @@ class SystemNotification(BaseNotificationModel):
     )
 
     def __str__(self) -> str:
-        return f"{str(self.id)} {self.title}"
+        return f"{str(self.id)} {self.get_title()}"
 
     class Meta:
         verbose_name = _('System Notification')
         verbose_name_plural = _('System Notifications')
         indexes = [
-            models.Index(fields=["receiver", "is_viewed", "priority"]),
+            models.Index(
+                fields=["receiver", "-timestamp"],
+                include=ACTIVE_COVERED_FIELDS,
+                condition=ACTIVE_CONDITION,
+                name="system_notif_active_idx",
+            ),
+            models.Index(
+                fields=["receiver", "-timestamp"],
+                condition=UNREAD_CONDITION,
+                name="system_notif_unread_idx",
+            ),
             models.Index(fields=["timestamp"]),
         ]
         ordering = ["-timestamp"]
+
+
+class ReadWatermark(BaseModel):
+    """
+    Everything a user received on ``channel`` at or before ``read_through`` counts as read.
+
+    "Mark all as read" moves the watermark instead of updating every unread
+    row, so it is one row write however long the user's history is.
+    ``is_viewed`` stays the per-row override: it records rows read one by one
+    after the watermark.
+    """
+
+    class ChannelChoices(models.TextChoices):
+        SYSTEM = 'system', _('System')
+        EMAIL = 'email', _('Email')
+        SMS = 'sms', _('Sms')
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='notification_read_watermarks',
+        verbose_name=_('user'),
+    )
+    channel = models.CharField(
+        max_length=10,
+        choices=ChannelChoices.choices,
+        default=ChannelChoices.SYSTEM,
+        verbose_name=_("channel"),
+    )
+    read_through = models.DateTimeField(
+        verbose_name=_("read through"),
+    )
+
+    class Meta:
+        verbose_name = _('Read Watermark')
+        verbose_name_plural = _('Read Watermarks')
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'channel'], name='read_watermark_user_channel_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} read {self.channel} through {self.read_through}"
+
+
+NOTIFICATION_CHANNELS = tuple((model.channel, model) for model in (SystemNotification, EmailNotification, SMSNotification))
+CHANNEL_MODELS = dict(NOTIFICATION_CHANNELS)
+
+
+def unread_counts(user):
+    """Unread notifications of the user per channel, watermarks and per-row reads applied."""
+    return {channel: model.objects.unread_for(user).count() for channel, model in NOTIFICATION_CHANNELS}
+
+
+RECIPIENT_FIELDS = ('id', 'receiver_id', 'is_viewed', 'is_deleted', 'timestamp')
+
+
+def event_recipients(event_id):
+    """
+    Notifications sent for ``event_id`` over every channel, as ``.values()`` rows with a ``channel`` key.
+
+    One ``UNION ALL`` statement whose branches each look up their table's
+    ``event_id`` index.
+    """
+    querysets = [
+        model.objects.filter(event_id=event_id).order_by().annotate(
+            channel=Value(channel, output_field=CharField())
+        ).values('channel', *RECIPIENT_FIELDS)
+        for channel, model in NOTIFICATION_CHANNELS
+    ]
+    return querysets[0].union(*querysets[1:], all=True)
+
+
+class ArchivedRecord(CompactBaseModel):
+    """Notification or event row moved out of the hot tables by the retention job."""
+
+    class KindChoices(models.TextChoices):
+        SYSTEM = 'system', _('System Notification')
+        EMAIL = 'email', _('Email Notification')
+        SMS = 'sms', _('Sms Notification')
+        EVENT = 'event', _('Event')
+
+    kind = models.CharField(
+        max_length=10,
+        choices=KindChoices.choices,
+        verbose_name=_("kind"),
+    )
+    original_id = models.UUIDField(
+        verbose_name=_("original id"),
+    )
+    receiver_id = models.UUIDField(
+        null=True,
+        blank=True,
+        verbose_name=_("receiver id"),
+    )
+    timestamp = models.DateTimeField(
+        verbose_name=_("timestamp"),
+    )
+    archived_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_("archived at"),
+    )
+    payload = models.JSONField(
+        default=dict,
+        verbose_name=_("payload"),
+    )
+
+    class Meta:
+        verbose_name = _('Archived Record')
+        verbose_name_plural = _('Archived Records')
+        indexes = [
+            models.Index(fields=["kind", "receiver_id", "timestamp"]),
+            models.Index(fields=["original_id"]),
+        ]
@@ -0,0 +1,77 @@
+"""
+Recipient resolution for company notifications.
+
+Who is told about what is declared once in ``RULES``: per notification type,
+the roles that receive it and the roles allowed to see it. Recipients are
+resolved from a company → role → user index built from the cached, versioned
+member directory (``apps.users.directory``) and memoized per process by
+directory version, so a lookup costs one cache read of the version token
+plus a dict lookup, independent of the company size.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+from apps.notification_service.models import BaseNotificationModel
+from apps.users import directory
+from apps.users.models import CompanyUser
+
+Type = BaseNotificationModel.TypeNotificationChoices
+Role = CompanyUser.RoleChoices
+
+Rule = namedtuple('Rule', ('deliver_to', 'visible_to'))
+
+MANAGERS = frozenset({Role.MANAGER})
+STAFF = frozenset({Role.MANAGER, Role.EMPLOYEE})
+
+DEFAULT_RULE = Rule(deliver_to=MANAGERS, visible_to=MANAGERS)
+
+RULES = {
+    Type.CREATED_CAMERA: DEFAULT_RULE,
+    Type.ONLINE_CAMERA: Rule(deliver_to=MANAGERS, visible_to=STAFF),
+    Type.OFFLINE_CAMERA: Rule(deliver_to=MANAGERS, visible_to=STAFF),
+    Type.MOVED_CAMERA: DEFAULT_RULE,
+    Type.RECORDING_CAMERA: DEFAULT_RULE,
+    Type.STOPPED_CAMERA: DEFAULT_RULE,
+    Type.CREATE_CUSTOMER_BY_EMPLOYEE: Rule(deliver_to=MANAGERS, visible_to=STAFF),
+}
+
+INDEX_CACHE_SIZE = 1024
+
+
+def get_rule(type_notification):
+    return RULES.get(type_notification, DEFAULT_RULE)
+
+
+def can_view(roles, type_notification):
+    """Whether a member holding ``roles`` may see notifications of ``type_notification``."""
+    return not get_rule(type_notification).visible_to.isdisjoint(roles)
+
+
+def build_index(members):
+    """Group active directory rows into ``{role: (user_id, ...)}``."""
+    index = {}
+    for member in members:
+        if member['is_active']:
+            index.setdefault(member['role'], []).append(member['user_id'])
+    return {role: tuple(user_ids) for role, user_ids in index.items()}
+
+
+@lru_cache(maxsize=INDEX_CACHE_SIZE)
+def load_index(company_id, version):
+    """Build the index of one directory version; thread-safe and least-recently-used evicted by ``lru_cache``."""
+    return build_index(directory.get_directory(company_id, version))
+
+
+def get_index(company_id):
+    """Return the company's ``{role: (user_id, ...)}`` index for the current directory version."""
+    return load_index(company_id, directory.get_version(company_id))
+
+
+def resolve(company_id, type_notification):
+    """Return the ids of the company members that receive ``type_notification``."""
+    index = get_index(company_id)
+    roles = get_rule(type_notification).deliver_to
+    if len(roles) == 1:
+        return index.get(next(iter(roles)), ())
+    return tuple(dict.fromkeys(user_id for role in roles for user_id in index.get(role, ())))
+
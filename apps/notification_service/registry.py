@@ -0,0 +1,187 @@
+"""
+Registry of notification templates.
+
+Every notification kind is declared once here, keyed by its ``source`` and its
+``TypeNotificationChoices`` value. Rows only store the template id and the
+render params; title/description are rendered from the precompiled template on
+read or delivery, in the language active at that moment.
+"""
+import logging
+from functools import lru_cache
+from string import Formatter
+
+from django.utils.translation import gettext_lazy as _
+
+from apps.notification_service.models import BaseNotificationModel, NotificationTemplate
+
+logger = logging.getLogger(__name__)
+
+Priority = BaseNotificationModel.PriorityTypeChoices
+Type = BaseNotificationModel.TypeNotificationChoices
+
+_specs_by_source = {}
+_specs_by_type = {}
+_template_ids = {}
+_templates_by_id = {}
+
+
+@lru_cache(maxsize=1024)
+def compile_text(text):
+    """
+    Parse a ``str.format`` template once into literal/field chunks.
+
+    Cached by the resolved text, so every language gets its own compiled copy.
+    """
+    return tuple(
+        (literal, field_name, format_spec or '')
+        for literal, field_name, format_spec, _conversion in Formatter().parse(text)
+    )
+
+
+def render_text(text, params):
+    parts = []
+    for literal, field_name, format_spec in compile_text(str(text)):
+        parts.append(literal)
+        if field_name is not None:
+            parts.append(format(params.get(field_name, ''), format_spec))
+    return ''.join(parts)
+
+
+class NotificationSpec:
+    def __init__(self, source, type_notification, title, description, priority):
+        self.source = source
+        self.type_notification = type_notification
+        self.title = title
+        self.description = description
+        self.priority = priority
+
+    def render(self, params):
+        return render_text(self.title, params), render_text(self.description, params)
+
+    def build(self, model, receiver, params, **fields):
+        """Return an unsaved ``model`` row referencing this template; ``receiver`` is a user or its id."""
+        fields.setdefault('priority', self.priority)
+        fields.setdefault('is_type_enabled', True)
+        return model(
+            receiver_id=getattr(receiver, 'pk', receiver),
+            template_id=get_template_id(self.source),
+            template_params=params,
+            source=self.source,
+            type_notification=self.type_notification,
+            **fields,
+        )
+
+
+def register(source, type_notification, title, description, priority):
+    spec = NotificationSpec(source, type_notification, title, description, priority)
+    _specs_by_source[source] = spec
+    _specs_by_type.setdefault(type_notification, spec)
+    return spec
+
+
+def get_spec(source):
+    return _specs_by_source.get(source)
+
+
+def get_spec_for_type(type_notification):
+    return _specs_by_type.get(type_notification)
+
+
+def get_template_id(source):
+    """Return the ``NotificationTemplate`` id for ``source``, creating the row on first use."""
+    template_id = _template_ids.get(source)
+    if template_id is None:
+        spec = _specs_by_source[source]
+        template, _created = NotificationTemplate.objects.get_or_create(
+            source=source,
+            defaults={'title': str(spec.title), 'description': str(spec.description)},
+        )
+        template_id = _cache_template(template)
+    return template_id
+
+
+def get_template(source):
+    """Return the template row for ``source`` without hitting the DB once cached."""
+    template_id = _template_ids.get(source)
+    if template_id is None:
+        try:
+            template_id = _cache_template(NotificationTemplate.objects.get(source=source))
+        except NotificationTemplate.DoesNotExist:
+            logger.error(f"NotificationTemplate with source {source} does not exist.")
+            return None
+    return _templates_by_id[template_id]
+
+
+def render(template_id, params, title='', description=''):
+    """
+    Render a stored notification.
+
+    Inline ``title``/``description`` win when present. Registered sources are
+    rendered from their lazily translated spec, anything else from the text
+    stored on the template row.
+    """
+    if template_id is None or (title and description):
+        return title, description
+
+    template = _templates_by_id.get(template_id)
+    if template is None:
+        try:
+            template = _templates_by_id[_cache_template(NotificationTemplate.objects.get(id=template_id))]
+        except NotificationTemplate.DoesNotExist:
+            return title, description
+
+    spec = _specs_by_source.get(template.source)
+    text_source = spec or template
+    return (
+        title or render_text(text_source.title, params),
+        description or render_text(text_source.description, params),
+    )
+
+
+def render_row(row):
+    """Replace template fields of a ``.values()`` row with rendered text in place."""
+    template_id = row.pop('template_id', None)
+    params = row.pop('template_params', None) or {}
+    row['title'], row['description'] = render(template_id, params, row.get('title'), row.get('description'))
+    return row
+
+
+def _cache_template(template):
+    _template_ids[template.source] = template.id
+    _templates_by_id[template.id] = template
+    return template.id
+
+
+CUSTOMER_CREATED = register(
+    'customer.created',
+    Type.CREATE_CUSTOMER_BY_EMPLOYEE,
+    title=_("New Customer Added"),
+    description=_("A new customer '{customer_name}' was added to your company."),
+    priority=Priority.MEDIUM,
+)
+
+CUSTOMERS_IMPORTED = register(
+    'customers.imported',
+    Type.CREATE_CUSTOMER_BY_EMPLOYEE,
+    title=_("Customers Imported"),
+    description=_("{performer_name} added {count} customers to your company."),
+    priority=Priority.MEDIUM,
+)
+
+CAMERA_ACTIONS = {
+    action: register(
+        f'camera.{action}',
+        type_notification,
+        title=_("Camera {camera_name} - {action_display}"),
+        description=_("{performer_name} performed action '{action}' on camera '{camera_name}'"),
+        priority=Priority.HIGH,
+    )
+    for action, type_notification in (
+        ('created', Type.CREATED_CAMERA),
+        ('turned_on', Type.ONLINE_CAMERA),
+        ('turned_off', Type.OFFLINE_CAMERA),
+        ('moved', Type.MOVED_CAMERA),
+        ('started_recording', Type.RECORDING_CAMERA),
+        ('stopped_recording', Type.STOPPED_CAMERA),
+    )
+}
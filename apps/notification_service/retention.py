@@ -0,0 +1,166 @@
+"""
+Retention engine for notifications and events.
+
+Rows past their policy age (or soft-deleted longer than the grace period ago,
+going by ``deleted_at``) are copied to the archive backend and removed from
+the hot tables in small, id-ordered batches, each in its own short
+transaction. A run can be stopped at any point; the next run simply picks up
+whatever is still eligible.
+"""
+import gzip
+import json
+import logging
+import os
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from apps.notification_service import versions
+from apps.notification_service.models import (
+    ArchivedRecord,
+    BaseNotificationModel,
+    EmailNotification,
+    Event,
+    SMSNotification,
+    SystemNotification,
+)
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_MODELS = (
+    (ArchivedRecord.KindChoices.SYSTEM, SystemNotification),
+    (ArchivedRecord.KindChoices.EMAIL, EmailNotification),
+    (ArchivedRecord.KindChoices.SMS, SMSNotification),
+)
+
+
+def resolve_retention_days(policies):
+    """
+    Map every ``(type_notification, priority)`` pair to its retention in days.
+
+    A policy with both keys set beats one with a single key, which beats a
+    catch-all; pairs no policy matches are kept forever.
+    """
+    def specificity(policy):
+        return (policy.get('type_notification') is not None) + (policy.get('priority') is not None)
+
+    days = {}
+    for policy in sorted(policies, key=specificity):
+        for type_value in BaseNotificationModel.TypeNotificationChoices.values:
+            if policy.get('type_notification') not in (None, type_value):
+                continue
+            for priority_value in BaseNotificationModel.PriorityTypeChoices.values:
+                if policy.get('priority') not in (None, priority_value):
+                    continue
+                days[(type_value, priority_value)] = policy['days']
+    return days
+
+
+class RetentionEngine:
+    def __init__(self, backend=None, batch_size=None, pause=None, max_batches=None, dry_run=False,
+                 progress=None, now=None):
+        config = settings.NOTIFICATION_RETENTION
+        self.config = config
+        self.backend = backend or config['BACKEND']
+        self.batch_size = batch_size or config['BATCH_SIZE']
+        self.pause = config['PAUSE_SECONDS'] if pause is None else pause
+        self.max_batches = max_batches
+        self.dry_run = dry_run
+        self.progress = progress or (lambda kind, total: None)
+        self.now = now or timezone.now()
+        self.stats = Counter()
+        self.batches = 0
+
+    def run(self):
+        for kind, model in NOTIFICATION_MODELS:
+            for condition in self.notification_conditions():
+                if self.exhausted:
+                    return self.stats
+                self.archive(kind, model, model.objects.filter(condition))
+
+        if not self.exhausted:
+            self.archive(ArchivedRecord.KindChoices.EVENT, Event, self.stale_events())
+        return self.stats
+
+    @property
+    def exhausted(self):
+        return self.max_batches is not None and self.batches >= self.max_batches
+
+    def notification_conditions(self):
+        deleted_cutoff = self.now - timedelta(days=self.config['DELETED_AFTER_DAYS'])
+        yield Q(is_deleted=True, deleted_at__lt=deleted_cutoff)
+
+        pairs_by_days = {}
+        for (type_value, priority_value), days in resolve_retention_days(self.config['POLICIES']).items():
+            pairs_by_days.setdefault(days, []).append((type_value, priority_value))
+
+        for days, pairs in pairs_by_days.items():
+            matches = Q()
+            for type_value, priority_value in pairs:
+                matches |= Q(type_notification=type_value, priority=priority_value)
+            yield matches & Q(timestamp__lt=self.now - timedelta(days=days))
+
+    def stale_events(self):
+        cutoff = self.now - timedelta(days=self.config['EVENTS_AFTER_DAYS'])
+        queryset = Event.objects.filter(timestamp__lt=cutoff)
+        for _kind, model in NOTIFICATION_MODELS:
+            queryset = queryset.filter(~Exists(model.objects.filter(event_id=OuterRef('pk'))))
+        return queryset
+
+    def archive(self, kind, model, queryset):
+        queryset = queryset.order_by('id')
+        last_id = None
+        while not self.exhausted:
+            batch = queryset.filter(id__gt=last_id) if last_id else queryset
+            rows = list(batch.values()[:self.batch_size])
+            if not rows:
+                return
+
+            if not self.dry_run:
+                with transaction.atomic():
+                    self.write(kind, rows)
+                    model.objects.filter(id__in=[row['id'] for row in rows]).delete()
+                    versions.invalidate(*{row['receiver_id'] for row in rows if row.get('receiver_id')})
+
+            last_id = rows[-1]['id']
+            self.batches += 1
+            self.stats[kind] += len(rows)
+            self.progress(kind, self.stats[kind])
+            if self.pause:
+                time.sleep(self.pause)
+
+    def write(self, kind, rows):
+        if self.backend == 'jsonl':
+            self.write_jsonl(kind, rows)
+        else:
+            self.write_table(kind, rows)
+
+    def write_table(self, kind, rows):
+        archived_at = timezone.now()
+        ArchivedRecord.objects.bulk_create([
+            ArchivedRecord(
+                kind=kind,
+                original_id=row['id'],
+                receiver_id=row.get('receiver_id'),
+                timestamp=row['timestamp'],
+                archived_at=archived_at,
+                payload=json.loads(json.dumps(row, cls=DjangoJSONEncoder)),
+            )
+            for row in rows
+        ])
+
+    def write_jsonl(self, kind, rows):
+        directory = os.path.join(self.config['ARCHIVE_DIR'], kind, self.now.strftime('%Y-%m-%d'))
+        os.makedirs(directory, exist_ok=True)
+        # Named after the first id so a re-run of an interrupted batch overwrites it.
+        path = os.path.join(directory, f"{rows[0]['id']}.jsonl.gz")
+        with gzip.open(path, 'wt', encoding='utf-8') as archive:
+            for row in rows:
+                archive.write(json.dumps(row, cls=DjangoJSONEncoder))
+                archive.write('\n')
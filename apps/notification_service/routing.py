@@ -1,7 +1,14 @@
 from django.urls import path
 
-from apps.notification_service.consumers import NotificationConsumer
+from apps.notification_service.consumers import NotificationConsumer, NotificationEventStreamConsumer
+from utils.middleware import JWTAuthMiddlewareStack
 
 websocket_urlpatterns = [
     path('ws/notifications/', NotificationConsumer.as_asgi()),
 ]
+
+# Served by the ASGI "http" router ahead of Django; JWT auth is applied per
+# route so regular Django views are unaffected.
+http_urlpatterns = [
+    path('sse/notifications/', JWTAuthMiddlewareStack(NotificationEventStreamConsumer.as_asgi())),
+]
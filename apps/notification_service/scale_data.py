@@ -0,0 +1,298 @@
+"""
+Deterministic data generator for scale testing.
+
+Companies, members, cameras and events are generated in the main process.
+Notification rows are generated in fixed-size chunks by a pool of worker
+processes and written with ``COPY`` on PostgreSQL or chunked ``bulk_create``
+elsewhere. Text comes from pools built once with a seeded Faker, and every
+chunk draws from its own ``random.Random`` seeded by ``(seed, channel,
+chunk)``, so the same seed yields the same rows whatever the worker count.
+"""
+import csv
+import io
+import json
+import multiprocessing
+import random
+import uuid
+from datetime import datetime
+
+from django.db import connections
+from faker import Faker
+
+from apps.camera.models import Camera
+from apps.notification_service import registry, versions
+from apps.notification_service.models import EmailNotification, Event, SMSNotification, SystemNotification
+from apps.users.models import Company, CompanyUser, User
+from utils.functions import uuid7
+
+CHANNEL_MODELS = {
+    'system': SystemNotification,
+    'email': EmailNotification,
+    'sms': SMSNotification,
+}
+CHANNEL_COLUMNS = {
+    'system': (),
+    'email': ('email',),
+    'sms': ('phone_number',),
+}
+NOTIFICATION_COLUMNS = (
+    'id', 'receiver_id', 'title', 'description', 'template_id', 'template_params', 'is_deleted', 'source',
+    'priority', 'event_id', 'is_viewed', 'timestamp', 'type_notification', 'is_type_enabled', 'create_time',
+    'modify_time',
+)
+
+Role = CompanyUser.RoleChoices
+
+DEFAULT_ROLES = {Role.MANAGER: 0.05, Role.EMPLOYEE: 0.25, Role.CUSTOMER: 0.70}
+STAFF_ROLES = {Role.MANAGER, Role.EMPLOYEE}
+
+POOL_SIZE = 500
+BULK_BATCH_SIZE = 5_000
+VIEWED_RATIO = 0.7
+DELETED_RATIO = 0.02
+
+# Each seed gets its own slice of 10.0.0.0/8 so camera IPs (unique) never clash across seeds.
+SEED_IP_SLOTS = 64
+IPS_PER_SEED = 1 << 18
+
+# Set in the parent before forking; workers read it instead of receiving it per task.
+_generator = None
+
+
+def parse_roles(text):
+    """
+    Parse ``"manager=5,employee=25,customer=70"`` into ``{role: weight}``.
+
+    Raises ``ValueError`` for unknown role names or non-positive totals.
+    """
+    roles_by_name = {role.name.lower(): role for role in Role}
+    weights = {}
+    for part in text.split(','):
+        name, _sep, weight = part.partition('=')
+        role = roles_by_name.get(name.strip().lower())
+        if role is None:
+            raise ValueError(f"Unknown role '{name.strip()}'")
+        weights[role] = float(weight)
+    if sum(weights.values()) <= 0:
+        raise ValueError("Role weights must add up to more than zero")
+    return weights
+
+
+def random_uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+class ScaleDataGenerator:
+    def __init__(self, seed=0, companies=10, members_per_company=100, roles=None, cameras_per_company=20,
+                 events_per_company=1_000, days=90, chunk_size=10_000, first_chunk=0, workers=1, use_copy=None,
+                 until=None, progress=None):
+        self.seed = seed
+        self.companies = companies
+        self.members_per_company = members_per_company
+        self.roles = roles or DEFAULT_ROLES
+        self.cameras_per_company = cameras_per_company
+        self.events_per_company = events_per_company
+        self.days = days
+        self.chunk_size = chunk_size
+        self.first_chunk = first_chunk
+        self.workers = workers
+        self.use_copy = connections['default'].vendor == 'postgresql' if use_copy is None else use_copy
+        # Midnight rather than "now", so a seed reproduces the same timestamps all day.
+        self.until = until or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.progress = progress or (lambda label, total: None)
+        self.stats = {}
+
+        self.rng = random.Random(f"{seed}:structure")
+        self.fake = Faker()
+        self.fake.seed_instance(seed)
+        self.pools = {}
+        # Per company: staff ``(user_id, email, phone_number)`` and events ``(id, action, timestamp_ms, params)``,
+        # ids as hex so rows are cheap to encode.
+        self.staff = []
+        self.events = []
+        self.template_ids = {}
+
+    def run(self, notifications, channels):
+        self.build_pools()
+        self.create_structure()
+        for channel in channels:
+            self.generate_notifications(channel, notifications)
+        versions.invalidate_all()
+        return self.stats
+
+    def build_pools(self):
+        fake = self.fake
+        self.pools = {
+            'company': [fake.unique.company() for _ in range(POOL_SIZE)],
+            'first_name': [fake.first_name() for _ in range(POOL_SIZE)],
+            'last_name': [fake.last_name() for _ in range(POOL_SIZE)],
+            'location': [fake.street_address() for _ in range(POOL_SIZE)],
+        }
+        self.template_ids = {
+            spec.source: registry.get_template_id(spec.source).hex for spec in registry.CAMERA_ACTIONS.values()
+        }
+
+    def save(self, model, objects, label):
+        """``bulk_create`` in chunks; rows from an earlier run with the same seed are skipped."""
+        for offset in range(0, len(objects), BULK_BATCH_SIZE):
+            model.objects.bulk_create(objects[offset:offset + BULK_BATCH_SIZE], ignore_conflicts=True)
+        self.stats[label] = self.stats.get(label, 0) + len(objects)
+        self.progress(label, self.stats[label])
+
+    def create_structure(self):
+        rng, pools = self.rng, self.pools
+        roles, weights = list(self.roles), list(self.roles.values())
+        window_ms = self.days * 24 * 60 * 60 * 1000
+        until_ms = int(self.until.timestamp() * 1000)
+        camera_index = (self.seed % SEED_IP_SLOTS) * IPS_PER_SEED
+
+        for company_index in range(self.companies):
+            company = Company(
+                id=random_uuid(rng),
+                name=f"{rng.choice(pools['company'])} ({self.seed}-{company_index})",
+            )
+
+            users, memberships, staff = [], [], []
+            for member_index in range(self.members_per_company):
+                first_name, last_name = rng.choice(pools['first_name']), rng.choice(pools['last_name'])
+                member_number = company_index * self.members_per_company + member_index
+                email = f"scale{self.seed}.c{company_index}.u{member_index}@example.com"
+                phone_number = f"+989{(self.seed * 7_919_000 + member_number) % 10 ** 9:09d}"
+                user = User(
+                    id=random_uuid(rng), email=email, username=email, password='!',
+                    first_name=first_name, last_name=last_name, full_name=f"{first_name} {last_name}",
+                    phone_number=phone_number,
+                )
+                # Every company gets at least one manager.
+                role = Role.MANAGER if member_index == 0 else rng.choices(roles, weights)[0]
+                users.append(user)
+                memberships.append(CompanyUser(id=random_uuid(rng), company_id=company.id, user_id=user.id, role=role))
+                if role in STAFF_ROLES:
+                    staff.append((user.id.hex, email, phone_number))
+
+            cameras = []
+            for number in range(self.cameras_per_company):
+                cameras.append(Camera(
+                    id=random_uuid(rng),
+                    company_id=company.id,
+                    name=f"Camera {number + 1}",
+                    location=rng.choice(pools['location']),
+                    ip_address=f"10.{(camera_index >> 16) & 255}.{(camera_index >> 8) & 255}.{camera_index & 255}",
+                    status=rng.choice(Camera.StatusChoices.values),
+                    recording_status=rng.choice(Camera.RecordingStatusChoices.values),
+                ))
+                camera_index += 1
+
+            events, event_rows = [], []
+            actions = list(registry.CAMERA_ACTIONS)
+            for _ in range(self.events_per_company if cameras else 0):
+                camera, performer, action = rng.choice(cameras), rng.choice(users), rng.choice(actions)
+                timestamp_ms = until_ms - rng.randrange(window_ms)
+                timestamp = datetime.fromtimestamp(timestamp_ms / 1000)
+                events.append(Event(
+                    id=uuid7(timestamp_ms, rng),
+                    event_type=f"camera_{action}",
+                    company_id=company.id,
+                    camera_id=camera.id,
+                    details={"performed_by": str(performer.id)},
+                    timestamp=timestamp,
+                ))
+                params = {
+                    "camera_name": camera.name,
+                    "action": action,
+                    "action_display": action.replace('_', ' ').capitalize(),
+                    "performer_name": performer.full_name,
+                }
+                # COPY takes the JSON text; encoding it once per event keeps it out of the per-row loop.
+                params = json.dumps(params) if self.use_copy else params
+                event_rows.append((events[-1].id.hex, action, timestamp_ms, params))
+
+            self.save(Company, [company], 'companies')
+            self.save(User, users, 'users')
+            self.save(CompanyUser, memberships, 'memberships')
+            self.save(Camera, cameras, 'cameras')
+            self.save(Event, events, 'events')
+            if staff and event_rows:
+                self.staff.append(staff)
+                self.events.append(event_rows)
+
+    def build_rows(self, channel, chunk_index, size):
+        rng = random.Random(f"{self.seed}:{channel}:{chunk_index}")
+        rows = []
+        for _ in range(size):
+            company_index = rng.randrange(len(self.staff))
+            user_id, email, phone_number = rng.choice(self.staff[company_index])
+            event_id, action, event_ms, params = rng.choice(self.events[company_index])
+            spec = registry.CAMERA_ACTIONS[action]
+            timestamp_ms = event_ms + rng.randrange(60_000)
+            timestamp = datetime.fromtimestamp(timestamp_ms / 1000)
+            row = (
+                uuid7(timestamp_ms, rng).hex, user_id, '', '', self.template_ids[spec.source], params,
+                rng.random() < DELETED_RATIO, spec.source, spec.priority, event_id, rng.random() < VIEWED_RATIO,
+                timestamp, spec.type_notification, True, timestamp, timestamp,
+            )
+            if channel == 'email':
+                row += (email,)
+            elif channel == 'sms':
+                row += (phone_number,)
+            rows.append(row)
+        return rows
+
+    def write(self, channel, rows):
+        model = CHANNEL_MODELS[channel]
+        columns = NOTIFICATION_COLUMNS + CHANNEL_COLUMNS[channel]
+        if not self.use_copy:
+            model.objects.bulk_create([model(**dict(zip(columns, row))) for row in rows], batch_size=BULK_BATCH_SIZE)
+            return
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(rows)
+        buffer.seek(0)
+        connection = connections['default']
+        with connection.cursor() as cursor:
+            cursor.cursor.copy_expert(
+                f"COPY {model._meta.db_table} ({', '.join(columns)}) FROM STDIN "
+                f"WITH (FORMAT csv, FORCE_NOT_NULL (title, description))",
+                buffer,
+            )
+
+    def generate_notifications(self, channel, total):
+        """
+        Write ``total`` rows of ``channel`` in chunks numbered from ``first_chunk``.
+
+        Chunk numbers seed the row ids, so appending to an earlier run of the
+        same seed needs a ``first_chunk`` past the chunks it already wrote.
+        """
+        if not total or not self.staff:
+            return
+        tasks = [
+            (channel, self.first_chunk + number, min(self.chunk_size, total - offset))
+            for number, offset in enumerate(range(0, total, self.chunk_size))
+        ]
+        label = f"{channel} notifications"
+        self.stats[label] = 0
+
+        global _generator
+        _generator = self
+        if self.workers <= 1:
+            results = map(write_chunk, tasks)
+        else:
+            # Forked workers must not share the parent's DB connection.
+            connections.close_all()
+            pool = multiprocessing.get_context('fork').Pool(self.workers)
+            results = pool.imap_unordered(write_chunk, tasks)
+        try:
+            for written in results:
+                self.stats[label] += written
+                self.progress(label, self.stats[label])
+        finally:
+            if self.workers > 1:
+                pool.close()
+                pool.join()
+
+
+def write_chunk(task):
+    channel, chunk_index, size = task
+    _generator.write(channel, _generator.build_rows(channel, chunk_index, size))
+    return size
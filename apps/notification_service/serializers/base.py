@@ -3,8 +3,8 @@ from rest_framework import serializers
 
 class BaseNotificationSerializer(serializers.Serializer):
     id = serializers.UUIDField()
-    title = serializers.CharField()
-    description = serializers.CharField()
+    title = serializers.CharField(source='get_title')
+    description = serializers.CharField(source='get_description')
     priority = serializers.IntegerField()
     is_viewed = serializers.BooleanField()
     timestamp = serializers.DateTimeField()
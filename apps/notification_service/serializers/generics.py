@@ -1,9 +1,11 @@
 from rest_framework import serializers
 
-from apps.notification_service.models import SystemNotification
+from apps.notification_service.models import Event, SystemNotification
 
 
 class SystemNotificationSerializer(serializers.ModelSerializer):
+    title = serializers.CharField(source='get_title', read_only=True)
+    description = serializers.CharField(source='get_description', read_only=True)
     priority_display = serializers.CharField(
         source='get_priority_display',
         read_only=True
@@ -22,3 +24,29 @@ class SystemNotificationSerializer(serializers.ModelSerializer):
             'event'
         ]
         read_only_fields = fields
+
+
+class EventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Event
+        fields = ['id', 'event_type', 'company', 'camera', 'timestamp', 'details']
+        read_only_fields = fields
+
+
+class EventQuerySerializer(serializers.Serializer):
+    event_type = serializers.ListField(
+        child=serializers.ChoiceField(choices=Event.TypeChoices.choices), required=False
+    )
+    company = serializers.UUIDField(required=False)
+    camera = serializers.UUIDField(required=False)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+
+class EventRecipientSerializer(serializers.Serializer):
+    channel = serializers.CharField()
+    id = serializers.UUIDField()
+    receiver_id = serializers.UUIDField()
+    is_viewed = serializers.BooleanField()
+    is_deleted = serializers.BooleanField()
+    timestamp = serializers.DateTimeField()
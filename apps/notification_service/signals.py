@@ -1,73 +1,94 @@
 import logging
+from collections import defaultdict
 
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from apps.notification_service import recipients, versions
+from apps.notification_service.consumers import NOTIFICATIONS_GROUP
 from apps.notification_service.models import (
     SystemNotification,
     EmailNotification,
     SMSNotification,
     BaseNotificationModel,
+    ReadWatermark,
 )
 from apps.users.models import CompanyUser
+from utils.bulk_delete import chunk_deleted
 
 logger = logging.getLogger(__name__)
 channel_layer = get_channel_layer()
 
 
-def should_notify_managers(instance):
-    is_critical = instance.priority in {
+def is_critical(instance):
+    return instance.priority in {
         BaseNotificationModel.PriorityTypeChoices.HIGH,
         BaseNotificationModel.PriorityTypeChoices.CRITICAL,
     }
 
-    if not is_critical:
-        return False
 
-    user = instance.receiver
-    is_manager = CompanyUser.objects.filter(
-        user=user, role=CompanyUser.RoleChoices.MANAGER
-    ).exists()
-    is_employee = CompanyUser.objects.filter(
-        user=user, role=CompanyUser.RoleChoices.EMPLOYEE
-    ).exists()
-
-    if is_manager:
-        return True
-
-    notify_types_for_employee = {
-        BaseNotificationModel.TypeNotificationChoices.ONLINE_CAMERA,
-        BaseNotificationModel.TypeNotificationChoices.OFFLINE_CAMERA,
-        BaseNotificationModel.TypeNotificationChoices.CREATE_CUSTOMER_BY_EMPLOYEE,
-    }
+def get_roles_by_user(user_ids):
+    roles_by_user = defaultdict(set)
+    for user_id, role in CompanyUser.objects.filter(user_id__in=user_ids).values_list('user_id', 'role'):
+        roles_by_user[user_id].add(role)
+    return roles_by_user
+
 
-    return is_employee and instance.type_notification in notify_types_for_employee
+def should_notify_managers(instance, roles=None):
+    if not is_critical(instance):
+        return False
 
+    if roles is None:
+        roles = get_roles_by_user([instance.receiver_id])[instance.receiver_id]
 
-def notify_managers(instance):
-    if not should_notify_managers(instance):
-        return
+    return recipients.can_view(roles, instance.type_notification)
 
+
+def push_notification(instance):
+    """Push ``instance`` to the managers' sockets once the current transaction commits."""
+    title, description = instance.render()
     notification_data = {
         "id": str(instance.id),
-        "title": instance.title,
-        "description": instance.description,
+        "title": title,
+        "description": description,
         "priority": instance.priority,
         "timestamp": instance.timestamp.isoformat(),
     }
 
-    try:
-        async_to_sync(channel_layer.group_send)(
-            "notifications_managers",
-            {
-                "type": "send_notification",
-                "content": notification_data,
-            }
-        )
-    except Exception as e:
-        logger.error(f"WebSocket notification failed: {e}")
+    def send():
+        try:
+            async_to_sync(channel_layer.group_send)(
+                NOTIFICATIONS_GROUP,
+                {
+                    "type": "send_notification",
+                    "content": notification_data,
+                }
+            )
+        except Exception as e:
+            logger.error(f"WebSocket notification failed: {e}")
+
+    # A rolled-back row must not reach clients, and locks held by the caller are not kept through the I/O.
+    transaction.on_commit(send)
+
+
+def notify_managers(instance):
+    if should_notify_managers(instance):
+        push_notification(instance)
+
+
+def notify_managers_bulk(instances):
+    """``notify_managers`` for rows saved with ``bulk_create``, which sends no ``post_save``."""
+    critical = [instance for instance in instances if is_critical(instance)]
+    if not critical:
+        return
+
+    roles_by_user = get_roles_by_user({instance.receiver_id for instance in critical})
+    for instance in critical:
+        if should_notify_managers(instance, roles_by_user[instance.receiver_id]):
+            push_notification(instance)
 
 
 @receiver(post_save, sender=SystemNotification)
@@ -76,3 +97,23 @@ def notify_managers(instance):
 def send_notification_to_managers(sender, instance, created, **kwargs):
     if created:
         notify_managers(instance)
+
+
+@receiver(post_save, sender=SystemNotification)
+@receiver(post_save, sender=EmailNotification)
+@receiver(post_save, sender=SMSNotification)
+def invalidate_list_version(sender, instance, **kwargs):
+    versions.invalidate(instance.receiver_id)
+
+
+@receiver(post_save, sender=ReadWatermark)
+def invalidate_watermark_list_version(sender, instance, **kwargs):
+    versions.invalidate(instance.user_id)
+
+
+@receiver(chunk_deleted, sender=SystemNotification)
+@receiver(chunk_deleted, sender=EmailNotification)
+@receiver(chunk_deleted, sender=SMSNotification)
+def invalidate_list_versions(sender, pks, **kwargs):
+    # The receivers of deleted rows are gone with them; start every list over.
+    versions.invalidate_all()
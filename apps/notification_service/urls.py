@@ -5,7 +5,8 @@ from apps.notification_service.views.generics import (NotificationsListView, Not
                                                       MarkNotificationAsReadView, SoftDeleteNotificationView,
                                                       MarkSelectedNotificationsAsReadView,
                                                       SoftDeleteSelectedNotificationsView,
-                                                      MarkAllNotificationsAsReadView, SoftDeleteAllNotificationsView, )
+                                                      MarkAllNotificationsAsReadView, SoftDeleteAllNotificationsView,
+                                                      UnreadCountView, InboxView, EventViewSet, )
 
 app_name = 'notification_service'
 
@@ -15,16 +16,23 @@ router = DefaultRouter()
 NOTIFICATION_API_V1 = [
     #     path('', include(router.urls)),
     path('', NotificationsListView.as_view({'get': 'list'}), name='notification-list'),
-    path('<str:pk>/', NotificationsDetailView.as_view({'get': 'retrieve'}),
-         name='notification-detail'),
-    path('<str:pk>/mark_as_read/', MarkNotificationAsReadView.as_view(),
-         name='mark-notification-as-read'),
-    path('<str:pk>/mark_as_delete/', SoftDeleteNotificationView.as_view(),
-         name='mark_as_delete'),
+    path('events/', EventViewSet.as_view({'get': 'list'}), name='event-list'),
+    path('events/<str:pk>/', EventViewSet.as_view({'get': 'retrieve'}), name='event-detail'),
+    path('events/<str:pk>/recipients/', EventViewSet.as_view({'get': 'recipients'}, **EventViewSet.recipients.kwargs),
+         name='event-recipients'),
     path('mark_selected_as_read/', MarkSelectedNotificationsAsReadView.as_view(),
          name='mark-selected-notifications'),
     path('mark_selected_as_delete/', SoftDeleteSelectedNotificationsView.as_view(),
          name='delete-selected-notifications'),
     path('mark_all_as_read/', MarkAllNotificationsAsReadView.as_view(), name='mark-all-notifications'),
     path('mark_all_as_delete/', SoftDeleteAllNotificationsView.as_view(), name='delete-all-notifications'),
+    path('unread_count/', UnreadCountView.as_view(), name='unread-notification-count'),
+    path('inbox/', InboxView.as_view(), name='notification-inbox'),
+    # After the fixed paths above, which ``<str:pk>`` would otherwise swallow.
+    path('<str:pk>/', NotificationsDetailView.as_view({'get': 'retrieve'}),
+         name='notification-detail'),
+    path('<str:pk>/mark_as_read/', MarkNotificationAsReadView.as_view(),
+         name='mark-notification-as-read'),
+    path('<str:pk>/mark_as_delete/', SoftDeleteNotificationView.as_view(),
+         name='mark_as_delete'),
 ]
@@ -0,0 +1,81 @@
+"""
+Cached per-user version of the notification list.
+
+Every user has a version token in the cache, bumped whenever one of their
+notifications is created, changed or deleted, or their read watermark
+moves. A global epoch is bumped instead by writes that span many users
+(admin bulk deletes, data generators). The list's version is the
+later of the two, so ``ETag`` and ``Last-Modified`` come from one cache
+read and an unchanged list costs a polling client a 304 without a query on
+the notification tables. Versions only mean something when every worker
+sees the same cache; with a process-local backend (allowed with DEBUG on)
+``is_shared`` is false and the list is always served in full.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from utils.replicas import pin_ids_to_primary
+
+EPOCH_KEY = "notification_list_epoch"
+
+
+def is_shared():
+    """Whether a bump made by one worker is seen by all of them."""
+    return settings.CACHES['default']['BACKEND'] not in settings.PROCESS_LOCAL_CACHE_BACKENDS
+
+
+def version_key(user_id):
+    return f"notification_list_version:{user_id}"
+
+
+def get_version(user_id):
+    """
+    Current version token (nanoseconds since the epoch) of the user's list.
+
+    Tokens are timestamps rather than counters so a key that was evicted
+    never restarts at a value an old ETag already used; a missing key is
+    seeded with the current time.
+    """
+    key = version_key(user_id)
+    versions = cache.get_many([key, EPOCH_KEY])
+    missing = [name for name in (key, EPOCH_KEY) if name not in versions]
+    if missing:
+        seed = time.time_ns()
+        for name in missing:
+            cache.add(name, seed, timeout=None)
+        versions.update(cache.get_many(missing))
+    return max(versions.values())
+
+
+def last_modified(version):
+    """Unix time in whole seconds of the change that produced ``version``."""
+    return version // 10 ** 9
+
+
+def invalidate(*user_ids):
+    """
+    Bump the list version of ``user_ids`` once the current transaction commits.
+
+    Bumping only after the commit means a reader never pairs the new version
+    with the old rows. The users are pinned to the primary for the sticky
+    window too, or a lagging replica could serve the old rows under the new
+    version until the next change.
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+
+    def bump():
+        version = time.time_ns()
+        cache.set_many({version_key(user_id): version for user_id in user_ids}, timeout=None)
+        pin_ids_to_primary(*user_ids)
+
+    transaction.on_commit(bump)
+
+
+def invalidate_all():
+    """Bump every user's list version once the current transaction commits."""
+    transaction.on_commit(lambda: cache.set(EPOCH_KEY, time.time_ns(), timeout=None))
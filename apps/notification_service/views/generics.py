@@ -1,30 +1,46 @@
 import json
 import logging
+import time
 
 from django.core.serializers.json import DjangoJSONEncoder
 from django.http import Http404
 from django.http import StreamingHttpResponse
 # from itertools import chain
+from django.utils.cache import get_conditional_response
 from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, quote_etag
 from django.utils.timezone import now
 from django.utils.translation import gettext as _
 from drf_spectacular.utils import (
     OpenApiResponse, OpenApiExample
 )
-from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiTypes
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import status, mixins
+from rest_framework import status, mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
+from apps.notification_service import bulk, registry, versions
+from apps.notification_service.inbox import InboxPage, decode_cursor
 from apps.notification_service.models import (
-    SystemNotification, EmailNotification, SMSNotification, BaseNotificationModel
+    CHANNEL_MODELS, SystemNotification, EmailNotification, SMSNotification, BaseNotificationModel, Event,
+    get_read_through, is_read, unread_counts
 )
 from apps.notification_service.serializers.base import BaseNotificationSerializer, SelectedSystemNotificationSerializer
-from apps.notification_service.serializers.generics import SystemNotificationSerializer
-from apps.users.permissions import IsCompanyEmployeeTypeChoices
+from apps.notification_service.serializers.generics import (
+    EventQuerySerializer, EventRecipientSerializer, EventSerializer, SystemNotificationSerializer
+)
+from apps.users.models import CompanyUser
+from apps.users.permissions import IsCompanyEmployee, IsCompanyEmployeeTypeChoices, IsCompanyManager
+from utils.idempotency import idempotent
+from utils.pagination import TimestampCursorPagination
+from utils.query_budget import query_budget
+from utils.replicas import ReplicaReadsMixin, pin_to_primary
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +48,9 @@ logger = logging.getLogger(__name__)
 @extend_schema(
     tags=["Notifications"],
     summary="List notifications",
-    description="Retrieve a list of system notifications for the authenticated user with optional filters.",
+    description="Retrieve a list of system notifications for the authenticated user with optional filters. "
+                "Send the returned `ETag` as `If-None-Match` (or `Last-Modified` as `If-Modified-Since`) to get "
+                "a 304 while none of the user's notifications changed.",
     parameters=[
         OpenApiParameter(
             name="type",
@@ -60,8 +78,9 @@ logger = logging.getLogger(__name__)
         ),
     ]
 )
+@query_budget(queries=5)
 class NotificationsListView(
-    mixins.ListModelMixin, GenericViewSet
+    ReplicaReadsMixin, mixins.ListModelMixin, GenericViewSet
 ):
     serializer_class = SystemNotificationSerializer
     permission_classes = [IsCompanyEmployeeTypeChoices]
@@ -98,11 +117,7 @@ class NotificationsListView(
         if to_time_str and not to_time:
             raise Http404("Invalid to_time format")
 
-        queryset = SystemNotification.objects.filter(
-            receiver=user,
-            is_deleted=False,
-            is_type_enabled=True,
-        )
+        queryset = SystemNotification.objects.active_for(user)
 
         if type_val is not None:
             queryset = queryset.filter(type_notification=type_val)
@@ -115,26 +130,102 @@ class NotificationsListView(
 
         queryset = queryset.values(
             "id", "title", "description", "priority", "timestamp",
-            "is_viewed", "type_notification", "source", "event_id"
+            "is_viewed", "type_notification", "source", "event_id",
+            "template_id", "template_params"
         )
 
         return queryset
 
     def list(self, request, *args, **kwargs):
+        """
+        Stream the list, or answer a 304 from the cached list version alone.
+
+        ``Last-Modified`` has whole-second resolution, so it is left out while
+        the version's second is still running: another change in the same
+        second would otherwise look unmodified to ``If-Modified-Since``. No
+        validators are sent while the cache is process-local, as another
+        worker's bump would go unseen.
+        """
         queryset = self.get_queryset_all()
-        serializer = self.get_serializer(queryset, many=True)
-        return StreamingHttpResponse(self.generator(queryset), content_type='application/json')
+        if not versions.is_shared():
+            return self.stream(request, queryset)
+
+        version = versions.get_version(request.user.pk)
+        etag = quote_etag(f"{request.user.pk}-{version}")
+        last_modified = versions.last_modified(version)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.stream(request, queryset)
+        response['ETag'] = etag
+        if last_modified < int(time.time()):
+            response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def stream(self, request, queryset):
+        read_through = get_read_through(request.user, SystemNotification.channel)
+        return StreamingHttpResponse(self.generator(queryset, read_through), content_type='application/json')
 
     @staticmethod
-    def generator(queryset):
+    def generator(queryset, read_through=None):
         yield '['
         for i, item in enumerate(queryset):
             if i != 0:
                 yield ','
-            yield json.dumps(item, cls=DjangoJSONEncoder)
+            item['is_viewed'] = is_read(item, read_through)
+            yield json.dumps(registry.render_row(item), cls=DjangoJSONEncoder)
         yield ']'
 
 
+@extend_schema(
+    tags=["Notifications"],
+    summary="Unified inbox",
+    description="System, email and SMS notifications of the user in one newest-first timeline. The response is "
+                "streamed as `{\"results\": [...], \"next\": url}`; every row carries its `channel`. Follow "
+                "`next` for older notifications; it is `null` on the last page.",
+    parameters=[
+        OpenApiParameter(name="cursor", type=OpenApiTypes.STR, required=False),
+        OpenApiParameter(name="page_size", type=OpenApiTypes.INT, required=False),
+    ],
+)
+@query_budget(queries=6)
+class InboxView(ReplicaReadsMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            positions = decode_cursor(params['cursor']) if params.get('cursor') else None
+        except ValueError:
+            raise ValidationError({'cursor': "Invalid cursor"})
+        try:
+            page_size = int(params.get('page_size', TimestampCursorPagination.page_size))
+        except ValueError:
+            raise ValidationError({'page_size': "Must be an integer"})
+        page_size = min(max(page_size, 1), TimestampCursorPagination.max_page_size)
+
+        page = InboxPage(request.user, positions, page_size)
+        rows = iter(page)
+        # Pull the first row here: the watermarks and the first chunk of every channel are read inside the view,
+        # so errors still surface as proper responses and the queries count against the budget.
+        first = next(rows, None)
+        return StreamingHttpResponse(self.generator(request, page, first, rows), content_type='application/json')
+
+    @staticmethod
+    def generator(request, page, first, rows):
+        yield '{"results":['
+        if first is not None:
+            yield json.dumps(first, cls=DjangoJSONEncoder)
+            for row in rows:
+                yield ','
+                yield json.dumps(row, cls=DjangoJSONEncoder)
+        cursor = page.next_cursor
+        next_url = replace_query_param(request.build_absolute_uri(), 'cursor', cursor) if cursor else None
+        yield '],"next":' + json.dumps(next_url) + '}'
+
+
+@query_budget(queries=5)
 class NotificationsDetailView(
     mixins.ListModelMixin, GenericViewSet
 ):
@@ -146,15 +237,17 @@ class NotificationsDetailView(
         user = request.user
         for model in [SystemNotification, EmailNotification, SMSNotification]:
             try:
-                obj = model.objects.get(id=pk, receiver=user, is_deleted=False, is_type_enabled=True)
+                obj = model.objects.active_for(user).get(id=pk)
                 obj.is_viewed = True
                 obj.save()
+                pin_to_primary(user)
                 return Response(self.get_serializer(obj).data)
             except model.DoesNotExist:
                 continue
         raise Http404("Notification not found")
 
 
+@query_budget(queries=3)
 class NotificationActionView(APIView):
     """Base view for marking or soft-deleting single and selected notifications."""
     permission_classes = [IsAuthenticated]
@@ -164,6 +257,7 @@ class NotificationActionView(APIView):
         instance = self.get_notification_instance(pk)
         if instance:
             self.perform_action(instance)
+            pin_to_primary(self.request.user)
             return Response(data={"detail": _(self.success_message)}, status=status.HTTP_200_OK)
         raise Http404()
 
@@ -173,9 +267,7 @@ class NotificationActionView(APIView):
 
     def get_notification_instance(self, pk):
         user = self.request.user
-        return SystemNotification.objects.filter(
-            id=pk, receiver=user, is_deleted=False, is_type_enabled=True
-        ).first()
+        return SystemNotification.objects.active_for(user).filter(id=pk).first()
 
 
 class MarkNotificationAsReadView(NotificationActionView):
@@ -226,12 +318,14 @@ class SoftDeleteNotificationView(NotificationActionView):
         return super().post(request, *args, **kwargs)
 
 
+@query_budget(queries=3)
 class BulkNotificationActionView(APIView):
     permission_classes = [IsAuthenticated]
     success_message = ""
     action_field = ""
 
     @swagger_auto_schema(request_body=SelectedSystemNotificationSerializer)
+    @idempotent
     def post(self, request):
         serializer = SelectedSystemNotificationSerializer(data=request.data)
         if not serializer.is_valid():
@@ -241,11 +335,14 @@ class BulkNotificationActionView(APIView):
             )
         notification_ids = serializer.validated_data.get("notification_ids", [])
 
-        self.perform_bulk_action(request.user, notification_ids)
-        return Response(data={"detail": _(self.success_message)}, status=status.HTTP_200_OK)
+        count = self.perform_bulk_action(request.user, notification_ids)
+        pin_to_primary(request.user)
+        if count:
+            versions.invalidate(request.user.pk)
+        return Response(data={"detail": _(self.success_message), "count": count}, status=status.HTTP_200_OK)
 
     def perform_bulk_action(self, user, notification_ids):
-        """Bulk action method to be overridden in subclasses."""
+        """Bulk action method to be overridden in subclasses; returns the number of notifications changed."""
         raise NotImplementedError
 
 
@@ -254,10 +351,7 @@ class MarkSelectedNotificationsAsReadView(BulkNotificationActionView):
     action_field = "is_viewed"
 
     def perform_bulk_action(self, user, notification_ids):
-        SystemNotification.objects.filter(
-            id__in=notification_ids, receiver=user, is_viewed=False,
-            is_deleted=False, is_type_enabled=True
-        ).update(is_viewed=True)
+        return bulk.update_selected(SystemNotification.objects.unread_for(user), notification_ids, is_viewed=True)
 
     @extend_schema(
         summary="Mark Selected Notifications as Read",
@@ -317,9 +411,10 @@ class SoftDeleteSelectedNotificationsView(BulkNotificationActionView):
     action_field = "is_deleted"
 
     def perform_bulk_action(self, user, notification_ids):
-        SystemNotification.objects.filter(id__in=notification_ids, receiver=user, is_deleted=False,
-                                          is_type_enabled=True).update(
-            is_deleted=True, is_viewed=True)
+        return bulk.update_selected(
+            SystemNotification.objects.active_for(user), notification_ids, is_deleted=True, is_viewed=True,
+            deleted_at=now(),
+        )
 
     @extend_schema(
         summary="Soft-Delete Selected Notifications",
@@ -347,12 +442,25 @@ class SoftDeleteSelectedNotificationsView(BulkNotificationActionView):
         return super().post(request, *args, **kwargs)
 
 
+# A COUNT and a watermark write (two when it is the user's first) per channel.
+@query_budget(queries=9)
 class MarkAllNotificationsAsReadView(APIView):
     permission_classes = [IsAuthenticated]
 
     @extend_schema(
         summary="Mark All Notifications as Read",
-        description="This endpoint marks all unread notifications as read by setting their `is_viewed` field to `True`.",
+        description="This endpoint moves the user's read watermark of `channel` (`system` by default, or `all`) to "
+                    "now, so every notification received so far counts as read without updating each row. `count` "
+                    "is how many were unread. Retries with the same `Idempotency-Key` header replay the first "
+                    "response.",
+        parameters=[
+            OpenApiParameter(
+                name="channel",
+                type=OpenApiTypes.STR,
+                enum=[*CHANNEL_MODELS, 'all'],
+                required=False,
+            ),
+        ],
         responses={
             200: OpenApiResponse(
                 description="All notifications successfully marked as read"
@@ -362,18 +470,48 @@ class MarkAllNotificationsAsReadView(APIView):
             )
         }
     )
+    @idempotent
     def post(self, request):
         user = request.user
-        SystemNotification.objects.filter(receiver=user, is_viewed=False, is_type_enabled=True).update(is_viewed=True)
-        return Response(data={"detail": "marked as read all!!!!"}, status=status.HTTP_200_OK)
+        channel = request.query_params.get('channel', SystemNotification.channel)
+        if channel != 'all' and channel not in CHANNEL_MODELS:
+            raise ValidationError({'channel': f"One of {', '.join([*CHANNEL_MODELS, 'all'])}"})
+        targets = CHANNEL_MODELS.values() if channel == 'all' else [CHANNEL_MODELS[channel]]
+        count = sum(bulk.mark_all_read(model, user) for model in targets)
+        pin_to_primary(user)
+        if count:
+            versions.invalidate(user.pk)
+        return Response(data={"detail": _("All notifications marked as read"), "count": count},
+                        status=status.HTTP_200_OK)
+
+
+@query_budget(queries=4)
+class UnreadCountView(APIView):
+    """Badge counts: unread notifications per channel, read watermarks and per-row reads applied."""
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Unread Notification Counts",
+        description="Unread notifications per channel and in total. Rows at or before the channel's read "
+                    "watermark count as read, as do rows marked read one by one.",
+        responses={200: OpenApiResponse(description="`{\"system\": n, \"email\": n, \"sms\": n, \"total\": n}`")},
+    )
+    def get(self, request):
+        counts = unread_counts(request.user)
+        return Response({**counts, "total": sum(counts.values())})
 
 
+# The JWT user lookup, then one SELECT and one UPDATE per NOTIFICATION_BULK_CHUNK_SIZE rows and the SELECT that
+# finds the walk finished; budgeted for inboxes of up to ten chunks.
+@query_budget(queries=1 + 2 * 10 + 1)
 class SoftDeleteAllNotificationsView(APIView):
     permission_classes = [IsAuthenticated]
 
     @extend_schema(
         summary="Soft-Delete All Notifications",
-        description="This endpoint soft-deletes all notifications by setting their `is_deleted` field to `True`.",
+        description="This endpoint soft-deletes all notifications by setting their `is_deleted` and `is_viewed` "
+                    "fields to `True`, in bounded chunks. `count` is how many were deleted. Retries with the same "
+                    "`Idempotency-Key` header replay the first response.",
         request=None,
         responses={
             200: OpenApiResponse(
@@ -384,7 +522,66 @@ class SoftDeleteAllNotificationsView(APIView):
             )
         }
     )
+    @idempotent
     def post(self, request):
         user = request.user
-        SystemNotification.objects.filter(receiver=user, is_deleted=False, is_type_enabled=True).update(is_deleted=True)
-        return Response(data={"detail": "deleted all!!!!"}, status=status.HTTP_200_OK)
+        count = bulk.update_in_chunks(
+            SystemNotification.objects.active_for(user), is_deleted=True, is_viewed=True, deleted_at=now()
+        )
+        pin_to_primary(user)
+        if count:
+            versions.invalidate(user.pk)
+        return Response(data={"detail": _("All notifications deleted"), "count": count},
+                        status=status.HTTP_200_OK)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=["Events"],
+        summary="List events",
+        description="Events of the caller's companies, newest first, with keyset pagination.",
+        parameters=[EventQuerySerializer],
+    ),
+    retrieve=extend_schema(tags=["Events"], summary="Retrieve event"),
+)
+@query_budget(queries=5)
+class EventViewSet(viewsets.ReadOnlyModelViewSet):
+    serializer_class = EventSerializer
+    permission_classes = [IsAuthenticated, IsCompanyEmployee]
+    pagination_class = TimestampCursorPagination
+
+    def get_queryset(self):
+        roles = [CompanyUser.RoleChoices.MANAGER]
+        if self.action != 'recipients':
+            roles.append(CompanyUser.RoleChoices.EMPLOYEE)
+        queryset = Event.objects.filter(
+            company_id__in=self.request.user.company_memberships.filter(role__in=roles).values('company_id')
+        )
+        if self.action != 'list':
+            return queryset
+
+        query = EventQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        if params.get('event_type'):
+            queryset = queryset.filter(event_type__in=params['event_type'])
+        if 'company' in params:
+            queryset = queryset.filter(company_id=params['company'])
+        if 'camera' in params:
+            queryset = queryset.filter(camera_id=params['camera'])
+        if 'since' in params:
+            queryset = queryset.filter(timestamp__gte=params['since'])
+        if 'until' in params:
+            queryset = queryset.filter(timestamp__lt=params['until'])
+        return queryset
+
+    @extend_schema(
+        tags=["Events"],
+        summary="Event recipients",
+        description="Who was notified about this event, over every channel. Managers only.",
+        responses=EventRecipientSerializer(many=True),
+    )
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated, IsCompanyManager])
+    def recipients(self, request, pk=None):
+        event = self.get_object()
+        return Response(EventRecipientSerializer(event.recipients(), many=True).data)
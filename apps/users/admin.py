@@ -38,6 +38,7 @@ class CompanyAdmin(admin.ModelAdmin):
 @admin.register(CompanyUser)
 class CompanyUserAdmin(admin.ModelAdmin):
     list_display = ('user', 'company', 'role',)
+    list_select_related = ('user', 'company')
     list_filter = ('role', 'company',)
     search_fields = ('user__full_name', 'company__name',)
     autocomplete_fields = ('user', 'company',)
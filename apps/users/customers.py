@@ -0,0 +1,154 @@
+"""
+Bulk import of company customers.
+
+A batch is validated with a fixed number of queries (users by id/email,
+existing memberships), written with one ``bulk_create`` and announced with a
+single summary notification per recipient instead of one per customer.
+"""
+import uuid
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+
+from apps.notification_service import recipients, versions
+from apps.notification_service.consumers import user_group
+from apps.notification_service.models import Event, SystemNotification
+from apps.notification_service.registry import CUSTOMERS_IMPORTED
+from apps.users import directory
+from apps.users.models import CompanyUser
+
+User = get_user_model()
+
+BULK_BATCH_SIZE = 1000
+
+
+def resolve_rows(rows):
+    """
+    Map import rows (``{"user_id": ...}`` or ``{"email": ...}``) to user ids.
+
+    Returns ``(user_ids, errors)``; ``user_ids`` keeps the row order without
+    duplicates and ``errors`` lists ``{"index": ..., "error": ...}`` entries.
+    """
+    if not isinstance(rows, list):
+        return [], [{"index": None, "error": "Expected a list of customers"}]
+    if len(rows) > settings.CUSTOMER_IMPORT_MAX_BATCH:
+        return [], [{"index": None, "error": f"At most {settings.CUSTOMER_IMPORT_MAX_BATCH} customers per batch"}]
+
+    keys, errors = [], []
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors.append({"index": index, "error": "Expected an object"})
+        elif row.get('user_id'):
+            try:
+                keys.append((index, 'id', uuid.UUID(str(row['user_id']))))
+            except ValueError:
+                errors.append({"index": index, "error": "Invalid user_id"})
+        elif row.get('email'):
+            keys.append((index, 'email', str(row['email']).strip()))
+        else:
+            errors.append({"index": index, "error": "Either user_id or email is required"})
+
+    ids = {value for _index, kind, value in keys if kind == 'id'}
+    emails = {value for _index, kind, value in keys if kind == 'email'}
+    found_ids, ids_by_email = set(), {}
+    for user_id, email in User.objects.filter(Q(id__in=ids) | Q(email__in=emails)).values_list('id', 'email'):
+        found_ids.add(user_id)
+        ids_by_email[email] = user_id
+
+    user_ids = {}
+    for index, kind, value in keys:
+        if kind == 'id':
+            user_id = value if value in found_ids else None
+        else:
+            user_id = ids_by_email.get(value)
+        if user_id is None:
+            errors.append({"index": index, "error": "User does not exist"})
+        else:
+            user_ids.setdefault(user_id, index)
+    return list(user_ids), sorted(errors, key=lambda error: error["index"])
+
+
+def import_customers(company, user_ids, performed_by):
+    """
+    Add ``user_ids`` to ``company`` as customers and notify its managers once.
+
+    Users that already belong to the company, including those added by a
+    concurrent request after the check, are skipped. Returns
+    ``(created_user_ids, skipped)``.
+    """
+    existing = set(
+        CompanyUser.objects.filter(company=company, user_id__in=user_ids).values_list('user_id', flat=True)
+    )
+    new_ids = [user_id for user_id in user_ids if user_id not in existing]
+    if not new_ids:
+        return [], len(existing)
+
+    with transaction.atomic():
+        memberships = CompanyUser.objects.bulk_create(
+            [CompanyUser(company=company, user_id=user_id, role=CompanyUser.RoleChoices.CUSTOMER) for user_id in new_ids],
+            ignore_conflicts=True,
+            batch_size=BULK_BATCH_SIZE,
+        )
+        # Ids are generated client-side, so only the rows that were actually inserted carry them.
+        inserted = set(
+            CompanyUser.objects.filter(id__in=[membership.id for membership in memberships])
+            .values_list('user_id', flat=True)
+        )
+        created_ids = [user_id for user_id in new_ids if user_id in inserted]
+        if created_ids:
+            announce_customers(company.id, len(created_ids), performed_by)
+            directory.invalidate(company.id)
+    return created_ids, len(user_ids) - len(created_ids)
+
+
+def announce_customers(company_id, count, performed_by):
+    """Record one ``customers_imported`` event for a batch and send each manager a single summary."""
+    event = Event.objects.create(
+        event_type=Event.TypeChoices.CUSTOMERS_IMPORTED,
+        company_id=company_id,
+        details={"count": count, "performed_by": str(performed_by.id)},
+    )
+    notify_company(
+        company_id,
+        CUSTOMERS_IMPORTED,
+        {"count": count, "performer_name": performed_by.full_name},
+        event,
+    )
+
+
+def notify_company(company_id, spec, params, event):
+    """Save one ``spec`` notification per recipient in the company and push it to their own sockets after commit."""
+    receiver_ids = recipients.resolve(company_id, spec.type_notification)
+    notifications = SystemNotification.objects.bulk_create(
+        [spec.build(SystemNotification, receiver=user_id, params=params, event=event) for user_id in receiver_ids],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    if not notifications:
+        return notifications
+    versions.invalidate(*receiver_ids)
+
+    title, description = spec.render(params)
+    channel_layer = get_channel_layer()
+
+    def send():
+        for notif in notifications:
+            async_to_sync(channel_layer.group_send)(
+                user_group(notif.receiver_id),
+                {
+                    "type": "send.notification",
+                    "content": {
+                        "id": str(notif.id),
+                        "title": title,
+                        "description": description,
+                        "timestamp": notif.timestamp.isoformat(),
+                        "priority": notif.priority,
+                    }
+                }
+            )
+
+    transaction.on_commit(send)
+    return notifications
@@ -0,0 +1,74 @@
+"""
+Cached, versioned company member directory.
+
+Each company has a version token in the cache; the member list is cached
+under a key that includes it, and the same token is the list's ETag.
+Membership, role and user changes bump the version, so a stale list is
+never served and unchanged lists cost clients a 304.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.users.models import CompanyUser
+
+DIRECTORY_FIELDS = ('user_id', 'name', 'email', 'role', 'is_active')
+# ``User`` columns the directory rows are built from.
+USER_FIELDS = frozenset({'full_name', 'email', 'is_active'})
+
+
+def version_key(company_id):
+    return f"company_directory_version:{company_id}"
+
+
+def directory_key(company_id, version):
+    return f"company_directory:{company_id}:{version}"
+
+
+def get_version(company_id):
+    """
+    Current version token of the company's directory.
+
+    Tokens are timestamps rather than counters so a version key that was
+    evicted never restarts at a value an old ETag already used.
+    """
+    version = cache.get(version_key(company_id))
+    if version is None:
+        cache.add(version_key(company_id), time.time_ns(), timeout=None)
+        version = cache.get(version_key(company_id))
+    return version
+
+
+def invalidate(*company_ids):
+    """
+    Bump the companies' versions once the current transaction commits.
+
+    A bump before the commit would let a concurrent ``get_directory`` cache
+    the old rows under the new version.
+    """
+    company_ids = set(company_ids)
+    if not company_ids:
+        return
+    transaction.on_commit(
+        lambda: cache.set_many({version_key(company_id): time.time_ns() for company_id in company_ids}, timeout=None)
+    )
+
+
+def load(company_id):
+    rows = CompanyUser.objects.filter(company_id=company_id).order_by('user__full_name', 'user__email').values_list(
+        'user_id', 'user__full_name', 'user__email', 'role', 'user__is_active'
+    )
+    return [dict(zip(DIRECTORY_FIELDS, row)) for row in rows]
+
+
+def get_directory(company_id, version=None):
+    """Return the company's member rows (``DIRECTORY_FIELDS``), loading them with one query on a miss."""
+    version = version or get_version(company_id)
+    key = directory_key(company_id, version)
+    members = cache.get(key)
+    if members is None:
+        members = load(company_id)
+        cache.set(key, members, timeout=settings.COMPANY_DIRECTORY_CACHE_TIMEOUT)
+    return members
@@ -1,5 +1,6 @@
 from django.core.validators import RegexValidator
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
 from apps.users.constants import MOBILE_REGEX
@@ -21,12 +22,20 @@ class User(BaseUserModel):
     )
     email = models.EmailField(unique=True, verbose_name=_("email"))
 
+    class Meta(BaseUserModel.Meta):
+        indexes = [
+            *BaseUserModel.Meta.indexes,
+            # Back the admin's case-insensitive ``iexact`` searches on the large tables' receivers.
+            models.Index(Upper('email'), name='users_user_email_upper_idx'),
+            models.Index(Upper('full_name'), name='users_user_full_name_upper_idx'),
+        ]
+
     def __str__(self):
         return self.full_name or self.email
 
     def save(self, *args, **kwargs):
         if not self.full_name:
-            self.fullname = self.first_name + self.last_name
+            self.full_name = f"{self.first_name} {self.last_name}".strip()
         if not self.username:
             self.username = self.email
         return super().save(*args, **kwargs)
@@ -1,6 +1,6 @@
 from rest_framework.permissions import BasePermission
 
-from apps.notification_service.models import BaseNotificationModel
+from apps.notification_service import recipients
 from apps.users.models import CompanyUser
 
 
@@ -31,15 +31,10 @@ class IsCompanyEmployeeTypeChoices(BasePermission):
         is_manager = request.user.company_memberships.filter(
             role=CompanyUser.RoleChoices.MANAGER.value
         ).exists()
-        notify_types_for_employee = {
-            BaseNotificationModel.TypeNotificationChoices.ONLINE_CAMERA,
-            BaseNotificationModel.TypeNotificationChoices.OFFLINE_CAMERA,
-            BaseNotificationModel.TypeNotificationChoices.CREATE_CUSTOMER_BY_EMPLOYEE,
-        }
         if request.user and is_manager:
             return True
         if request.user and is_employee and type:
-            return type in notify_types_for_employee
+            return recipients.can_view({CompanyUser.RoleChoices.EMPLOYEE}, type)
 
 
 class IsCompanyCustomer(BasePermission):
@@ -1,8 +1,10 @@
 import logging
 
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 
+from apps.users import directory
 from apps.users.models import CompanyUser, Company
 
 logger = logging.getLogger(__name__)
@@ -29,6 +31,54 @@ class CompanySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'is_active']
 
 
+class CompanyUserListSerializer(serializers.ListSerializer):
+    """
+    Validates many memberships with two set queries instead of two per item.
+
+    Users and existing memberships of the company are fetched once up front;
+    per-item errors are reported at the item's position like any list
+    serializer.
+    """
+
+    def to_internal_value(self, data):
+        items = super().to_internal_value(data)
+        company = self.context['company']
+        user_ids = {item['user_id'] for item in items}
+        self.users = User.objects.in_bulk(user_ids)
+        members = set(
+            CompanyUser.objects.filter(company=company, user_id__in=user_ids).values_list('user_id', flat=True)
+        )
+
+        errors, seen = [], set()
+        for item in items:
+            user_id = item['user_id']
+            if user_id not in self.users:
+                errors.append({'user_id': ["User does not exist"]})
+            elif user_id in members:
+                errors.append({'non_field_errors': ["User is already in this company"]})
+            elif user_id in seen:
+                errors.append({'user_id': ["Duplicate user in this request"]})
+            else:
+                errors.append({})
+            seen.add(user_id)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def create(self, validated_data):
+        try:
+            # Savepoint, so a lost race leaves the request's transaction usable.
+            with transaction.atomic():
+                memberships = CompanyUser.objects.bulk_create([CompanyUser(**item) for item in validated_data])
+        except IntegrityError:
+            # Another request added one of the users between validation and insert.
+            raise serializers.ValidationError("User is already in this company")
+        for membership in memberships:
+            membership.user = self.users[membership.user_id]
+        directory.invalidate(*{membership.company_id for membership in memberships})
+        return memberships
+
+
 class CompanyUserSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     user_id = serializers.UUIDField(write_only=True)
@@ -37,13 +87,18 @@ class CompanyUserSerializer(serializers.ModelSerializer):
         model = CompanyUser
         fields = ['id', 'user', 'user_id', 'company', 'role']
         extra_kwargs = {'company': {'read_only': True}}
+        list_serializer_class = CompanyUserListSerializer
 
     def validate_user_id(self, value):
-        if not User.objects.filter(id=value).exists():
+        # checked for all items at once by CompanyUserListSerializer
+        if self.parent is None and not User.objects.filter(id=value).exists():
             raise serializers.ValidationError("User does not exist")
         return value
 
     def validate(self, attrs):
+        if self.parent is not None:
+            return attrs
+
         company = self.context['company']
         user_id = attrs['user_id']
 
@@ -54,6 +109,13 @@ class CompanyUserSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class CustomerSerializer(CompanyUserSerializer):
+    """Membership whose role is always ``CUSTOMER``, set by the view."""
+
+    class Meta(CompanyUserSerializer.Meta):
+        read_only_fields = ['role']
+
+
 class ChangeRoleSerializer(serializers.Serializer):
     role = serializers.IntegerField()
 
@@ -61,3 +123,16 @@ class ChangeRoleSerializer(serializers.Serializer):
         if value not in dict(CompanyUser.RoleChoices.choices):
             raise serializers.ValidationError("Invalid role")
         return value
+
+
+class MemberDirectorySerializer(serializers.Serializer):
+    user_id = serializers.UUIDField()
+    name = serializers.CharField()
+    email = serializers.EmailField()
+    role = serializers.IntegerField()
+    is_active = serializers.BooleanField()
+
+
+class CustomerImportRowSerializer(serializers.Serializer):
+    user_id = serializers.UUIDField(required=False)
+    email = serializers.EmailField(required=False)
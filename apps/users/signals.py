@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.users import directory
+from apps.users.models import CompanyUser, User
+
+
+@receiver(post_save, sender=CompanyUser)
+@receiver(post_delete, sender=CompanyUser)
+def invalidate_company_directory(sender, instance, **kwargs):
+    directory.invalidate(instance.company_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_directories(sender, instance, created, update_fields=None, **kwargs):
+    # Saves limited to other columns (``last_login``, passwords, ...) leave the directory as it was.
+    if created or (update_fields is not None and directory.USER_FIELDS.isdisjoint(update_fields)):
+        return
+    company_ids = instance.company_memberships.values_list('company_id', flat=True)
+    directory.invalidate(*company_ids)
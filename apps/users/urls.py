@@ -30,13 +30,16 @@ USER_API_V1 = [
              'delete': 'destroy'
          }), name='company-user-detail'),
     path('companies/<str:company_id>/users/<str:pk>/change_role/',
-         CompanyUserViewSet.as_view({'post': 'change_role'}),
+         CompanyUserViewSet.as_view({'post': 'change_role'}, **CompanyUserViewSet.change_role.kwargs),
          name='change-role'),
     path('companies/<str:company_id>/customers/',
          CustomerCreateViewSet.as_view({
              'get': 'list',
              'post': 'create'
          }), name='customers'),
+    path('companies/<str:company_id>/customers/import/',
+         CustomerCreateViewSet.as_view({'post': 'bulk_import'}, **CustomerCreateViewSet.bulk_import.kwargs),
+         name='customers-import'),
     path('companies/<str:company_id>/members/',
          UserViewSet.as_view({'get': 'list'}),
          name='company-members'),
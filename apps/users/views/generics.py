@@ -1,8 +1,7 @@
 import logging
 
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
 from django.contrib.auth import get_user_model
+from django.utils.http import parse_etags, quote_etag
 from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
@@ -11,24 +10,43 @@ from drf_spectacular.utils import (
 )
 from rest_framework import generics, permissions, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.generics import get_object_or_404
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from apps.notification_service.models import SystemNotification
+from apps.notification_service.models import Event
+from apps.notification_service.registry import CUSTOMER_CREATED
+from apps.users import directory
+from apps.users.customers import announce_customers, import_customers, notify_company, resolve_rows
 from apps.users.models import Company, CompanyUser
+from apps.users.parsers import CSVParser
 from apps.users.permissions import IsCompanyManager, IsCompanyEmployee
 from apps.users.serializers.generics import (
     UserSerializer,
     CompanySerializer,
     CompanyUserSerializer,
-    ChangeRoleSerializer
+    ChangeRoleSerializer,
+    CustomerImportRowSerializer,
+    CustomerSerializer,
+    MemberDirectorySerializer
 )
+from utils.query_budget import query_budget
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
+class BulkCreateMixin:
+    """Accept a JSON array on ``create``; the list serializer validates and saves all items at once."""
+
+    def get_serializer(self, *args, **kwargs):
+        if isinstance(kwargs.get('data'), list):
+            kwargs['many'] = True
+        return super().get_serializer(*args, **kwargs)
+
+
 @extend_schema(
     tags=['Users'],
     summary='User registration',
@@ -41,6 +59,7 @@ User = get_user_model()
         400: OpenApiResponse(description='Invalid input data')
     }
 )
+@query_budget(queries=8)
 class UserRegistrationView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -87,6 +106,7 @@ class UserRegistrationView(generics.CreateAPIView):
         description='Delete a company'
     )
 )
+@query_budget(queries=6)
 class CompanyViewSet(viewsets.ModelViewSet):
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
@@ -135,19 +155,23 @@ class CompanyViewSet(viewsets.ModelViewSet):
         description='Soft delete user and remove from company'
     )
 )
-class CompanyUserViewSet(viewsets.ModelViewSet):
+@query_budget(queries=8)
+class CompanyUserViewSet(BulkCreateMixin, viewsets.ModelViewSet):
     serializer_class = CompanyUserSerializer
     permission_classes = [IsCompanyManager]
 
     def get_queryset(self):
         company_id = self.kwargs['company_id']
-        return CompanyUser.objects.filter(company_id=company_id)
+        return CompanyUser.objects.filter(company_id=company_id).select_related('user')
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['company'] = get_object_or_404(Company, id=self.kwargs['company_id'])
         return context
 
+    def perform_create(self, serializer):
+        serializer.save(company=serializer.context['company'])
+
     @extend_schema(
         tags=['Users'],
         summary='Change user role',
@@ -226,8 +250,10 @@ class CompanyUserViewSet(viewsets.ModelViewSet):
         description='Add a customer to company (Employee only)'
     )
 )
-class CustomerCreateViewSet(viewsets.ModelViewSet):
-    serializer_class = CompanyUserSerializer
+# Listing: the JWT user, two permission checks and the company, then the page count and the rows.
+@query_budget(queries=6)
+class CustomerCreateViewSet(BulkCreateMixin, viewsets.ModelViewSet):
+    serializer_class = CustomerSerializer
     permission_classes = [IsCompanyEmployee]
 
     def get_queryset(self):
@@ -235,13 +261,19 @@ class CustomerCreateViewSet(viewsets.ModelViewSet):
         return CompanyUser.objects.filter(
             company_id=company_id,
             role=CompanyUser.RoleChoices.CUSTOMER
-        )
+        ).select_related('user')
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['company'] = get_object_or_404(Company, id=self.kwargs['company_id'])
         return context
 
+    # The JWT user, two permission checks and the company (4); users and memberships (2); the insert in a
+    # savepoint (3); the event and the notifications (2). First use of the template and the directory adds 5.
+    @query_budget(queries=4 + 2 + 3 + 2 + 5)
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     @extend_schema(
         tags=['Users'],
         description='Add customer with CUSTOMER role automatically assigned'
@@ -252,43 +284,58 @@ class CustomerCreateViewSet(viewsets.ModelViewSet):
             role=CompanyUser.RoleChoices.CUSTOMER,
             company_id=company_id
         )
+        if isinstance(customer, list):
+            announce_customers(company_id, len(customer), self.request.user)
+            return
 
-        # Get all managers of the company
-        managers = CompanyUser.objects.filter(
+        event = Event.objects.create(
+            event_type=Event.TypeChoices.CUSTOMER_CREATED,
             company_id=company_id,
-            role=CompanyUser.RoleChoices.MANAGER
-        ).select_related('user')
+            details={"customer_id": str(customer.user_id), "performed_by": str(self.request.user.id)},
+        )
+        notify_company(company_id, CUSTOMER_CREATED, {"customer_name": customer.user.full_name}, event)
 
-        channel_layer = get_channel_layer()
-        for manager in managers:
-            notif = SystemNotification.objects.create(
-                receiver=manager.user,
-                title="New Customer Added",
-                description=f"A new customer '{customer.user.full_name}' was added to your company.",
-                priority=SystemNotification.PriorityTypeChoices.MEDIUM
-            )
+    @extend_schema(
+        tags=['Users'],
+        summary='Import customers',
+        description='Add many existing users as customers in one request. Send a JSON array or a CSV file '
+                    '(`text/csv`) of `{user_id}` or `{email}` rows. Users already in the company are skipped and '
+                    'managers get one summary notification for the whole batch.',
+        request={'application/json': CustomerImportRowSerializer(many=True), 'text/csv': str},
+        responses={
+            201: OpenApiResponse(description='`{"received", "created", "skipped"}`'),
+            400: OpenApiResponse(description='`{"errors": [{"index", "error"}]}`; nothing is imported'),
+        }
+    )
+    # The JWT user, two permission checks, the company and the membership check (5); users and memberships (2);
+    # the insert and its re-read in a savepoint (4); the event and the notifications (2); first use adds 5.
+    @query_budget(queries=5 + 2 + 4 + 2 + 5)
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, CSVParser])
+    def bulk_import(self, request, company_id=None):
+        company = get_object_or_404(Company, id=company_id)
+        if not request.user.company_memberships.filter(
+                company=company, role__in=[CompanyUser.RoleChoices.MANAGER, CompanyUser.RoleChoices.EMPLOYEE]
+        ).exists():
+            raise PermissionDenied()
 
-            # Send WebSocket notification
-            async_to_sync(channel_layer.group_send)(
-                f"user_{manager.user.id}",
-                {
-                    "type": "send.notification",
-                    "content": {
-                        "id": notif.id,
-                        "title": notif.title,
-                        "description": notif.description,
-                        "timestamp": notif.timestamp.isoformat(),
-                        "priority": notif.priority,
-                    }
-                }
-            )
+        user_ids, errors = resolve_rows(request.data)
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        created, skipped = import_customers(company, user_ids, request.user)
+        return Response(
+            {"received": len(request.data), "created": len(created), "skipped": skipped},
+            status=status.HTTP_201_CREATED
+        )
 
 
 @extend_schema_view(
     list=extend_schema(
         tags=['Users'],
         summary='List company members',
-        description='List all active users in a company (Manager only)',
+        description='All active members of a company with their role (Manager only). Served from a cached '
+                    'directory; send the returned `ETag` as `If-None-Match` to get a 304 while nothing changed.',
+        responses=MemberDirectorySerializer(many=True),
         parameters=[
             OpenApiParameter(
                 name='company_id',
@@ -304,6 +351,7 @@ class CustomerCreateViewSet(viewsets.ModelViewSet):
         description='Get details of a company member'
     )
 )
+@query_budget(queries=5)
 class UserViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = UserSerializer
     permission_classes = [IsCompanyManager]
@@ -314,3 +362,21 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
             company_memberships__company_id=company_id,
             is_active=True
         )
+
+    def list(self, request, company_id=None):
+        """Whole member directory from the cache; ``If-None-Match`` with the current ETag gets a 304."""
+        if not request.user.company_memberships.filter(
+                company_id=company_id, role=CompanyUser.RoleChoices.MANAGER
+        ).exists():
+            raise PermissionDenied()
+
+        version = directory.get_version(company_id)
+        etag = quote_etag(f"{company_id}-{version}")
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            # rows are already plain values; skip per-row serializer overhead on large companies
+            response = Response([member for member in directory.get_directory(company_id, version) if member['is_active']])
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
@@ -2,15 +2,23 @@ import os
 
 from channels.routing import ProtocolTypeRouter, URLRouter
 from django.core.asgi import get_asgi_application
-
-from apps.notification_service.routing import websocket_urlpatterns
-from utils.middleware import JWTAuthMiddlewareStack
+from django.urls import re_path
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'scalable_notification_service.settings')
 
+# Initialise Django before importing consumers, they load the ORM models.
+django_asgi_application = get_asgi_application()
+
+from apps.notification_service.routing import http_urlpatterns, websocket_urlpatterns  # noqa: E402
+from utils.middleware import JWTAuthMiddlewareStack  # noqa: E402
+
 application = ProtocolTypeRouter(
     {
-        "http": get_asgi_application(),
+        "http": URLRouter(
+            http_urlpatterns + [
+                re_path(r"", django_asgi_application),
+            ]
+        ),
         "websocket": JWTAuthMiddlewareStack(
             URLRouter(
                 websocket_urlpatterns
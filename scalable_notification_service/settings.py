@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 ######################
 # Django config region
@@ -72,6 +73,7 @@ INSTALLED_APPS = DJANGO_APPS + OTHER_APPS + PROJECT_APPS
 ###################
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'utils.replicas.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -81,6 +83,7 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'silk.middleware.SilkyMiddleware',
+    'utils.query_budget.QueryBudgetMiddleware',
 ]
 
 ##################
@@ -124,10 +127,54 @@ CHANNEL_LAYERS = {
     }
 }
 
+# Server-Sent Events stream (sse/notifications/)
+SSE_HEARTBEAT_INTERVAL = env.int('SSE_HEARTBEAT_INTERVAL', default=15)
+SSE_RETRY_MS = env.int('SSE_RETRY_MS', default=3000)
+SSE_REPLAY_LIMIT = env.int('SSE_REPLAY_LIMIT', default=100)
+
 #################
 # DataBase region
 #################
 DATABASES = {'default': env.db()}
+# Read replicas, e.g. "postgres://...@replica-1/db,postgres://...@replica-2/db". Locally a
+# second SQLite file works (migrate it with --database replica_0); copy the primary's file
+# over it to play a replica that caught up.
+DATABASE_REPLICAS = []
+for number, url in enumerate(env.list('REPLICA_DATABASE_URLS', default=[])):
+    alias = f'replica_{number}'
+    DATABASES[alias] = {**env.db_url_config(url), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ['utils.replicas.ReplicaRouter']
+# Reads of these models may go to a replica in views that opt in (utils.replicas.ReplicaReadsMixin).
+REPLICA_MODELS = {
+    'notification_service.systemnotification',
+    'notification_service.emailnotification',
+    'notification_service.smsnotification',
+    'camera.cameraactionlog',
+}
+# After marking notifications read or deleted a user reads from the primary this long.
+REPLICA_STICKY_SECONDS = env.int('REPLICA_STICKY_SECONDS', default=5)
+
+# Under Daphne every sync request runs in a fresh thread, so persistent connections
+# (DB_CONN_MAX_AGE > 0) are never reused there and pile up; they only pay off for WSGI
+# workers and long-running commands. DB_POOL keeps a per-process pool instead: Django
+# still closes connections after each request, which hands them back to the pool.
+DB_POOL = env.bool('DB_POOL', default=False)
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = env.int('DB_CONN_MAX_AGE', default=0)
+    database['CONN_HEALTH_CHECKS'] = env.bool('DB_CONN_HEALTH_CHECKS', default=True)
+    if DB_POOL and database['ENGINE'] == 'django.db.backends.postgresql':
+        database['ENGINE'] = 'utils.pooled_postgresql'
+        database['POOL'] = {
+            'MAX_SIZE': env.int('DB_POOL_MAX_SIZE', default=20),
+            'TIMEOUT': env.float('DB_POOL_TIMEOUT', default=10.0),
+            'MAX_IDLE': env.float('DB_POOL_MAX_IDLE', default=300.0),
+            'MAX_LIFETIME': env.float('DB_POOL_MAX_LIFETIME', default=3600.0),
+            # Ping connections idle for longer than this before handing them out.
+            'CHECK_AFTER': env.float('DB_POOL_CHECK_AFTER', default=30.0),
+            # Log checkouts that waited longer than this for a free connection.
+            'SLOW_CHECKOUT': env.float('DB_POOL_SLOW_CHECKOUT', default=0.1),
+        }
 
 # DATABASES = {
 #     'default': {
@@ -196,6 +243,23 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 ##############
 REDIS_ADDRESS = env('REDIS_ADDRESS')
 
+##############
+# Cache region
+##############
+# Camera state, list versions, replica pins, idempotency keys and bulk delete jobs live in the
+# cache and must be shared by every worker, so it defaults to the Redis instance above and a
+# process-local backend is only accepted with DEBUG on (e.g. CACHE_URL=locmemcache:// locally).
+CACHES = {'default': env.cache('CACHE_URL', default=REDIS_ADDRESS)}
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+if not DEBUG and CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHE_BACKENDS:
+    raise ImproperlyConfigured("CACHE_URL must point to a cache shared by all workers when DEBUG is off")
+# Primary pins (utils.replicas) live in the cache; a pin only one worker sees lets the others read stale rows.
+if DATABASE_REPLICAS and CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHE_BACKENDS:
+    raise ImproperlyConfigured("REPLICA_DATABASE_URLS requires a CACHE_URL shared by all workers")
+
 ##############
 # Email region
 ##############
@@ -213,11 +277,69 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = 3000 * 1024 * 1024
 MAX_UPLOAD_SIZE = 3000 * 1024 * 1024
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 1_000_000
 
+##################
+# Users region
+##################
+CUSTOMER_IMPORT_MAX_BATCH = env.int('CUSTOMER_IMPORT_MAX_BATCH', default=10_000)
+COMPANY_DIRECTORY_CACHE_TIMEOUT = env.int('COMPANY_DIRECTORY_CACHE_TIMEOUT', default=24 * 60 * 60)
+
+##################
+# Camera region
+##################
+CAMERA_INGEST_MAX_BATCH = env.int('CAMERA_INGEST_MAX_BATCH', default=10_000)
+CAMERA_STATE_CACHE_TIMEOUT = env.int('CAMERA_STATE_CACHE_TIMEOUT', default=60 * 60)
+CAMERA_ROLLUP_MAX_BUCKETS = env.int('CAMERA_ROLLUP_MAX_BUCKETS', default=1000)
+CAMERA_LOG_EXPORT_CHUNK_SIZE = env.int('CAMERA_LOG_EXPORT_CHUNK_SIZE', default=5_000)
+
+######################
+# Notifications region
+######################
+# Rows per UPDATE when marking or deleting many notifications at once.
+NOTIFICATION_BULK_CHUNK_SIZE = env.int('NOTIFICATION_BULK_CHUNK_SIZE', default=1000)
+# How long a response is replayed for a repeated Idempotency-Key.
+IDEMPOTENCY_KEY_TIMEOUT = env.int('IDEMPOTENCY_KEY_TIMEOUT', default=24 * 60 * 60)
+
+##################
+# Retention region
+##################
+NOTIFICATION_RETENTION = {
+    'BACKEND': env('RETENTION_BACKEND', default='table'),  # 'table' or 'jsonl'
+    'ARCHIVE_DIR': env('RETENTION_ARCHIVE_DIR', default=os.path.join(BASE_DIR, 'archive')),
+    'BATCH_SIZE': env.int('RETENTION_BATCH_SIZE', default=1000),
+    'PAUSE_SECONDS': env.float('RETENTION_PAUSE_SECONDS', default=0.1),
+    'DELETED_AFTER_DAYS': env.int('RETENTION_DELETED_AFTER_DAYS', default=7),
+    'EVENTS_AFTER_DAYS': env.int('RETENTION_EVENTS_AFTER_DAYS', default=90),
+    # The most specific policy wins; a missing key matches any value.
+    'POLICIES': [
+        {'priority': 0, 'days': 30},
+        {'priority': 1, 'days': 90},
+        {'days': 365},
+    ],
+}
+
+#####################
+# Query budget region
+#####################
+# MODE: "off", "log" (warn with the offending SQL) or "raise" (tests). Off in production by default: the
+# recorder keeps every statement of every request. check_query_budgets switches it on for its own run.
+QUERY_BUDGET = {
+    'MODE': env('QUERY_BUDGET_MODE', default='log' if DEBUG else 'off'),
+    'DEFAULT_QUERIES': env.int('QUERY_BUDGET_DEFAULT_QUERIES', default=10),
+    'DEFAULT_SECONDS': env.float('QUERY_BUDGET_DEFAULT_SECONDS', default=None),
+    # Per URL name, e.g. {'notification-list': {'queries': 6, 'seconds': 0.2}}
+    'VIEWS': {},
+}
+
 ##################
 # Admin information's
 ##################
 ADMIN_HEADER = env("ADMIN_HEADER", default='ADMIN PAGE HEADER')
 ADMIN_INDEX_TITLE = env("ADMIN_INDEX_TITLE", default='ADMIN PAGE TITLE')
+ADMIN_EXACT_COUNT_LIMIT = env.int('ADMIN_EXACT_COUNT_LIMIT', default=100_000)
+ADMIN_JSON_PREVIEW_LENGTH = env.int('ADMIN_JSON_PREVIEW_LENGTH', default=80)
+BULK_DELETE_CHUNK_SIZE = env.int('BULK_DELETE_CHUNK_SIZE', default=1000)
+BULK_DELETE_PAUSE_SECONDS = env.float('BULK_DELETE_PAUSE_SECONDS', default=0.1)
+BULK_DELETE_BACKGROUND_THRESHOLD = env.int('BULK_DELETE_BACKGROUND_THRESHOLD', default=10_000)
 
 ##################
 # API Versions
@@ -1,15 +1,90 @@
-from django.contrib import admin
+import json
+
+from django.conf import settings
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin
+from django.core.exceptions import ValidationError
 from django.utils.translation import gettext as _
 
+from utils import bulk_delete
 from utils.models import BaseModel
+from utils.pagination import EstimatedCountPaginator
+
+
+def json_preview(value, length=None):
+    """Compact one-line JSON of ``value``, cut to ``length`` characters for changelist columns."""
+    length = length or settings.ADMIN_JSON_PREVIEW_LENGTH
+    text = json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=str)
+    return text if len(text) <= length else text[:length - 1] + '…'
 
 
 class BaseSilentDeleteAdmin(admin.ModelAdmin):
+    """
+    Admin whose delete action removes the selection in primary-key chunks.
+
+    Selections of ``BULK_DELETE_BACKGROUND_THRESHOLD`` rows or more are
+    queued for ``run_bulk_deletes``; the job's progress is shown on the
+    changelist.
+    """
     actions = ["silent_delete_object"]
 
     def silent_delete_object(self, request, queryset):
-        queryset.delete()
+        if bulk_delete.is_running(self.model):
+            self.message_user(request, _("A bulk delete of these rows is already running."), messages.WARNING)
+            return
+
+        total = bulk_delete.selection_size(queryset)
+        if total >= settings.BULK_DELETE_BACKGROUND_THRESHOLD:
+            if not bulk_delete.start_job(queryset, total):
+                self.message_user(request, _("A bulk delete of these rows is already running."), messages.WARNING)
+                return
+            self.message_user(request, _("Deleting about %(total)d rows in the background.") % {'total': total})
+            return
+
+        deleted = bulk_delete.ChunkedDeleter(queryset, pause=0).run()
+        self.message_user(request, _("Deleted %(deleted)d rows.") % {'deleted': deleted}, messages.SUCCESS)
+
+    def changelist_view(self, request, extra_context=None):
+        job = bulk_delete.get_job(self.model)
+        if job and job['status'] == 'queued':
+            self.message_user(request, _("Bulk delete of about %(total)d rows is waiting for a runner.") % job)
+        elif job and job['status'] == 'running':
+            self.message_user(
+                request, _("Bulk delete in progress: %(deleted)d of about %(total)d rows deleted.") % job
+            )
+        elif job:
+            if job['status'] == 'failed':
+                self.message_user(request, _("Bulk delete failed after %(deleted)d rows: %(error)s") % job,
+                                  messages.ERROR)
+            else:
+                self.message_user(request, _("Bulk delete finished: %(deleted)d rows deleted.") % job,
+                                  messages.SUCCESS)
+            bulk_delete.clear_job(self.model)
+        return super().changelist_view(request, extra_context)
+
+
+class LargeTableAdminMixin:
+    """
+    Changelist settings for tables with millions of rows.
+
+    Counts come from the planner estimate and the "show all" count is
+    skipped, and a search term that parses as a primary key skips
+    ``search_fields``. Subclasses should set ``list_select_related`` for every
+    FK in ``list_display`` and only search indexed columns by prefix (``^``)
+    or exact value.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        """A search term that is a primary key is answered from the primary key index alone."""
+        try:
+            pk = queryset.model._meta.pk.to_python(search_term.strip())
+        except ValidationError:
+            pk = None
+        if pk is None:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk=pk), False
 
 
 class BaseAdmin(admin.ModelAdmin):
@@ -0,0 +1,153 @@
+"""
+Chunked bulk delete for admin selections.
+
+Rows are deleted in primary-key order, a chunk per short transaction with a
+pause in between, so a "select all" across millions of rows never holds one
+long table lock or loads every object for cascade collection at once. Large
+selections are queued as a job in the shared cache, one key per model, and
+carried out by ``manage.py run_bulk_deletes`` outside the web workers. The
+job is claimed with ``cache.add``, so two deletes of the same table are never
+queued or run side by side; a runner that dies stops refreshing its lock and
+the next run resumes the job. ``chunk_deleted`` is sent after every
+committed chunk for models that keep caches derived from their rows.
+"""
+import logging
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from utils.query_plan import estimated_count
+
+logger = logging.getLogger(__name__)
+
+JOB_TIMEOUT = 24 * 60 * 60
+# A runner refreshes its lock after every chunk; one that stops for this long is presumed dead.
+LOCK_TIMEOUT = 10 * 60
+ACTIVE_STATUSES = ('queued', 'running')
+
+# Sent with ``sender=model`` and ``pks`` after each chunk commits.
+chunk_deleted = Signal()
+
+
+def job_key(model):
+    return f"bulk_delete_job:{model._meta.label_lower}"
+
+
+def lock_key(model):
+    return f"bulk_delete_lock:{model._meta.label_lower}"
+
+
+def get_job(model):
+    return cache.get(job_key(model))
+
+
+def clear_job(model):
+    cache.delete(job_key(model))
+
+
+def is_running(model):
+    job = get_job(model)
+    return bool(job) and job['status'] in ACTIVE_STATUSES
+
+
+def new_job(queryset, total):
+    # Query objects pickle; the runner rebuilds the selection from it.
+    return {'status': 'queued', 'total': total, 'deleted': 0, 'started': timezone.now(), 'error': '',
+            'query': queryset.query, 'db': queryset.db}
+
+
+def selection_size(queryset):
+    """Planner estimate of the selection where available, exact count otherwise."""
+    estimate = estimated_count(queryset)
+    return queryset.count() if estimate is None else estimate
+
+
+class ChunkedDeleter:
+    def __init__(self, queryset, chunk_size=None, pause=None, progress=None):
+        self.queryset = queryset.order_by('pk')
+        self.model = queryset.model
+        self.chunk_size = chunk_size or settings.BULK_DELETE_CHUNK_SIZE
+        self.pause = settings.BULK_DELETE_PAUSE_SECONDS if pause is None else pause
+        self.progress = progress or (lambda deleted: None)
+        self.deleted = 0
+        self.chunks = 0
+
+    def run(self):
+        """Delete the selection chunk by chunk; returns the number of selected rows deleted."""
+        last_pk = None
+        while True:
+            chunk = self.queryset.filter(pk__gt=last_pk) if last_pk is not None else self.queryset
+            pks = list(chunk.values_list('pk', flat=True)[:self.chunk_size])
+            if not pks:
+                return self.deleted
+
+            with transaction.atomic(using=self.queryset.db):
+                _total, per_model = self.model._base_manager.using(self.queryset.db).filter(pk__in=pks).delete()
+            chunk_deleted.send(sender=self.model, pks=pks)
+
+            last_pk = pks[-1]
+            self.chunks += 1
+            self.deleted += per_model.get(self.model._meta.label, 0)
+            self.progress(self.deleted)
+            if self.pause:
+                time.sleep(self.pause)
+
+
+def start_job(queryset, total):
+    """
+    Queue the deletion of ``queryset`` for ``run_bulk_deletes``.
+
+    Returns ``False`` when a job for the same model is already queued or
+    running; a finished job left for the changelist to report is replaced.
+    """
+    model = queryset.model
+    job = get_job(model)
+    if job and job['status'] not in ACTIVE_STATUSES:
+        clear_job(model)
+    return cache.add(job_key(model), new_job(queryset, total), timeout=JOB_TIMEOUT)
+
+
+def run_job(model, job):
+    """Carry out a queued job, recording its progress in the cache; resumes a job whose runner died."""
+    key = job_key(model)
+    queryset = model._default_manager.db_manager(job['db']).all()
+    queryset.query = job['query']
+    done_before = job['deleted']
+
+    def progress(deleted):
+        job['deleted'] = done_before + deleted
+        cache.set(key, job, timeout=JOB_TIMEOUT)
+        cache.touch(lock_key(model), LOCK_TIMEOUT)
+
+    job['status'] = 'running'
+    cache.set(key, job, timeout=JOB_TIMEOUT)
+    try:
+        ChunkedDeleter(queryset, progress=progress).run()
+        job['status'] = 'done'
+    except Exception as e:
+        logger.exception(f"Bulk delete of {model._meta.label} failed")
+        job.update(status='failed', error=str(e))
+    finally:
+        job['finished'] = timezone.now()
+        cache.set(key, job, timeout=JOB_TIMEOUT)
+    return job
+
+
+def run_pending():
+    """Run every queued or abandoned job whose lock this process can take; returns the jobs it ran."""
+    models = {job_key(model): model for model in apps.get_models()}
+    finished = []
+    for key, job in cache.get_many(list(models)).items():
+        model = models[key]
+        if job['status'] not in ACTIVE_STATUSES or not cache.add(lock_key(model), True, timeout=LOCK_TIMEOUT):
+            continue
+        try:
+            finished.append((model, run_job(model, job)))
+        finally:
+            cache.delete(lock_key(model))
+    return finished
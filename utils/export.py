@@ -0,0 +1,201 @@
+"""
+Append-only export of time-ordered tables for offline analysis.
+
+Rows are read in ``(timestamp, id)`` order through one server-side cursor
+(``QuerySet.iterator``), in fixed-size chunks, so memory stays constant
+whatever the range. Output is Parquet when ``pyarrow`` is installed and
+gzip-compressed CSV or JSON lines otherwise.
+"""
+import csv
+import io
+import json
+import os
+import uuid
+import zlib
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional dependency
+    pyarrow = None
+
+FORMATS = ('parquet', 'csv', 'jsonl')
+STREAM_FORMATS = ('csv', 'jsonl')
+EXTENSIONS = {'parquet': 'parquet', 'csv': 'csv.gz', 'jsonl': 'jsonl.gz'}
+
+
+def default_format():
+    return 'parquet' if pyarrow is not None else 'jsonl'
+
+
+def iter_batches(queryset, columns, since=None, until=None, after=None, chunk_size=10_000):
+    """
+    Yield lists of ``columns`` tuples in ``(timestamp, id)`` order.
+
+    ``after`` is the ``(timestamp, id)`` of the last row already exported;
+    export resumes right behind it. ``columns`` must contain ``timestamp``
+    and ``id``.
+    """
+    if since is not None:
+        queryset = queryset.filter(timestamp__gte=since)
+    if until is not None:
+        queryset = queryset.filter(timestamp__lt=until)
+    if after is not None:
+        timestamp, pk = after
+        queryset = queryset.filter(Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=pk))
+
+    rows = queryset.order_by('timestamp', 'id').values_list(*columns).iterator(chunk_size=chunk_size)
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == chunk_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def normalize(value):
+    """Flatten a DB value into something every format can hold."""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder)
+    return value
+
+
+def encode_jsonl(columns, batch):
+    return ''.join(
+        json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + '\n' for row in batch
+    ).encode()
+
+
+def encode_csv(columns, batch, header=False):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    writer.writerows(
+        [value.isoformat() if isinstance(value, datetime) else normalize(value) for value in row] for row in batch
+    )
+    return buffer.getvalue().encode()
+
+
+def stream(batches, columns, fmt):
+    """Yield a gzip stream of ``batches`` encoded as ``fmt`` (``csv`` or ``jsonl``), one member chunk per batch."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    if fmt == 'csv':
+        yield compressor.compress(encode_csv(columns, [], header=True))
+    for batch in batches:
+        data = encode_jsonl(columns, batch) if fmt == 'jsonl' else encode_csv(columns, batch)
+        yield compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+class PartWriter:
+    """One output file, written under a temporary name and moved into place when complete."""
+
+    def __init__(self, path, columns, fmt):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self.columns = columns
+        self.fmt = fmt
+        self.rows = 0
+        self.parquet = None
+        if fmt != 'parquet':
+            self.file = open(self.tmp_path, 'wb')
+            self.compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+            if fmt == 'csv':
+                self.file.write(self.compressor.compress(encode_csv(columns, [], header=True)))
+
+    def write(self, batch):
+        if self.fmt == 'parquet':
+            table = pyarrow.Table.from_pylist(
+                [{column: normalize(value) for column, value in zip(self.columns, row)} for row in batch]
+            )
+            if self.parquet is None:
+                self.parquet = pyarrow.parquet.ParquetWriter(self.tmp_path, table.schema, compression='zstd')
+            self.parquet.write_table(table)
+        else:
+            data = encode_jsonl(self.columns, batch) if self.fmt == 'jsonl' else encode_csv(self.columns, batch)
+            self.file.write(self.compressor.compress(data))
+        self.rows += len(batch)
+
+    def close(self):
+        if self.fmt == 'parquet':
+            self.parquet.close()
+        else:
+            self.file.write(self.compressor.flush())
+            self.file.close()
+        os.replace(self.tmp_path, self.path)
+
+
+class Exporter:
+    """
+    Export ``queryset`` into ``directory`` as numbered, append-only part files.
+
+    After every completed part the ``(timestamp, id)`` of its last row is
+    stored in ``<name>.progress.json``; ``run(resume=True)`` continues from
+    there, and an interrupted part is simply written again.
+    """
+
+    def __init__(self, queryset, columns, directory, name, fmt=None, chunk_size=10_000, rows_per_file=1_000_000):
+        if fmt == 'parquet' and pyarrow is None:
+            raise ValueError("Parquet export needs pyarrow; use csv or jsonl")
+        self.queryset = queryset
+        self.columns = columns
+        self.directory = directory
+        self.name = name
+        self.fmt = fmt or default_format()
+        self.chunk_size = chunk_size
+        self.rows_per_file = rows_per_file
+        self.progress_path = os.path.join(directory, f"{name}.progress.json")
+
+    def load_progress(self):
+        try:
+            with open(self.progress_path) as f:
+                progress = json.load(f)
+        except FileNotFoundError:
+            return None
+        return datetime.fromisoformat(progress['timestamp']), uuid.UUID(progress['id'])
+
+    def save_progress(self, row):
+        timestamp, pk = row[self.columns.index('timestamp')], row[self.columns.index('id')]
+        with open(self.progress_path, 'w') as f:
+            json.dump({'timestamp': timestamp.isoformat(), 'id': str(pk)}, f)
+
+    def part_path(self, row):
+        timestamp = row[self.columns.index('timestamp')]
+        return os.path.join(self.directory, f"{self.name}-{timestamp:%Y%m%dT%H%M%S%f}.{EXTENSIONS[self.fmt]}")
+
+    def run(self, since=None, until=None, resume=False, progress=None):
+        """Export rows and return ``(rows, files)`` written by this run."""
+        os.makedirs(self.directory, exist_ok=True)
+        after = self.load_progress() if resume else None
+        batches = iter_batches(
+            self.queryset, self.columns, since=None if after else since, until=until, after=after,
+            chunk_size=self.chunk_size,
+        )
+
+        total, files, part = 0, [], None
+        for batch in batches:
+            if part is None:
+                part = PartWriter(self.part_path(batch[0]), self.columns, self.fmt)
+            part.write(batch)
+            total += len(batch)
+            if part.rows >= self.rows_per_file:
+                part.close()
+                self.save_progress(batch[-1])
+                files.append(part.path)
+                part = None
+            if progress:
+                progress(total)
+        if part is not None:
+            part.close()
+            self.save_progress(batch[-1])
+            files.append(part.path)
+        return total, files
@@ -0,0 +1,73 @@
+"""
+``Idempotency-Key`` support for unsafe API calls.
+
+A client that retries a request with the same key gets the stored response
+of the first attempt instead of running it again. Responses are kept in the
+cache per user, path and key for ``IDEMPOTENCY_KEY_TIMEOUT`` seconds. Reusing
+a key with a different body or query string is rejected, and so is a retry that arrives
+while the first attempt is still running.
+"""
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+IN_PROGRESS = 'in-progress'
+
+
+def cache_key(request, key):
+    return f"idempotency:{request.user.pk}:{request.path}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def fingerprint(request):
+    """Hash of what the request asks for: its body and its query string (``?channel=`` etc.)."""
+    query = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    return hashlib.sha256(json.dumps([query, request.data], sort_keys=True, default=str).encode()).hexdigest()
+
+
+def idempotent(handler):
+    """Decorate a DRF handler method (``post`` etc.) to honour ``Idempotency-Key``."""
+
+    @wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return handler(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response({"detail": f"{HEADER} is longer than {MAX_KEY_LENGTH} characters"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        stored_key, body = cache_key(request, key), fingerprint(request)
+        if not cache.add(stored_key, {'state': IN_PROGRESS, 'fingerprint': body},
+                         timeout=settings.IDEMPOTENCY_KEY_TIMEOUT):
+            stored = cache.get(stored_key) or {}
+            if stored.get('fingerprint') != body:
+                return Response({"detail": f"{HEADER} was already used for a different request"},
+                                status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+            if stored.get('state') == IN_PROGRESS:
+                return Response({"detail": f"A request with this {HEADER} is still in progress"},
+                                status=status.HTTP_409_CONFLICT)
+            response = Response(stored['data'], status=stored['status'])
+            response['Idempotent-Replayed'] = 'true'
+            return response
+
+        try:
+            response = handler(self, request, *args, **kwargs)
+        except Exception:
+            cache.delete(stored_key)
+            raise
+        if status.is_server_error(response.status_code):
+            # Let the client retry failures for real.
+            cache.delete(stored_key)
+        else:
+            cache.set(stored_key, {'state': 'done', 'fingerprint': body, 'status': response.status_code,
+                                   'data': response.data}, timeout=settings.IDEMPOTENCY_KEY_TIMEOUT)
+        return response
+
+    return wrapper
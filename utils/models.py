@@ -5,6 +5,8 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from utils.functions import uuid7
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +25,23 @@ class BaseModel(models.Model):
         get_latest_by = ('create_time',)
 
 
+class CompactBaseModel(models.Model):
+    """
+    Narrow base for append-heavy tables, opted into per model.
+
+    Uses a time-ordered UUID7 primary key (sequential inserts, no index page
+    splits) and leaves the row timestamp to the concrete model instead of
+    carrying ``create_time``/``modify_time`` as well. Moving an existing
+    ``BaseModel`` table onto it drops those columns and their data.
+    """
+    id = models.UUIDField(primary_key=True, editable=False, default=uuid7)
+
+    auto_cols = []
+
+    class Meta:
+        abstract = True
+
+
 class BaseUserModel(AbstractUser):
     id = models.UUIDField(primary_key=True, editable=True, default=uuid.uuid4)
 
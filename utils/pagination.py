@@ -0,0 +1,100 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+from utils.query_plan import estimated_count
+
+
+class TimestampCursorPagination(CursorPagination):
+    """
+    Keyset pagination over ``(timestamp, id)``, newest first.
+
+    DRF's ``CursorPagination`` keeps only the first ordering field in its
+    cursor and steps over rows sharing it with an offset. Here the cursor
+    holds the timestamp and the id of the boundary row, and a page is the
+    rows strictly before (or, going back, after) that pair, so every page is
+    a range scan on a timestamp index whatever the depth or the number of
+    rows sharing a timestamp.
+    """
+    ordering = ('-timestamp', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        self.reverse = self.cursor is not None and self.cursor.reverse
+        if self.cursor is not None:
+            timestamp, pk = self.decode_position(self.cursor.position, queryset.model)
+            if self.reverse:
+                queryset = queryset.filter(Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=pk))
+            else:
+                queryset = queryset.filter(Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=pk))
+        queryset = queryset.order_by(*(('timestamp', 'id') if self.reverse else self.ordering))
+
+        results = list(queryset[:self.page_size + 1])
+        # One extra row tells whether there is more in the direction of travel.
+        self.has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+        return self.page
+
+    def get_next_link(self):
+        # Going back, the older rows are the ones the cursor came from.
+        has_next = self.cursor is not None if self.reverse else self.has_more
+        if not has_next:
+            return None
+        return self.link_to(self.page[-1] if self.page else None, reverse=False)
+
+    def get_previous_link(self):
+        has_previous = self.has_more if self.reverse else self.cursor is not None
+        if not has_previous:
+            return None
+        return self.link_to(self.page[0] if self.page else None, reverse=True)
+
+    def link_to(self, row, reverse):
+        """Link to the rows past ``row``, or past the current cursor when the page is empty."""
+        position = self.cursor.position if row is None else self.encode_position(row)
+        return self.encode_cursor(Cursor(offset=0, reverse=reverse, position=position))
+
+    @staticmethod
+    def encode_position(row):
+        return f"{row.timestamp.isoformat()}|{row.pk}"
+
+    def decode_position(self, position, model):
+        try:
+            timestamp, pk = position.split('|')
+            return datetime.fromisoformat(timestamp), model._meta.pk.to_python(pk)
+        except (AttributeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for the admin changelists of very large tables.
+
+    Above ``ADMIN_EXACT_COUNT_LIMIT`` rows the total comes from the PostgreSQL
+    planner estimate instead of an exact ``COUNT(*)``, which on a
+    multi-million-row table scans the whole index. Small results and other
+    databases keep the exact count.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate is None or estimate < settings.ADMIN_EXACT_COUNT_LIMIT:
+            return super().count
+        return estimate
@@ -0,0 +1,11 @@
+"""
+PostgreSQL backend that keeps connections in a per-process pool.
+
+``ENGINE: 'utils.pooled_postgresql'`` behaves like Django's PostgreSQL
+backend, except that opening a connection checks one out of a shared
+``ConnectionPool`` and closing it returns it there. Django's own connection
+handling is untouched: with ``CONN_MAX_AGE = 0`` every request and every
+``database_sync_to_async`` call still "opens" and "closes" a connection, but
+both are a checkout and a checkin instead of a TCP and auth handshake, and
+concurrent threads share up to ``POOL['MAX_SIZE']`` server connections.
+"""
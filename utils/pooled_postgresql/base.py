@@ -0,0 +1,69 @@
+import weakref
+
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+from utils.pooled_postgresql.pool import ConnectionPool, PoolTimeout, get_pool
+
+# settings_dict['POOL'] key -> ConnectionPool argument
+POOL_OPTIONS = {
+    'MAX_SIZE': 'max_size',
+    'TIMEOUT': 'timeout',
+    'MAX_IDLE': 'max_idle',
+    'MAX_LIFETIME': 'max_lifetime',
+    'CHECK_AFTER': 'check_after',
+    'SLOW_CHECKOUT': 'slow_checkout',
+}
+
+
+def check(connection):
+    """Ping ``connection``; it must come back idle so Django can set autocommit on it."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    if connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+    return True
+
+
+def reset(connection):
+    """Roll back whatever the last user left open; broken connections are not reusable."""
+    if connection.closed:
+        return False
+    status = connection.info.transaction_status
+    if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+        return False
+    if status != extensions.TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+    return True
+
+
+def close(connection):
+    connection.close()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_pool(self):
+        def factory():
+            options = self.settings_dict.get('POOL') or {}
+            kwargs = {argument: options[key] for key, argument in POOL_OPTIONS.items() if key in options}
+            return ConnectionPool(f"{self.alias}/{self.settings_dict['NAME']}", check, reset, close, **kwargs)
+        # The test runner renames the database of an alias, so the target is part of the key.
+        key = (self.alias,) + tuple(self.settings_dict.get(name) for name in ('NAME', 'HOST', 'PORT', 'USER'))
+        return get_pool(key, factory)
+
+    def get_new_connection(self, conn_params):
+        pool = self.get_pool()
+        try:
+            connection = pool.checkout(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+        except PoolTimeout as e:
+            raise self.Database.OperationalError(str(e)) from e
+        # A wrapper dropped along with its thread never closes its connection; free the slot then.
+        self._checkout = (pool, weakref.finalize(self, pool.lost, connection))
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            pool, finalizer = self._checkout
+            finalizer.detach()
+            with self.wrap_database_errors:
+                pool.checkin(self.connection)
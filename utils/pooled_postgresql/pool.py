@@ -0,0 +1,197 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    A small thread-safe pool of DB-API connections.
+
+    At most ``max_size`` connections are checked out at once; a checkout
+    beyond that waits up to ``timeout`` seconds for one to be returned.
+    Idle connections are reused newest first, so the oldest ones sit at the
+    bottom and are dropped once idle for ``max_idle`` seconds. Connections
+    older than ``max_lifetime`` are closed instead of reused, and one that was
+    idle for more than ``check_after`` seconds is pinged before it is handed
+    out. How a connection is pinged, reset and closed is left to the
+    ``check``, ``reset`` and ``close`` callables; ``checkout`` takes the one
+    that opens a new connection.
+    """
+
+    def __init__(self, name, check, reset, close, max_size=10, timeout=10.0, max_idle=300.0,
+                 max_lifetime=3600.0, check_after=30.0, slow_checkout=0.1):
+        self.name = name
+        self.check = check
+        self.reset = reset
+        self.close = close
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        self.slow_checkout = slow_checkout
+
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        # (connection, opened_at, returned_at), most recently returned last.
+        self._idle = deque()
+        self._opened_at = {}
+        self.counters = {
+            'connects': 0, 'checkouts': 0, 'reuses': 0, 'health_check_failures': 0, 'expired': 0,
+            'discarded': 0, 'lost': 0, 'timeouts': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0,
+        }
+
+    def checkout(self, connect):
+        start = time.perf_counter()
+        acquired = self._slots.acquire(timeout=self.timeout)
+        wait = time.perf_counter() - start
+        with self._lock:
+            self.counters['wait_seconds'] += wait
+            self.counters['max_wait_seconds'] = max(self.counters['max_wait_seconds'], wait)
+            if not acquired:
+                self.counters['timeouts'] += 1
+            else:
+                self.counters['checkouts'] += 1
+        if not acquired:
+            raise PoolTimeout(f"No connection free in pool '{self.name}' after {self.timeout}s ({self.max_size} in use)")
+        if wait > self.slow_checkout:
+            logger.warning(f"Waited {wait:.3f}s for a connection from pool '{self.name}'")
+
+        try:
+            connection = self._take_idle()
+            if connection is None:
+                connection = connect()
+                with self._lock:
+                    self.counters['connects'] += 1
+                    self._opened_at[id(connection)] = time.monotonic()
+            return connection
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _take_idle(self):
+        while True:
+            with self._lock:
+                self._expire_idle()
+                if not self._idle:
+                    return None
+                connection, opened_at, returned_at = self._idle.pop()
+
+            now = time.monotonic()
+            if now - opened_at > self.max_lifetime:
+                self._discard(connection, 'expired')
+            elif now - returned_at > self.check_after and not self._is_healthy(connection):
+                self._discard(connection, 'health_check_failures')
+            else:
+                with self._lock:
+                    self.counters['reuses'] += 1
+                return connection
+
+    def _expire_idle(self):
+        """Drop connections idle for longer than ``max_idle``; called with the lock held."""
+        deadline = time.monotonic() - self.max_idle
+        while self._idle and self._idle[0][2] < deadline:
+            connection = self._idle.popleft()[0]
+            self.counters['expired'] += 1
+            self._opened_at.pop(id(connection), None)
+            self._close_quietly(connection)
+
+    def _is_healthy(self, connection):
+        try:
+            return self.check(connection)
+        except Exception:
+            return False
+
+    def checkin(self, connection):
+        """Return ``connection``; it is closed instead if it cannot be reset to a clean state."""
+        try:
+            try:
+                reusable = self.reset(connection)
+            except Exception:
+                reusable = False
+            opened_at = self._opened_at.get(id(connection))
+            if not reusable or opened_at is None:
+                self._discard(connection, 'discarded')
+                return
+            with self._lock:
+                self._idle.append((connection, opened_at, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def lost(self, connection):
+        """Close a checked-out connection whose owner went away without returning it and free its slot."""
+        try:
+            self._discard(connection, 'lost')
+        finally:
+            self._slots.release()
+
+    def _discard(self, connection, counter):
+        with self._lock:
+            self.counters[counter] += 1
+            self._opened_at.pop(id(connection), None)
+        self._close_quietly(connection)
+
+    def _close_quietly(self, connection):
+        try:
+            self.close(connection)
+        except Exception:
+            logger.debug(f"Closing a connection of pool '{self.name}' failed", exc_info=True)
+
+    def clear(self):
+        """Close every idle connection, e.g. after a database failover."""
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+            for connection, _opened_at, _returned_at in idle:
+                self._opened_at.pop(id(connection), None)
+        for connection, _opened_at, _returned_at in idle:
+            self._close_quietly(connection)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['idle'] = len(self._idle)
+            stats['open'] = len(self._opened_at)
+        stats['in_use'] = stats['open'] - stats['idle']
+        stats['max_size'] = self.max_size
+        stats['avg_wait_seconds'] = stats['wait_seconds'] / stats['checkouts'] if stats['checkouts'] else 0.0
+        return stats
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+# Pools inherited over a fork share their sockets with the parent; they are kept
+# referenced (never closed or garbage collected) so the parent's sessions survive.
+_inherited = []
+
+
+def get_pool(key, factory):
+    """Return the pool stored under ``key``, creating it with ``factory()`` on first use."""
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = factory()
+    return pool
+
+
+def pool_stats():
+    """``{pool name: stats}`` of the pools this process has opened."""
+    return {pool.name: pool.stats() for pool in list(_pools.values())}
+
+
+def _forget_after_fork():
+    _inherited.extend(_pools.values())
+    _pools.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_after_fork)
@@ -0,0 +1,204 @@
+"""
+Per-view query and time budgets.
+
+Views declare how many DB queries (and optionally how many seconds) one
+request may take with ``@query_budget``; ``QUERY_BUDGET['VIEWS']`` can
+override that per URL name. ``QueryBudgetMiddleware`` counts the queries of
+every request on all connections and, depending on ``QUERY_BUDGET['MODE']``,
+logs violations with the offending SQL or raises. ``exercise`` drives a list
+of URL patterns through the test client and reports each endpoint's usage
+against its budget.
+"""
+import logging
+import time
+from collections import Counter, namedtuple
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.urls import URLPattern, URLResolver, resolve, reverse
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class Budget(namedtuple('Budget', ('queries', 'seconds'))):
+    def check(self, recorder):
+        """Return a description of what ``recorder`` overspent, or ``''``."""
+        problems = []
+        if self.queries is not None and recorder.count > self.queries:
+            problems.append(f"{recorder.count} queries (budget {self.queries})")
+        if self.seconds is not None and recorder.seconds > self.seconds:
+            problems.append(f"{recorder.seconds:.3f}s (budget {self.seconds}s)")
+        return ", ".join(problems)
+
+
+def query_budget(queries=None, seconds=None):
+    """
+    Declare the budget of a view.
+
+    Works on function views, on ``APIView``/``ViewSet`` classes (applies to
+    every handler) and on individual handler or ``@action`` methods, which
+    win over the class budget.
+    """
+    def decorator(view):
+        view.query_budget = Budget(queries, seconds)
+        return view
+    return decorator
+
+
+def get_budget(match, method):
+    """
+    Budget for a request resolved to ``match`` with HTTP ``method``.
+
+    ``QUERY_BUDGET['VIEWS'][url_name]`` wins, then the handler, then the view
+    class, then ``DEFAULT_QUERIES``/``DEFAULT_SECONDS``.
+    """
+    config = settings.QUERY_BUDGET
+    override = config['VIEWS'].get(match.url_name)
+    if override is not None:
+        return Budget(override.get('queries'), override.get('seconds'))
+
+    view = match.func
+    cls = getattr(view, 'cls', None) or getattr(view, 'view_class', None)
+    budget = getattr(view, 'query_budget', None)
+    if cls is not None:
+        method = method.lower()
+        handler_name = (getattr(view, 'actions', None) or {}).get(method, method)
+        handler = getattr(cls, handler_name, None)
+        budget = getattr(handler, 'query_budget', None) or getattr(cls, 'query_budget', None)
+    return budget or Budget(config['DEFAULT_QUERIES'], config['DEFAULT_SECONDS'])
+
+
+class QueryRecorder:
+    """Counts and keeps the SQL of every query run on any connection while active."""
+
+    def __init__(self):
+        self.statements = []
+        self.seconds = 0.0
+        self._stack = None
+        self._start = None
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def __call__(self, execute, sql, params, many, context):
+        # django-silk EXPLAINs every query it records; those are profiling overhead, not the view's.
+        if not sql.startswith('EXPLAIN'):
+            self.statements.append(sql)
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.seconds = time.perf_counter() - self._start
+        self._stack.close()
+
+    def top_statements(self, limit=5):
+        """The most repeated statements first; a high count is usually an N+1."""
+        return Counter(self.statements).most_common(limit)
+
+
+def describe(label, recorder, problem):
+    lines = [f"Query budget exceeded by {label}: {problem}"]
+    lines += [f"  {count} x {sql}" for sql, count in recorder.top_statements()]
+    return "\n".join(lines)
+
+
+class QueryBudgetMiddleware:
+    """
+    Enforce view budgets in ``QUERY_BUDGET['MODE']``: ``log`` warns, ``raise`` fails the request.
+
+    Listed last in ``MIDDLEWARE`` so only the view and what it triggers is
+    counted. Queries run while a streaming response is consumed are not.
+    """
+
+    def __init__(self, get_response):
+        if settings.QUERY_BUDGET['MODE'] == 'off':
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+
+        response.query_recorder = recorder
+        match = request.resolver_match
+        if match is None:
+            return response
+        problem = get_budget(match, request.method).check(recorder)
+        if problem:
+            message = describe(f"{request.method} {match.view_name}", recorder, problem)
+            if settings.QUERY_BUDGET['MODE'] == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+
+Result = namedtuple('Result', ('name', 'method', 'path', 'status', 'queries', 'seconds', 'budget', 'problem'))
+
+
+def iter_patterns(patterns):
+    """Yield every named ``URLPattern`` in ``patterns``, following includes."""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_patterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield pattern
+
+
+def pattern_kwargs(pattern):
+    return set(getattr(pattern.pattern, 'converters', {})) | set(pattern.pattern.regex.groupindex)
+
+
+def exercise(client, patterns, requests):
+    """
+    Request every named URL in ``patterns`` and measure it against its budget.
+
+    ``requests`` maps URL names to a list of ``(method, kwargs, data)``
+    tuples. Names without an entry are requested with ``GET`` when they take
+    no URL arguments; format-suffix variants are skipped. Counts come from
+    ``QueryBudgetMiddleware`` when it runs (in ``log`` mode), so queries of
+    outer middleware such as profilers are left out. Returns a list of
+    ``Result``; ``problem`` is set for overspent or unexercised endpoints and
+    for any response other than 2xx/3xx, whose count says nothing about the
+    real code path.
+    """
+    results, seen = [], set()
+    for pattern in iter_patterns(patterns):
+        url_kwargs = pattern_kwargs(pattern)
+        if 'format' in url_kwargs or pattern.name in seen:
+            continue
+        seen.add(pattern.name)
+
+        calls = requests.get(pattern.name)
+        if calls is None:
+            if url_kwargs:
+                results.append(Result(pattern.name, '', '', None, None, None, None, "no fixture request"))
+                continue
+            calls = [('get', {}, None)]
+
+        for method, kwargs, data in calls:
+            path = reverse(pattern.name, kwargs=kwargs)
+            with QueryRecorder() as recorder:
+                response = getattr(client, method)(path, data, format='json')
+            recorder = getattr(response, 'query_recorder', recorder)
+            budget = get_budget(resolve(path), method)
+            problem = budget.check(recorder)
+            if problem:
+                problem = describe(path, recorder, problem)
+            elif not 200 <= response.status_code < 400:
+                problem = f"{method.upper()} {path} answered {response.status_code}; fix its fixture request"
+            results.append(Result(pattern.name, method.upper(), path, response.status_code, recorder.count,
+                                  recorder.seconds, budget, problem))
+    return results
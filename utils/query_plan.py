@@ -0,0 +1,81 @@
+import json
+import re
+
+from django.db import connections, transaction
+
+SQLITE_FULL_SCAN = re.compile(r'\bSCAN (\S+)')
+POSTGRES_FULL_SCAN = re.compile(r'\bSeq Scan on (\S+)')
+
+
+def explain(queryset):
+    """
+    Return the query plan of ``queryset`` as text.
+
+    On PostgreSQL sequential scans are disabled for the duration of the
+    EXPLAIN, so on small fixture tables the planner still reports an index
+    scan whenever a usable index exists.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.explain()
+
+    with transaction.atomic(using=queryset.db):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+
+def sequential_scans(queryset):
+    """Return the tables ``queryset`` reads with a full table scan."""
+    plan = explain(queryset)
+    pattern = POSTGRES_FULL_SCAN if connections[queryset.db].vendor == 'postgresql' else SQLITE_FULL_SCAN
+    return [table.strip('"') for table in pattern.findall(plan)]
+
+
+def assert_uses_index(queryset, label=''):
+    """
+    Raise ``AssertionError`` when ``queryset`` falls back to a sequential scan.
+
+    Parameters
+    ----------
+    queryset : QuerySet
+        The query to check.
+    label : str
+        Name used in the error message, e.g. the endpoint the query serves.
+    """
+    scans = sequential_scans(queryset)
+    if scans:
+        raise AssertionError(
+            f"{label or queryset.model.__name__} scans {', '.join(scans)} sequentially:\n{explain(queryset)}"
+        )
+
+
+def estimated_count(queryset):
+    """
+    Return the planner's row estimate for ``queryset``, or ``None`` off PostgreSQL.
+
+    An unfiltered queryset reads ``reltuples`` from ``pg_class`` (kept fresh
+    by autovacuum/ANALYZE); a filtered one takes the top-level ``Plan Rows``
+    of its EXPLAIN. Neither touches the table itself.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+            estimate = row[0] if row else None
+        else:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]['Plan']['Plan Rows']
+    # ``reltuples`` is -1 until the table has been vacuumed or analyzed once.
+    return int(estimate) if estimate is not None and estimate >= 0 else None
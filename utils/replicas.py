@@ -0,0 +1,91 @@
+"""
+Read-replica routing.
+
+Reads go to the primary unless a request opts in: views with
+``ReplicaReadsMixin`` (or code inside ``replica_reads()``) send reads of the
+models in ``REPLICA_MODELS`` to a random alias of ``DATABASE_REPLICAS``.
+Writes, reads inside a transaction and everything else stay on ``default``.
+A user whose writes must be visible to their next reads is pinned to the
+primary with ``pin_to_primary`` for ``REPLICA_STICKY_SECONDS``, long enough
+for the replicas to catch up. Pins are kept in the default cache, which
+settings require to be shared by all workers whenever replicas are configured.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Whether reads of REPLICA_MODELS may go to a replica in the current request or block.
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def pin_key(user_id):
+    return f"replica_pin:{user_id}"
+
+
+def pin_to_primary(user):
+    """Serve ``user``'s reads from the primary, in this request and for the sticky window after it."""
+    _replica_reads.set(False)
+    pin_ids_to_primary(user.pk)
+
+
+def pin_ids_to_primary(*user_ids):
+    """Pin other users, such as the receivers of new notifications, without rerouting the current request."""
+    if settings.DATABASE_REPLICAS and user_ids:
+        cache.set_many({pin_key(user_id): True for user_id in user_ids}, timeout=settings.REPLICA_STICKY_SECONDS)
+
+
+def is_pinned(user):
+    return bool(user.is_authenticated and cache.get(pin_key(user.pk)))
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaReadsMixin:
+    """Let a read-only DRF view read from a replica unless the user was recently pinned to the primary."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Not reset after the view: streaming responses keep reading once it returned.
+        _replica_reads.set(bool(settings.DATABASE_REPLICAS) and not is_pinned(request.user))
+
+
+class ReplicaRoutingMiddleware:
+    """Start every request on the primary; threads are reused, the previous request's choice must not leak."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        _replica_reads.set(False)
+        return self.get_response(request)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or model._meta.label_lower not in settings.REPLICA_MODELS:
+            return None
+        # Inside a transaction the primary may hold uncommitted writes the caller expects to see.
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        # Objects read from a replica carry its alias; their saves still belong on the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
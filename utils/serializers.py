@@ -0,0 +1,42 @@
+from rest_framework import serializers
+
+
+class SparseFieldsetMixin:
+    """
+    Let clients pick the serialized fields with ``?fields=a,b,c``.
+
+    Unknown names are ignored; an empty selection keeps every field. Views can
+    pass ``requested_fields`` to ``QuerySet.only()`` so unselected columns are
+    not even fetched.
+    """
+    fields_param = 'fields'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.requested_fields(self.context.get('request'))
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, request):
+        if request is None:
+            return []
+        raw = request.query_params.get(cls.fields_param, '')
+        declared = cls.Meta.fields
+        return [name for name in (part.strip() for part in raw.split(',')) if name in declared]
+
+
+class JSONObjectField(serializers.JSONField):
+    """JSON object given as a string, e.g. a ``?metadata={"ip": "10.0.0.1"}`` query param."""
+    default_error_messages = {'not_object': 'Expected a JSON object.'}
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('binary', True)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        value = super().to_internal_value(data)
+        if not isinstance(value, dict):
+            self.fail('not_object')
+        return value